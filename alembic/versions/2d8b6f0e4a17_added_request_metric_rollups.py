@@ -0,0 +1,148 @@
+"""added request metric rollups
+
+Revision ID: 2d8b6f0e4a17
+Revises: 9c4e2f7a1d63
+Create Date: 2026-10-18 16:20:44.903512
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2d8b6f0e4a17"
+down_revision: Union[str, Sequence[str], None] = "9c4e2f7a1d63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "request_metric_rollups_1m",
+        sa.Column("service_id", sa.UUID(), nullable=False),
+        sa.Column("path", sa.String(), nullable=False),
+        sa.Column("method", sa.String(), nullable=False),
+        sa.Column("status_class", sa.SmallInteger(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("request_count", sa.BigInteger(), nullable=False),
+        sa.Column("error_count", sa.BigInteger(), nullable=False),
+        sa.Column("latency_sum_ms", sa.BigInteger(), nullable=False),
+        sa.Column("latency_min_ms", sa.Integer(), nullable=False),
+        sa.Column("latency_max_ms", sa.Integer(), nullable=False),
+        sa.Column(
+            "latency_histogram",
+            postgresql.ARRAY(sa.BigInteger()),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["service_id"], ["services.service_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint(
+            "service_id", "path", "method", "status_class", "bucket_start"
+        ),
+    )
+    op.create_index(
+        "ix_request_metric_rollups_1m_service_bucket",
+        "request_metric_rollups_1m",
+        ["service_id", "bucket_start"],
+        unique=False,
+    )
+    op.create_table(
+        "request_metric_rollups_1h",
+        sa.Column("service_id", sa.UUID(), nullable=False),
+        sa.Column("path", sa.String(), nullable=False),
+        sa.Column("method", sa.String(), nullable=False),
+        sa.Column("status_class", sa.SmallInteger(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("request_count", sa.BigInteger(), nullable=False),
+        sa.Column("error_count", sa.BigInteger(), nullable=False),
+        sa.Column("latency_sum_ms", sa.BigInteger(), nullable=False),
+        sa.Column("latency_min_ms", sa.Integer(), nullable=False),
+        sa.Column("latency_max_ms", sa.Integer(), nullable=False),
+        sa.Column(
+            "latency_histogram",
+            postgresql.ARRAY(sa.BigInteger()),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["service_id"], ["services.service_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint(
+            "service_id", "path", "method", "status_class", "bucket_start"
+        ),
+    )
+    op.create_index(
+        "ix_request_metric_rollups_1h_service_bucket",
+        "request_metric_rollups_1h",
+        ["service_id", "bucket_start"],
+        unique=False,
+    )
+    op.create_table(
+        "request_metric_rollups_1d",
+        sa.Column("service_id", sa.UUID(), nullable=False),
+        sa.Column("path", sa.String(), nullable=False),
+        sa.Column("method", sa.String(), nullable=False),
+        sa.Column("status_class", sa.SmallInteger(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("request_count", sa.BigInteger(), nullable=False),
+        sa.Column("error_count", sa.BigInteger(), nullable=False),
+        sa.Column("latency_sum_ms", sa.BigInteger(), nullable=False),
+        sa.Column("latency_min_ms", sa.Integer(), nullable=False),
+        sa.Column("latency_max_ms", sa.Integer(), nullable=False),
+        sa.Column(
+            "latency_histogram",
+            postgresql.ARRAY(sa.BigInteger()),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["service_id"], ["services.service_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint(
+            "service_id", "path", "method", "status_class", "bucket_start"
+        ),
+    )
+    op.create_index(
+        "ix_request_metric_rollups_1d_service_bucket",
+        "request_metric_rollups_1d",
+        ["service_id", "bucket_start"],
+        unique=False,
+    )
+    op.create_table(
+        "rollup_watermarks",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("watermark", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.create_index(
+        "ix_request_metrics_created_at",
+        "request_metrics",
+        ["created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_request_metrics_created_at", table_name="request_metrics")
+    op.drop_table("rollup_watermarks")
+    op.drop_index(
+        "ix_request_metric_rollups_1d_service_bucket",
+        table_name="request_metric_rollups_1d",
+    )
+    op.drop_table("request_metric_rollups_1d")
+    op.drop_index(
+        "ix_request_metric_rollups_1h_service_bucket",
+        table_name="request_metric_rollups_1h",
+    )
+    op.drop_table("request_metric_rollups_1h")
+    op.drop_index(
+        "ix_request_metric_rollups_1m_service_bucket",
+        table_name="request_metric_rollups_1m",
+    )
+    op.drop_table("request_metric_rollups_1m")
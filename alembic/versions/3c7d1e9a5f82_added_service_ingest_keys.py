@@ -0,0 +1,60 @@
+"""added service ingest keys
+
+Revision ID: 3c7d1e9a5f82
+Revises: 8b3f5d2e6c71
+Create Date: 2026-10-18 21:12:07.418236
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c7d1e9a5f82"
+down_revision: Union[str, Sequence[str], None] = "8b3f5d2e6c71"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "service_ingest_keys",
+        sa.Column("key_id", sa.UUID(), nullable=False),
+        sa.Column("service_id", sa.UUID(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("key_hash", sa.LargeBinary(), nullable=False),
+        sa.Column("key_prefix", sa.String(), nullable=False),
+        sa.Column("revoked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["service_id"], ["services.service_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("key_id"),
+        sa.UniqueConstraint("key_hash"),
+    )
+    op.create_index(
+        op.f("ix_service_ingest_keys_service_id"),
+        "service_ingest_keys",
+        ["service_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_service_ingest_keys_revoked_at",
+        "service_ingest_keys",
+        ["revoked_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_service_ingest_keys_revoked_at", table_name="service_ingest_keys")
+    op.drop_index(
+        op.f("ix_service_ingest_keys_service_id"), table_name="service_ingest_keys"
+    )
+    op.drop_table("service_ingest_keys")
@@ -0,0 +1,52 @@
+"""added phase timings to ping logs
+
+Revision ID: 4f2d8c1a7b93
+Revises: afbcbc98dfb7
+Create Date: 2026-10-18 12:14:38.201447
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4f2d8c1a7b93"
+down_revision: Union[str, Sequence[str], None] = "afbcbc98dfb7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "service_ping_logs", sa.Column("dns_ms", sa.SmallInteger(), nullable=True)
+    )
+    op.add_column(
+        "service_ping_logs", sa.Column("connect_ms", sa.SmallInteger(), nullable=True)
+    )
+    op.add_column(
+        "service_ping_logs", sa.Column("tls_ms", sa.SmallInteger(), nullable=True)
+    )
+    op.add_column(
+        "service_ping_logs", sa.Column("ttfb_ms", sa.SmallInteger(), nullable=True)
+    )
+    op.create_index(
+        "ix_service_ping_logs_service_id_checked_at",
+        "service_ping_logs",
+        ["service_id", "checked_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_service_ping_logs_service_id_checked_at", table_name="service_ping_logs"
+    )
+    op.drop_column("service_ping_logs", "ttfb_ms")
+    op.drop_column("service_ping_logs", "tls_ms")
+    op.drop_column("service_ping_logs", "connect_ms")
+    op.drop_column("service_ping_logs", "dns_ms")
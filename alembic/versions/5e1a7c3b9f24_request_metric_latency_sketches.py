@@ -0,0 +1,229 @@
+"""request metric latency sketches
+
+Revision ID: 5e1a7c3b9f24
+Revises: 2d8b6f0e4a17
+Create Date: 2026-10-18 17:05:12.661840
+
+Rollups keep a serialised latency sketch instead of a fixed histogram, and
+ingestion writes per-minute partials that the rollup job merges, so raw rows
+no longer need an index on created_at. Stored histograms are converted by
+placing each bucket's count at the bucket's geometric midpoint; raw rows not
+rolled up yet are turned into partials.
+"""
+
+import math
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.utils.sketch import RELATIVE_ACCURACY, LatencySketch
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5e1a7c3b9f24"
+down_revision: Union[str, Sequence[str], None] = "2d8b6f0e4a17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ROLLUP_TABLES = (
+    "request_metric_rollups_1m",
+    "request_metric_rollups_1h",
+    "request_metric_rollups_1d",
+)
+KEY_COLUMNS = "service_id, path, method, status_class, bucket_start"
+
+# Histogram bounds of the previous revision, as width_bucket() read them
+HISTOGRAM_BOUNDS_MS = (
+    1, 2, 3, 4, 5, 6, 8,
+    10, 12, 15, 20, 25, 30, 40, 50, 60, 80,
+    100, 120, 150, 200, 250, 300, 400, 500, 600, 800,
+    1000, 1200, 1500, 2000, 2500, 3000, 4000, 5000, 6000, 8000,
+    10000, 15000, 20000, 30000, 60000,
+)  # fmt: skip
+
+BATCH_ROWS = 5000
+
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+
+
+def _histogram_to_sketch(histogram, latency_max) -> bytes:
+    sketch = LatencySketch()
+    for index, count in enumerate(histogram):
+        if not count:
+            continue
+        if index == 0:
+            value = 0
+        elif index == len(HISTOGRAM_BOUNDS_MS):
+            value = max(latency_max, HISTOGRAM_BOUNDS_MS[-1])
+        else:
+            value = math.sqrt(
+                HISTOGRAM_BOUNDS_MS[index - 1] * HISTOGRAM_BOUNDS_MS[index]
+            )
+        sketch.add(value, count)
+    return sketch.to_bytes()
+
+
+def _sketch_to_histogram(payload) -> list[int]:
+    histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+    sketch = LatencySketch.from_bytes(payload)
+    histogram[0] = sketch.zero_count
+    for index, count in sketch.bins.items():
+        value = 2 * _GAMMA**index / (_GAMMA + 1)
+        bucket = sum(1 for bound in HISTOGRAM_BOUNDS_MS if bound <= value)
+        histogram[bucket] += count
+    return histogram
+
+
+def _rewrite_rollups(table: str, source: str, target: str, convert) -> None:
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text(f"SELECT {KEY_COLUMNS}, latency_max_ms, {source} FROM {table}")
+    ).all()
+    for offset in range(0, len(rows), BATCH_ROWS):
+        bind.execute(
+            sa.text(
+                f"UPDATE {table} SET {target} = :value"
+                " WHERE service_id = :service_id AND path = :path"
+                " AND method = :method AND status_class = :status_class"
+                " AND bucket_start = :bucket_start"
+            ),
+            [
+                {
+                    "service_id": row.service_id,
+                    "path": row.path,
+                    "method": row.method,
+                    "status_class": row.status_class,
+                    "bucket_start": row.bucket_start,
+                    "value": convert(row),
+                }
+                for row in rows[offset : offset + BATCH_ROWS]
+            ],
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "request_metric_partials",
+        sa.Column(
+            "partial_id", sa.BigInteger(), sa.Identity(always=False), nullable=False
+        ),
+        sa.Column("service_id", sa.UUID(), nullable=False),
+        sa.Column("path", sa.String(), nullable=False),
+        sa.Column("method", sa.String(), nullable=False),
+        sa.Column("status_class", sa.SmallInteger(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("request_count", sa.BigInteger(), nullable=False),
+        sa.Column("error_count", sa.BigInteger(), nullable=False),
+        sa.Column("latency_sum_ms", sa.BigInteger(), nullable=False),
+        sa.Column("latency_min_ms", sa.Integer(), nullable=False),
+        sa.Column("latency_max_ms", sa.Integer(), nullable=False),
+        sa.Column("latency_sketch", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("partial_id"),
+    )
+    op.create_index(
+        "ix_request_metric_partials_created_at",
+        "request_metric_partials",
+        ["created_at"],
+        unique=False,
+    )
+
+    for table in ROLLUP_TABLES:
+        op.add_column(
+            table, sa.Column("latency_sketch", sa.LargeBinary(), nullable=True)
+        )
+        _rewrite_rollups(
+            table,
+            "latency_histogram",
+            "latency_sketch",
+            lambda row: _histogram_to_sketch(row.latency_histogram, row.latency_max_ms),
+        )
+        op.alter_column(table, "latency_sketch", nullable=False)
+        op.drop_column(table, "latency_histogram")
+
+    # Raw rows past the watermark become partials for the rollup job
+    bind = op.get_bind()
+    now = datetime.now(timezone.utc)
+    pending = bind.execute(
+        sa.text(
+            """
+            SELECT service_id, path, method,
+                   (status_code / 100)::smallint AS status_class,
+                   date_bin('1 minute', occurred_at,
+                            TIMESTAMPTZ '1970-01-01 00:00:00+00') AS bucket_start,
+                   count(*) AS request_count,
+                   count(*) FILTER (WHERE status_code >= 500) AS error_count,
+                   sum(latency_ms) AS latency_sum_ms,
+                   min(latency_ms) AS latency_min_ms,
+                   max(latency_ms) AS latency_max_ms,
+                   array_agg(latency_ms) AS latencies
+            FROM request_metrics
+            WHERE created_at > coalesce(
+                (SELECT watermark FROM rollup_watermarks
+                 WHERE name = 'request_metrics'),
+                '-infinity'
+            )
+            GROUP BY 1, 2, 3, 4, 5
+            """
+        )
+    ).all()
+    if pending:
+        bind.execute(
+            sa.text(
+                f"INSERT INTO request_metric_partials ({KEY_COLUMNS}, request_count,"
+                " error_count, latency_sum_ms, latency_min_ms, latency_max_ms,"
+                " latency_sketch, created_at) VALUES (:service_id, :path, :method,"
+                " :status_class, :bucket_start, :request_count, :error_count,"
+                " :latency_sum_ms, :latency_min_ms, :latency_max_ms,"
+                " :latency_sketch, :created_at)"
+            ),
+            [
+                {
+                    **row._asdict(),
+                    "latency_sketch": LatencySketch.from_values(
+                        row.latencies
+                    ).to_bytes(),
+                    "created_at": now,
+                }
+                for row in pending
+            ],
+        )
+
+    op.drop_index("ix_request_metrics_created_at", table_name="request_metrics")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        "ix_request_metrics_created_at",
+        "request_metrics",
+        ["created_at"],
+        unique=False,
+    )
+
+    for table in ROLLUP_TABLES:
+        op.add_column(
+            table,
+            sa.Column(
+                "latency_histogram", postgresql.ARRAY(sa.BigInteger()), nullable=True
+            ),
+        )
+        _rewrite_rollups(
+            table,
+            "latency_sketch",
+            "latency_histogram",
+            lambda row: _sketch_to_histogram(row.latency_sketch),
+        )
+        op.alter_column(table, "latency_histogram", nullable=False)
+        op.drop_column(table, "latency_sketch")
+
+    # Unmerged partials go; their raw rows are still past the watermark, so
+    # the histogram job of the previous revision rolls them up instead
+    op.drop_index(
+        "ix_request_metric_partials_created_at", table_name="request_metric_partials"
+    )
+    op.drop_table("request_metric_partials")
@@ -0,0 +1,56 @@
+"""indexed refresh token digests
+
+Revision ID: 6e2b8f4d0a39
+Revises: 3c7d1e9a5f82
+Create Date: 2026-10-18 22:41:56.903114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6e2b8f4d0a39"
+down_revision: Union[str, Sequence[str], None] = "3c7d1e9a5f82"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# user_sessions is not created by these migrations, so it may be missing
+SESSION_TABLES = ("admin_sessions", "user_sessions")
+
+
+def _existing_tables() -> list[str]:
+    inspector = sa.inspect(op.get_bind())
+    return [table for table in SESSION_TABLES if inspector.has_table(table)]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in _existing_tables():
+        op.add_column(
+            table, sa.Column("refresh_token_digest", sa.LargeBinary(), nullable=True)
+        )
+
+        # Same digest as app.utils.auth.refresh_token_digest
+        op.execute(
+            f"UPDATE {table}"
+            " SET refresh_token_digest = sha256(convert_to(refresh_token, 'UTF8'))"
+            " WHERE refresh_token IS NOT NULL"
+        )
+
+        op.create_index(
+            op.f(f"ix_{table}_refresh_token_digest"),
+            table,
+            ["refresh_token_digest"],
+            unique=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in _existing_tables():
+        op.drop_index(op.f(f"ix_{table}_refresh_token_digest"), table_name=table)
+        op.drop_column(table, "refresh_token_digest")
@@ -0,0 +1,101 @@
+"""added health transitions and counters
+
+Revision ID: 7a1e5c9d2b48
+Revises: 4f2d8c1a7b93
+Create Date: 2026-10-18 13:02:19.554810
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7a1e5c9d2b48"
+down_revision: Union[str, Sequence[str], None] = "4f2d8c1a7b93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "service_health_transitions",
+        sa.Column("transition_id", sa.UUID(), nullable=False),
+        sa.Column("health_check_id", sa.UUID(), nullable=False),
+        sa.Column("service_id", sa.UUID(), nullable=False),
+        sa.Column("state", sa.String(), nullable=False),
+        sa.Column("previous_state", sa.String(), nullable=True),
+        sa.Column("status_code", sa.Integer(), nullable=True),
+        sa.Column("response_time_ms", sa.Integer(), nullable=True),
+        sa.Column("changed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["health_check_id"],
+            ["service_health_checks.health_check_id"],
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["service_id"], ["services.service_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("transition_id"),
+    )
+    op.create_index(
+        "ix_service_health_transitions_check_changed_at",
+        "service_health_transitions",
+        ["health_check_id", "changed_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_service_health_transitions_service_changed_at",
+        "service_health_transitions",
+        ["service_id", "changed_at"],
+        unique=False,
+    )
+    op.create_table(
+        "service_health_counters",
+        sa.Column("health_check_id", sa.UUID(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("service_id", sa.UUID(), nullable=False),
+        sa.Column("up_count", sa.Integer(), nullable=False),
+        sa.Column("degraded_count", sa.Integer(), nullable=False),
+        sa.Column("down_count", sa.Integer(), nullable=False),
+        sa.Column("latency_count", sa.Integer(), nullable=False),
+        sa.Column("latency_sum_ms", sa.BigInteger(), nullable=False),
+        sa.Column("latency_max_ms", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["health_check_id"],
+            ["service_health_checks.health_check_id"],
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["service_id"], ["services.service_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("health_check_id", "bucket_start"),
+    )
+    op.create_index(
+        "ix_service_health_counters_service_bucket",
+        "service_health_counters",
+        ["service_id", "bucket_start"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_service_health_counters_service_bucket",
+        table_name="service_health_counters",
+    )
+    op.drop_table("service_health_counters")
+    op.drop_index(
+        "ix_service_health_transitions_service_changed_at",
+        table_name="service_health_transitions",
+    )
+    op.drop_index(
+        "ix_service_health_transitions_check_changed_at",
+        table_name="service_health_transitions",
+    )
+    op.drop_table("service_health_transitions")
@@ -0,0 +1,43 @@
+"""added service route templates
+
+Revision ID: 8b3f5d2e6c71
+Revises: 5e1a7c3b9f24
+Create Date: 2026-10-18 17:48:31.220905
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8b3f5d2e6c71"
+down_revision: Union[str, Sequence[str], None] = "5e1a7c3b9f24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "service_route_templates",
+        sa.Column("template_id", sa.UUID(), nullable=False),
+        sa.Column("service_id", sa.UUID(), nullable=False),
+        sa.Column("template", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["service_id"], ["services.service_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("template_id"),
+        sa.UniqueConstraint(
+            "service_id", "template", name="uq_service_route_templates_template"
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("service_route_templates")
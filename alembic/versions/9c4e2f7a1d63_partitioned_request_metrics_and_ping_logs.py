@@ -0,0 +1,246 @@
+"""partitioned request metrics and ping logs
+
+Revision ID: 9c4e2f7a1d63
+Revises: 7a1e5c9d2b48
+Create Date: 2026-10-18 15:41:07.218344
+
+Both raw tables become LIST (retention_days) partitioned tables whose tiers
+are RANGE partitioned by day. Existing rows are copied into the default tier,
+so the upgrade rewrites both tables; run it in a quiet period on big tables.
+Upcoming partitions are created here for the current window and from then on
+by app.tasks.maintenance.partitions.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9c4e2f7a1d63"
+down_revision: Union[str, Sequence[str], None] = "7a1e5c9d2b48"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tiers and window at the time of this revision
+TIERS = (7, 30, 90, 365)
+DEFAULT_TIER = 30
+PRECREATE_DAYS = 7
+
+REQUEST_METRIC_COLUMNS = (
+    "metric_id, service_id, path, method, status_code, latency_ms,"
+    " occurred_at, created_at, updated_at"
+)
+PING_LOG_COLUMNS = (
+    "ping_id, service_id, status_code, response_time_ms, dns_ms, connect_ms,"
+    " tls_ms, ttfb_ms, is_success, checked_at, created_at, updated_at"
+)
+
+
+def _day_bound(day: date) -> str:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc).isoformat()
+
+
+def _create_partitions(table: str, column: str, legacy: str) -> None:
+    bind = op.get_bind()
+    today = datetime.now(timezone.utc).date()
+    first, last = bind.execute(
+        sa.text(
+            f"SELECT (min({column}) AT TIME ZONE 'UTC')::date,"
+            f" (max({column}) AT TIME ZONE 'UTC')::date FROM {legacy}"
+        )
+    ).one()
+
+    for tier in TIERS:
+        tier_table = f"{table}_r{tier}"
+        op.execute(
+            f"CREATE TABLE {tier_table} PARTITION OF {table}"
+            f" FOR VALUES IN ({tier}) PARTITION BY RANGE ({column})"
+        )
+
+        # The default tier also has to hold every existing row
+        start = today - timedelta(days=1)
+        end = today + timedelta(days=PRECREATE_DAYS)
+        if tier == DEFAULT_TIER and first is not None:
+            start, end = min(start, first), max(end, last + timedelta(days=1))
+
+        day = start
+        while day < end:
+            op.execute(
+                f"CREATE TABLE {tier_table}_p{day:%Y%m%d} PARTITION OF {tier_table}"
+                f" FOR VALUES FROM ('{_day_bound(day)}')"
+                f" TO ('{_day_bound(day + timedelta(days=1))}')"
+            )
+            day += timedelta(days=1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "company_retention_policies",
+        sa.Column("company_id", sa.UUID(), nullable=False),
+        sa.Column("retention_days", sa.SmallInteger(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("company_id"),
+    )
+
+    op.rename_table("request_metrics", "request_metrics_unpartitioned")
+    op.execute(
+        "ALTER INDEX request_metrics_pkey RENAME TO request_metrics_unpartitioned_pkey"
+    )
+    op.create_table(
+        "request_metrics",
+        sa.Column("metric_id", sa.UUID(), nullable=False),
+        sa.Column("service_id", sa.UUID(), nullable=False),
+        sa.Column("path", sa.String(), nullable=False),
+        sa.Column("method", sa.String(), nullable=False),
+        sa.Column("status_code", sa.Integer(), nullable=False),
+        sa.Column("latency_ms", sa.Integer(), nullable=False),
+        sa.Column("occurred_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("retention_days", sa.SmallInteger(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["service_id"], ["services.service_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("metric_id", "occurred_at", "retention_days"),
+        postgresql_partition_by="LIST (retention_days)",
+    )
+    op.create_index(
+        "ix_request_metrics_service_id_occurred_at",
+        "request_metrics",
+        ["service_id", "occurred_at"],
+        unique=False,
+    )
+    _create_partitions(
+        "request_metrics", "occurred_at", "request_metrics_unpartitioned"
+    )
+    op.execute(
+        f"INSERT INTO request_metrics ({REQUEST_METRIC_COLUMNS}, retention_days)"
+        f" SELECT {REQUEST_METRIC_COLUMNS}, {DEFAULT_TIER}"
+        " FROM request_metrics_unpartitioned"
+    )
+    op.drop_table("request_metrics_unpartitioned")
+
+    op.drop_index(
+        "ix_service_ping_logs_service_id_checked_at", table_name="service_ping_logs"
+    )
+    op.rename_table("service_ping_logs", "service_ping_logs_unpartitioned")
+    op.execute(
+        "ALTER INDEX service_ping_logs_pkey"
+        " RENAME TO service_ping_logs_unpartitioned_pkey"
+    )
+    op.create_table(
+        "service_ping_logs",
+        sa.Column("ping_id", sa.UUID(), nullable=False),
+        sa.Column("service_id", sa.UUID(), nullable=False),
+        sa.Column("status_code", sa.Integer(), nullable=True),
+        sa.Column("response_time_ms", sa.Integer(), nullable=True),
+        sa.Column("dns_ms", sa.SmallInteger(), nullable=True),
+        sa.Column("connect_ms", sa.SmallInteger(), nullable=True),
+        sa.Column("tls_ms", sa.SmallInteger(), nullable=True),
+        sa.Column("ttfb_ms", sa.SmallInteger(), nullable=True),
+        sa.Column("is_success", sa.Boolean(), nullable=False),
+        sa.Column("checked_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("retention_days", sa.SmallInteger(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["service_id"], ["services.service_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("ping_id", "checked_at", "retention_days"),
+        postgresql_partition_by="LIST (retention_days)",
+    )
+    op.create_index(
+        "ix_service_ping_logs_service_id_checked_at",
+        "service_ping_logs",
+        ["service_id", "checked_at"],
+        unique=False,
+    )
+    _create_partitions(
+        "service_ping_logs", "checked_at", "service_ping_logs_unpartitioned"
+    )
+    op.execute(
+        f"INSERT INTO service_ping_logs ({PING_LOG_COLUMNS}, retention_days)"
+        f" SELECT {PING_LOG_COLUMNS}, {DEFAULT_TIER}"
+        " FROM service_ping_logs_unpartitioned"
+    )
+    op.drop_table("service_ping_logs_unpartitioned")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table("service_ping_logs", "service_ping_logs_partitioned")
+    op.execute(
+        "ALTER INDEX ix_service_ping_logs_service_id_checked_at"
+        " RENAME TO ix_service_ping_logs_partitioned_service_id_checked_at"
+    )
+    op.execute(
+        "ALTER INDEX service_ping_logs_pkey"
+        " RENAME TO service_ping_logs_partitioned_pkey"
+    )
+    op.create_table(
+        "service_ping_logs",
+        sa.Column("ping_id", sa.UUID(), nullable=False),
+        sa.Column("service_id", sa.UUID(), nullable=False),
+        sa.Column("status_code", sa.Integer(), nullable=True),
+        sa.Column("response_time_ms", sa.Integer(), nullable=True),
+        sa.Column("dns_ms", sa.SmallInteger(), nullable=True),
+        sa.Column("connect_ms", sa.SmallInteger(), nullable=True),
+        sa.Column("tls_ms", sa.SmallInteger(), nullable=True),
+        sa.Column("ttfb_ms", sa.SmallInteger(), nullable=True),
+        sa.Column("is_success", sa.Boolean(), nullable=False),
+        sa.Column("checked_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["service_id"], ["services.service_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("ping_id"),
+    )
+    op.execute(
+        f"INSERT INTO service_ping_logs ({PING_LOG_COLUMNS})"
+        f" SELECT {PING_LOG_COLUMNS} FROM service_ping_logs_partitioned"
+    )
+    op.drop_table("service_ping_logs_partitioned")
+    op.create_index(
+        "ix_service_ping_logs_service_id_checked_at",
+        "service_ping_logs",
+        ["service_id", "checked_at"],
+        unique=False,
+    )
+
+    op.rename_table("request_metrics", "request_metrics_partitioned")
+    op.execute(
+        "ALTER INDEX ix_request_metrics_service_id_occurred_at"
+        " RENAME TO ix_request_metrics_partitioned_service_id_occurred_at"
+    )
+    op.execute(
+        "ALTER INDEX request_metrics_pkey RENAME TO request_metrics_partitioned_pkey"
+    )
+    op.create_table(
+        "request_metrics",
+        sa.Column("metric_id", sa.UUID(), nullable=False),
+        sa.Column("service_id", sa.UUID(), nullable=False),
+        sa.Column("path", sa.String(), nullable=False),
+        sa.Column("method", sa.String(), nullable=False),
+        sa.Column("status_code", sa.Integer(), nullable=False),
+        sa.Column("latency_ms", sa.Integer(), nullable=False),
+        sa.Column("occurred_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["service_id"], ["services.service_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("metric_id"),
+    )
+    op.execute(
+        f"INSERT INTO request_metrics ({REQUEST_METRIC_COLUMNS})"
+        f" SELECT {REQUEST_METRIC_COLUMNS} FROM request_metrics_partitioned"
+    )
+    op.drop_table("request_metrics_partitioned")
+
+    op.drop_table("company_retention_policies")
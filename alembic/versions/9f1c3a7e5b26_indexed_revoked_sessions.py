@@ -0,0 +1,45 @@
+"""indexed revoked sessions
+
+Revision ID: 9f1c3a7e5b26
+Revises: 6e2b8f4d0a39
+Create Date: 2026-10-19 10:02:44.518730
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9f1c3a7e5b26"
+down_revision: Union[str, Sequence[str], None] = "6e2b8f4d0a39"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# user_sessions is not created by these migrations, so it may be missing
+SESSION_TABLES = ("admin_sessions", "user_sessions")
+
+
+def _existing_tables() -> list[str]:
+    inspector = sa.inspect(op.get_bind())
+    return [table for table in SESSION_TABLES if inspector.has_table(table)]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in _existing_tables():
+        op.create_index(
+            f"ix_{table}_revoked_updated_at",
+            table,
+            ["updated_at"],
+            unique=False,
+            postgresql_where=sa.text("NOT is_active"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in _existing_tables():
+        op.drop_index(f"ix_{table}_revoked_updated_at", table_name=table)
@@ -0,0 +1,44 @@
+"""added adaptive interval to health checks
+
+Revision ID: afbcbc98dfb7
+Revises: e3365c25a94e
+Create Date: 2026-10-18 11:05:12.660582
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "afbcbc98dfb7"
+down_revision: Union[str, Sequence[str], None] = "e3365c25a94e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "service_health_checks",
+        sa.Column(
+            "adaptive_interval", sa.Boolean(), server_default=sa.false(), nullable=False
+        ),
+    )
+    op.add_column(
+        "service_health_checks",
+        sa.Column("min_interval_seconds", sa.Integer(), nullable=True),
+    )
+    op.add_column(
+        "service_health_checks",
+        sa.Column("max_interval_seconds", sa.Integer(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("service_health_checks", "max_interval_seconds")
+    op.drop_column("service_health_checks", "min_interval_seconds")
+    op.drop_column("service_health_checks", "adaptive_interval")
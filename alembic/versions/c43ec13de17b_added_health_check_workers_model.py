@@ -0,0 +1,36 @@
+"""added health_check_workers model
+
+Revision ID: c43ec13de17b
+Revises: eb3d61b3eb4a
+Create Date: 2026-10-18 10:12:31.418220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c43ec13de17b'
+down_revision: Union[str, Sequence[str], None] = 'eb3d61b3eb4a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('health_check_workers',
+    sa.Column('worker_id', sa.String(), nullable=False),
+    sa.Column('hostname', sa.String(), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('worker_id')
+    )
+    op.create_index(op.f('ix_health_check_workers_heartbeat_at'), 'health_check_workers', ['heartbeat_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_health_check_workers_heartbeat_at'), table_name='health_check_workers')
+    op.drop_table('health_check_workers')
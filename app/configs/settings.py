@@ -1,3 +1,4 @@
+import os
 from datetime import timedelta
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -23,9 +24,150 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Verified access tokens cached per worker until they expire; every
+    # worker polls for sessions logged out elsewhere
+    JWT_CACHE_SIZE: int = 10_000
+    JWT_REVOCATION_POLL_SECONDS: float = 2.0
+
+    # bcrypt runs on a bounded thread pool off the event loop, one thread per
+    # core; sign-ins beyond the running and queued hashes get a 503
+    PASSWORD_HASH_WORKERS: int = min(4, os.cpu_count() or 1)
+    PASSWORD_HASH_MAX_QUEUED: int = 32
+
     # Resend variables
     RESEND_API_KEY: str = ""
 
+    # -------------------------  #
+    #       Health Checks        #
+    # -------------------------  #
+
+    # Run the scheduler inside the API process (disable when using the worker)
+    HEALTH_CHECK_SCHEDULER_ENABLED: bool = False
+    HEALTH_CHECK_MAX_CONCURRENCY: int = 2000
+    HEALTH_CHECK_REFRESH_SECONDS: int = 30
+
+    # Bounded per-run jitter on top of the per-check phase offset
+    HEALTH_CHECK_JITTER_RATIO: float = 0.05
+    HEALTH_CHECK_MAX_JITTER_SECONDS: float = 2.0
+
+    # Adaptive interval defaults, and the probe cap for hosts that time out
+    HEALTH_CHECK_ADAPTIVE_MIN_SECONDS: int = 10
+    HEALTH_CHECK_ADAPTIVE_MAX_SECONDS: int = 600
+    HEALTH_CHECK_MAX_SUSPECT_PROBES_PER_HOST: int = 2
+
+    # Keep-alive pool per probed origin; keepalive should outlive the interval
+    HEALTH_CHECK_POOL_MAX_CONNECTIONS_PER_HOST: int = 4
+    HEALTH_CHECK_POOL_KEEPALIVE_SECONDS: float = 120
+    HEALTH_CHECK_POOL_IDLE_SECONDS: float = 600
+    HEALTH_CHECK_HTTP2_ENABLED: bool = True
+
+    # Async DNS cache for probed hosts; empty nameservers use resolv.conf
+    HEALTH_CHECK_DNS_NAMESERVERS: list[str] = []
+    HEALTH_CHECK_DNS_TIMEOUT_SECONDS: float = 2.0
+    HEALTH_CHECK_DNS_MIN_TTL_SECONDS: int = 5
+    HEALTH_CHECK_DNS_MAX_TTL_SECONDS: int = 3600
+    HEALTH_CHECK_DNS_NEGATIVE_TTL_SECONDS: int = 30
+    HEALTH_CHECK_DNS_STALE_SECONDS: int = 300
+    HEALTH_CHECK_DNS_MAX_ENTRIES: int = 50_000
+
+    # Split checks across replicas; a dead replica's checks move after the TTL
+    HEALTH_CHECK_SHARDING_ENABLED: bool = True
+    HEALTH_CHECK_HEARTBEAT_SECONDS: float = 2
+    HEALTH_CHECK_WORKER_TTL_SECONDS: float = 10
+
+    # Ping log writer: flush on whichever threshold is reached first
+    PING_LOG_BATCH_SIZE: int = 5000
+    PING_LOG_FLUSH_SECONDS: float = 1.0
+    PING_LOG_MAX_BUFFER: int = 200_000
+
+    # Raw ping rows kept per probe (1.0 = all, 0 = none); transitions and
+    # per-bucket counters are always stored and back the uptime queries
+    PING_LOG_RAW_SAMPLE_RATE: float = 1.0
+    HEALTH_COUNTER_BUCKET_SECONDS: int = 60
+
+    # A successful probe slower than this share of its timeout is degraded
+    HEALTH_CHECK_DEGRADED_RATIO: float = 0.8
+
+    # -------------------------  #
+    #     Metric Ingestion       #
+    # -------------------------  #
+
+    INGEST_MAX_BODY_BYTES: int = 32 * 1024 * 1024
+
+    # gzip and zstd bodies are refused once they inflate past this
+    INGEST_MAX_DECOMPRESSED_BYTES: int = 128 * 1024 * 1024
+    INGEST_MAX_BATCH_ROWS: int = 100_000
+
+    # Bounded queue between the ingestion route and the background flushers
+    INGEST_QUEUE_MAX_ROWS: int = 500_000
+    INGEST_FLUSH_ROWS: int = 50_000
+    INGEST_FLUSHERS: int = 2
+    INGEST_MAX_RETRY_AFTER_SECONDS: int = 30
+    INGEST_DRAIN_SECONDS: float = 10.0
+    INGEST_SERVICE_CACHE_SECONDS: float = 60.0
+
+    # Accepted event time window; lateness must stay below the shortest tier
+    INGEST_MAX_LATENESS_SECONDS: int = 24 * 3600
+    INGEST_MAX_FUTURE_SKEW_SECONDS: int = 300
+
+    # Paths are stored as route templates; each service keeps at most this
+    # many distinct templates per worker, the least recently used one being
+    # replaced once idle and anything beyond going to an overflow bucket
+    INGEST_MAX_PATH_TEMPLATES: int = 500
+    INGEST_PATH_TEMPLATE_IDLE_SECONDS: float = 3600.0
+    INGEST_PATH_CACHE_SIZE: int = 10_000
+    INGEST_ROUTE_TEMPLATE_CACHE_SECONDS: float = 60.0
+
+    # Service ingestion keys are verified from a per-worker cache; every
+    # worker polls for revoked keys, so a revocation applies within the poll
+    # interval, and unknown keys are remembered briefly to spare the database
+    INGEST_KEY_CACHE_SIZE: int = 10_000
+    INGEST_KEY_CACHE_SECONDS: float = 300.0
+    INGEST_KEY_NEGATIVE_CACHE_SECONDS: float = 10.0
+    INGEST_KEY_REVOCATION_POLL_SECONDS: float = 2.0
+
+    # -------------------------  #
+    #   Partitions & Retention   #
+    # -------------------------  #
+
+    # Raw metric and ping rows live in daily partitions per retention tier;
+    # a company's retention is rounded up to the next tier, and one beyond the
+    # last tier goes to a tier that is never expired
+    METRIC_RETENTION_TIERS_DAYS: list[int] = [7, 30, 90, 365]
+    METRIC_RETENTION_DEFAULT_DAYS: int = 30
+    METRIC_RETENTION_CACHE_SECONDS: float = 60.0
+
+    PARTITION_MAINTENANCE_ENABLED: bool = True
+    PARTITION_MAINTENANCE_SECONDS: int = 3600
+    PARTITION_PRECREATE_DAYS: int = 7
+
+    # -------------------------  #
+    #          Rollups           #
+    # -------------------------  #
+
+    # Raw rows younger than the settle delay may still be in flight, so the
+    # watermark trails it; one run folds in at most the max window
+    ROLLUP_ENABLED: bool = True
+    ROLLUP_INTERVAL_SECONDS: float = 30
+    ROLLUP_SETTLE_SECONDS: int = 120
+    ROLLUP_MAX_WINDOW_SECONDS: int = 3600
+    ROLLUP_MAX_SERIES_POINTS: int = 5000
+
+    # Downsampled series read the finest rollup with at most this many
+    # buckets in the range before reducing them to the requested points
+    ROLLUP_DOWNSAMPLE_SOURCE_POINTS: int = 20_000
+
+    # -------------------------  #
+    #        Hot Window          #
+    # -------------------------  #
+
+    # Live views read the last minutes from a ring per service in each
+    # worker; a ring row takes 19 bytes, allocated when the service is seen
+    HOT_WINDOW_ENABLED: bool = True
+    HOT_WINDOW_SECONDS: int = 900
+    HOT_WINDOW_ROWS_PER_SERVICE: int = 100_000
+    HOT_WINDOW_MAX_SERVICES: int = 1000
+
     # -------------------------
     # Derived Timedeltas
     # -------------------------
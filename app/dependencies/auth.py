@@ -3,7 +3,39 @@ from fastapi import HTTPException, Request, status
 
 from app.configs.settings import settings
 from app.schemas.auth.admin import AdminData
+from app.schemas.auth.ingest import IngestClientData
 from app.schemas.auth.user import UserData
+from app.tasks.ingest.ingest_keys import ingest_keys
+from app.utils.token_cache import verified_tokens
+
+
+# Function to verify an access token, served from the cache when seen before
+def decode_access_token(token: str) -> dict:
+    """
+    Function to return the claims of a valid access token.
+
+    Only the first request with a token pays for the signature check and
+    claim parsing; later ones reuse the claims until the token expires or
+    its session is revoked.
+    """
+    payload = verified_tokens.get(token)
+    if payload is not None:
+        return payload
+
+    payload = jwt.decode(
+        token,
+        settings.JWT_SECRET_KEY,
+        algorithms=[settings.JWT_ALGORITHM],
+    )
+
+    if verified_tokens.is_revoked(payload.get("session_id")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Session has been revoked",
+        )
+
+    verified_tokens.put(token, payload)
+    return payload
 
 
 #  Dependency to authenticate the admin
@@ -22,12 +54,8 @@ async def get_current_admin(
                 detail="Authentication credentials were not provided",
             )
 
-        # Decode the JWT token
-        payload: dict = jwt.decode(
-            token,
-            settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM],
-        )
+        # Decode the JWT token, or reuse the claims it was verified with
+        payload: dict = decode_access_token(token)
 
         # Extract admin_id from the payload
         admin_id: str | None = payload.get("admin_id")
@@ -70,12 +98,8 @@ async def get_current_user(
                 detail="Authentication credentials were not provided",
             )
 
-        # Decode the JWT token
-        payload: dict = jwt.decode(
-            token,
-            settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM],
-        )
+        # Decode the JWT token, or reuse the claims it was verified with
+        payload: dict = decode_access_token(token)
 
         # Extract user_id from the payload
         user_id: str | None = payload.get("user_id")
@@ -99,3 +123,34 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
+
+
+# Dependency to authenticate a metric ingestion client
+async def get_ingest_client(
+    request: Request,
+) -> IngestClientData:
+    """
+    Dependency to accept a service ingestion key as a Bearer token, falling
+    back to the user access token cookie when no key is sent.
+    """
+
+    authorization: str | None = request.headers.get("authorization")
+
+    if authorization is None:
+        user = await get_current_user(request)
+        return IngestClientData(user_id=user.user_id)
+
+    # Verify the key against the cached fingerprints
+    scheme, _, key = authorization.partition(" ")
+    service_id = None
+    if scheme.lower() == "bearer" and key.strip():
+        service_id = await ingest_keys.verify(key.strip())
+
+    if service_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or revoked ingestion key",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return IngestClientData(service_id=service_id)
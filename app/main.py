@@ -5,7 +5,15 @@ from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
 
 from app.configs.session import engine
+from app.configs.settings import settings
 from app.repository.routes import api_router
+from app.tasks.health_checks.runtime import HealthCheckRuntime
+from app.tasks.ingest.ingest_keys import ingest_keys
+from app.tasks.ingest.queue import metric_queue
+from app.tasks.maintenance.partitions import PartitionMaintainer
+from app.tasks.rollups.request_metrics import RequestMetricRollupJob
+from app.utils.password_hashing import password_hash_pool
+from app.utils.token_cache import verified_tokens
 
 
 @asynccontextmanager
@@ -19,8 +27,56 @@ async def lifespan(app: FastAPI):
         print(" PostgreSQL connection failed")
         raise exc
 
+    # Startup: make sure the partitions raw rows are written to exist
+    partitions: PartitionMaintainer | None = None
+    if settings.PARTITION_MAINTENANCE_ENABLED:
+        partitions = PartitionMaintainer()
+        await partitions.start()
+
+    # Startup: flush queued metric batches in the background
+    await metric_queue.start()
+
+    # Startup: evict revoked ingestion keys from the key cache
+    await ingest_keys.start()
+
+    # Startup: drop the cached tokens of sessions logged out on other workers
+    await verified_tokens.start()
+
+    # Startup: keep the request metric rollups current
+    rollups: RequestMetricRollupJob | None = None
+    if settings.ROLLUP_ENABLED:
+        rollups = RequestMetricRollupJob()
+        await rollups.start()
+
+    # Startup: run the health check scheduler in-process when enabled
+    health_checks: HealthCheckRuntime | None = None
+    if settings.HEALTH_CHECK_SCHEDULER_ENABLED:
+        health_checks = HealthCheckRuntime()
+        await health_checks.start()
+
     yield
 
+    # Shutdown: stop probing, then flush the buffered ping logs
+    if health_checks is not None:
+        await health_checks.stop()
+
+    # Shutdown: stop accepting metrics and drain the queue
+    await metric_queue.stop()
+    await ingest_keys.stop()
+
+    # Shutdown: stop the rollup and partition jobs
+    if rollups is not None:
+        await rollups.stop()
+
+    if partitions is not None:
+        await partitions.stop()
+
+    # Shutdown: stop polling for logged out sessions
+    await verified_tokens.stop()
+
+    # Shutdown: finish the password hashes in progress
+    password_hash_pool.shutdown()
+
     # Shutdown: release DB resources
     await engine.dispose()
     print("🛑 PostgreSQL engine disposed")
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import UUID, DateTime, ForeignKey, String
+from sqlalchemy import UUID, DateTime, ForeignKey, Index, LargeBinary, String, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.root_model import RootModel
@@ -11,6 +11,14 @@ from app.utils.generators import get_current_datetime, get_uuid
 # Class to handle the Admin Session
 class AdminSession(RootModel):
     __tablename__ = "admin_sessions"
+    __table_args__ = (
+        # Workers poll for sessions logged out since their previous poll
+        Index(
+            "ix_admin_sessions_revoked_updated_at",
+            "updated_at",
+            postgresql_where=text("NOT is_active"),
+        ),
+    )
 
     admin_session_id: Mapped[TypeUUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=get_uuid
@@ -33,6 +41,10 @@ class AdminSession(RootModel):
         nullable=True,
     )
     refresh_token: Mapped[str] = mapped_column(String, nullable=True)
+    # SHA-256 of the refresh token, which sessions are looked up by
+    refresh_token_digest: Mapped[bytes | None] = mapped_column(
+        LargeBinary, nullable=True, unique=True, index=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=get_current_datetime, nullable=False
     )
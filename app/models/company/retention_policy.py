@@ -0,0 +1,26 @@
+from datetime import datetime
+from sqlalchemy import UUID, DateTime, SmallInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.root_model import RootModel
+from app.types.auth import TypeUUID
+from app.utils.generators import get_current_datetime
+
+
+# Raw metric retention chosen by a company; companies without a row use the default
+class CompanyRetentionPolicy(RootModel):
+    __tablename__ = "company_retention_policies"
+
+    company_id: Mapped[TypeUUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+
+    retention_days: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=get_current_datetime
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=get_current_datetime,
+        onupdate=get_current_datetime,
+    )
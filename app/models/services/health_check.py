@@ -27,6 +27,11 @@ class ServiceHealthCheck(RootModel):
     timeout_ms: Mapped[int] = mapped_column(Integer, default=3000, nullable=False)
     interval_seconds: Mapped[int] = mapped_column(Integer, default=60, nullable=False)
 
+    # Adaptive mode: probe faster after a state change, back off while down
+    adaptive_interval: Mapped[bool] = mapped_column(default=False, nullable=False)
+    min_interval_seconds: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    max_interval_seconds: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
     is_active: Mapped[bool] = mapped_column(default=True, nullable=False)
 
     created_at: Mapped[datetime] = mapped_column(
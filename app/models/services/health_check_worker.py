@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.root_model import RootModel
+from app.utils.generators import get_current_datetime
+
+
+# Model to track the live health check workers through heartbeats
+class HealthCheckWorker(RootModel):
+    __tablename__ = "health_check_workers"
+
+    worker_id: Mapped[str] = mapped_column(String, primary_key=True)
+    hostname: Mapped[str] = mapped_column(String, nullable=False)
+
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=get_current_datetime, nullable=False
+    )
+    heartbeat_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=get_current_datetime,
+        nullable=False,
+        index=True,
+    )
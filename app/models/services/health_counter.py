@@ -0,0 +1,40 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, Integer, DateTime, UUID, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.root_model import RootModel
+from app.types.auth import TypeUUID
+
+
+# Probe counters and latency totals of a check for one time bucket
+class ServiceHealthCounter(RootModel):
+    __tablename__ = "service_health_counters"
+    __table_args__ = (
+        Index(
+            "ix_service_health_counters_service_bucket", "service_id", "bucket_start"
+        ),
+    )
+
+    health_check_id: Mapped[TypeUUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("service_health_checks.health_check_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    bucket_start: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True
+    )
+
+    service_id: Mapped[TypeUUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("services.service_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    up_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    degraded_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    down_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    # Probes that got a response contribute to the latency totals
+    latency_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    latency_sum_ms: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    latency_max_ms: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
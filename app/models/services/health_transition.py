@@ -0,0 +1,53 @@
+from datetime import datetime
+from sqlalchemy import Integer, String, DateTime, UUID, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.root_model import RootModel
+from app.types.auth import TypeUUID
+from app.utils.generators import get_uuid, get_current_datetime
+
+
+# One row per change of the health state of a check
+class ServiceHealthTransition(RootModel):
+    __tablename__ = "service_health_transitions"
+    __table_args__ = (
+        Index(
+            "ix_service_health_transitions_check_changed_at",
+            "health_check_id",
+            "changed_at",
+        ),
+        Index(
+            "ix_service_health_transitions_service_changed_at",
+            "service_id",
+            "changed_at",
+        ),
+    )
+
+    transition_id: Mapped[TypeUUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=get_uuid
+    )
+
+    health_check_id: Mapped[TypeUUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("service_health_checks.health_check_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    service_id: Mapped[TypeUUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("services.service_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    state: Mapped[str] = mapped_column(String, nullable=False)
+    previous_state: Mapped[str | None] = mapped_column(String, nullable=True)
+
+    # The probe that caused the change
+    status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    response_time_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=get_current_datetime, nullable=False
+    )
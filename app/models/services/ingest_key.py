@@ -0,0 +1,43 @@
+from datetime import datetime
+from sqlalchemy import DateTime, ForeignKey, Index, LargeBinary, String, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.root_model import RootModel
+from app.types.auth import TypeUUID
+from app.utils.generators import get_current_datetime, get_uuid
+
+
+# API key a service authenticates its metric ingestion with
+class ServiceIngestKey(RootModel):
+    __tablename__ = "service_ingest_keys"
+    __table_args__ = (Index("ix_service_ingest_keys_revoked_at", "revoked_at"),)
+
+    key_id: Mapped[TypeUUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=get_uuid
+    )
+
+    service_id: Mapped[TypeUUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("services.service_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    name: Mapped[str] = mapped_column(String, nullable=False)
+
+    # Only the SHA-256 of the key is stored; the prefix identifies it in lists
+    key_hash: Mapped[bytes] = mapped_column(LargeBinary, nullable=False, unique=True)
+    key_prefix: Mapped[str] = mapped_column(String, nullable=False)
+
+    revoked_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=get_current_datetime
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=get_current_datetime,
+        onupdate=get_current_datetime,
+    )
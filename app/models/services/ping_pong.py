@@ -1,5 +1,13 @@
 from datetime import datetime
-from sqlalchemy import Integer, Boolean, DateTime, UUID, ForeignKey
+from sqlalchemy import (
+    Integer,
+    SmallInteger,
+    Boolean,
+    DateTime,
+    UUID,
+    ForeignKey,
+    Index,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.root_model import RootModel
@@ -7,8 +15,14 @@ from app.types.auth import TypeUUID
 from app.utils.generators import get_uuid, get_current_datetime
 
 
+# Raw probe results, partitioned by retention tier and then by day; the
+# day partitions are managed by app.tasks.maintenance.partitions
 class ServicePingLog(RootModel):
     __tablename__ = "service_ping_logs"
+    __table_args__ = (
+        Index("ix_service_ping_logs_service_id_checked_at", "service_id", "checked_at"),
+        {"postgresql_partition_by": "LIST (retention_days)"},
+    )
 
     ping_id: Mapped[TypeUUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=get_uuid
@@ -23,11 +37,19 @@ class ServicePingLog(RootModel):
     status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
     response_time_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
+    # Phase breakdown; connection phases are null when a connection was reused
+    dns_ms: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
+    connect_ms: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
+    tls_ms: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
+    ttfb_ms: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
+
     is_success: Mapped[bool] = mapped_column(Boolean, nullable=False)
 
     checked_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=get_current_datetime, nullable=False
+        DateTime(timezone=True), default=get_current_datetime, primary_key=True
     )
+    retention_days: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=get_current_datetime, nullable=False
     )
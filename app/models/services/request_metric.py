@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import String, Integer, DateTime, UUID, ForeignKey
+from sqlalchemy import String, Integer, SmallInteger, DateTime, UUID, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.root_model import RootModel
@@ -7,8 +7,14 @@ from app.types.auth import TypeUUID
 from app.utils.generators import get_current_datetime, get_uuid
 
 
+# Raw request metrics, partitioned by retention tier and then by day; the
+# day partitions are managed by app.tasks.maintenance.partitions
 class RequestMetric(RootModel):
     __tablename__ = "request_metrics"
+    __table_args__ = (
+        Index("ix_request_metrics_service_id_occurred_at", "service_id", "occurred_at"),
+        {"postgresql_partition_by": "LIST (retention_days)"},
+    )
 
     metric_id: Mapped[TypeUUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=get_uuid
@@ -27,8 +33,10 @@ class RequestMetric(RootModel):
     latency_ms: Mapped[int] = mapped_column(Integer, nullable=False)
 
     occurred_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False
+        DateTime(timezone=True), primary_key=True
     )
+    retention_days: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=get_current_datetime, nullable=False
     )
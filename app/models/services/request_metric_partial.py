@@ -0,0 +1,50 @@
+from datetime import datetime
+from sqlalchemy import (
+    BigInteger,
+    Identity,
+    Integer,
+    LargeBinary,
+    SmallInteger,
+    String,
+    DateTime,
+    UUID,
+    Index,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.root_model import RootModel
+from app.types.auth import TypeUUID
+from app.utils.generators import get_current_datetime
+
+
+# Per-minute aggregates of one ingested batch, waiting to be folded into the
+# rollups; rows are deleted as soon as the rollup job has merged them
+class RequestMetricPartial(RootModel):
+    __tablename__ = "request_metric_partials"
+    __table_args__ = (Index("ix_request_metric_partials_created_at", "created_at"),)
+
+    partial_id: Mapped[int] = mapped_column(
+        BigInteger, Identity(always=False), primary_key=True
+    )
+
+    # No foreign key: partials of a deleted service are dropped at merge time
+    service_id: Mapped[TypeUUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    path: Mapped[str] = mapped_column(String, nullable=False)
+    method: Mapped[str] = mapped_column(String, nullable=False)
+    status_class: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    bucket_start: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+    request_count: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    error_count: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    latency_sum_ms: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    latency_min_ms: Mapped[int] = mapped_column(Integer, nullable=False)
+    latency_max_ms: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # Serialised app.utils.sketch.LatencySketch
+    latency_sketch: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=get_current_datetime, nullable=False
+    )
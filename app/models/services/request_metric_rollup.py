@@ -0,0 +1,65 @@
+from datetime import datetime
+from sqlalchemy import (
+    BigInteger,
+    Integer,
+    LargeBinary,
+    SmallInteger,
+    String,
+    DateTime,
+    UUID,
+    ForeignKey,
+    Index,
+)
+from sqlalchemy.orm import Mapped, declared_attr, mapped_column
+
+from app.models.root_model import RootModel
+from app.types.auth import TypeUUID
+
+
+# Columns shared by the request metric rollups of every resolution
+class RequestMetricRollupMixin:
+    @declared_attr.directive
+    def __table_args__(cls):
+        return (
+            Index(
+                f"ix_{cls.__tablename__}_service_bucket", "service_id", "bucket_start"
+            ),
+        )
+
+    service_id: Mapped[TypeUUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("services.service_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    path: Mapped[str] = mapped_column(String, primary_key=True)
+    method: Mapped[str] = mapped_column(String, primary_key=True)
+
+    # status_code // 100, so 2 for 2xx responses
+    status_class: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True
+    )
+
+    request_count: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    error_count: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    latency_sum_ms: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    latency_min_ms: Mapped[int] = mapped_column(Integer, nullable=False)
+    latency_max_ms: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # Serialised app.utils.sketch.LatencySketch of every request in the bucket
+    latency_sketch: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+# Request metrics per minute
+class RequestMetricRollup1m(RequestMetricRollupMixin, RootModel):
+    __tablename__ = "request_metric_rollups_1m"
+
+
+# Request metrics per hour
+class RequestMetricRollup1h(RequestMetricRollupMixin, RootModel):
+    __tablename__ = "request_metric_rollups_1h"
+
+
+# Request metrics per day
+class RequestMetricRollup1d(RequestMetricRollupMixin, RootModel):
+    __tablename__ = "request_metric_rollups_1d"
@@ -0,0 +1,23 @@
+from datetime import datetime
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.root_model import RootModel
+from app.utils.generators import get_current_datetime
+
+
+# Progress of an incremental rollup job over its source table
+class RollupWatermark(RootModel):
+    __tablename__ = "rollup_watermarks"
+
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+
+    # Source rows created up to this instant are folded into the rollups
+    watermark: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=get_current_datetime,
+        onupdate=get_current_datetime,
+    )
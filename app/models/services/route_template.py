@@ -0,0 +1,40 @@
+from datetime import datetime
+from sqlalchemy import String, DateTime, UUID, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.root_model import RootModel
+from app.types.auth import TypeUUID
+from app.utils.generators import get_uuid, get_current_datetime
+
+
+# User-defined route template that ingested paths of a service are matched to
+class ServiceRouteTemplate(RootModel):
+    __tablename__ = "service_route_templates"
+    __table_args__ = (
+        UniqueConstraint(
+            "service_id", "template", name="uq_service_route_templates_template"
+        ),
+    )
+
+    template_id: Mapped[TypeUUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=get_uuid
+    )
+
+    service_id: Mapped[TypeUUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("services.service_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # e.g. "/users/{user_id}/orders/{order_id}"
+    template: Mapped[str] = mapped_column(String, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=get_current_datetime
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=get_current_datetime,
+        onupdate=get_current_datetime,
+    )
@@ -6,4 +6,21 @@ from app.models.predefs.country import Country
 from app.models.predefs.state import State
 from app.models.predefs.city import City
 from app.models.auth.user import User
-from app.models.auth.user_session import UserSession
\ No newline at end of file
+from app.models.auth.user_session import UserSession
+from app.models.services.services import Service
+from app.models.services.health_check import ServiceHealthCheck
+from app.models.services.health_check_worker import HealthCheckWorker
+from app.models.services.ping_pong import ServicePingLog
+from app.models.services.health_transition import ServiceHealthTransition
+from app.models.services.health_counter import ServiceHealthCounter
+from app.models.services.request_metric import RequestMetric
+from app.models.services.request_metric_partial import RequestMetricPartial
+from app.models.services.request_metric_rollup import (
+    RequestMetricRollup1m,
+    RequestMetricRollup1h,
+    RequestMetricRollup1d,
+)
+from app.models.services.rollup_watermark import RollupWatermark
+from app.models.services.route_template import ServiceRouteTemplate
+from app.models.services.ingest_key import ServiceIngestKey
+from app.models.company.retention_policy import CompanyRetentionPolicy
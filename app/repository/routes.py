@@ -1,4 +1,10 @@
 from app.routes.v1.admin.auth import router
+from app.routes.v1.admin.metrics import router as admin_metrics_router
+from app.routes.v1.user.health_check import router as user_health_check_router
+from app.routes.v1.user.request_metrics import router as user_request_metrics_router
+from app.routes.v1.user.route_templates import router as user_route_templates_router
+from app.routes.v1.user.ingest_keys import router as user_ingest_keys_router
+from app.routes.v1.ingest.request_metrics import router as ingest_metrics_router
 
 from fastapi import APIRouter
 
@@ -10,3 +16,20 @@ api_router = APIRouter(prefix="/v1")
 # Include admin authentication routes
 api_router.include_router(router)
 
+# Include admin metrics routes
+api_router.include_router(admin_metrics_router)
+
+# Include user health check routes
+api_router.include_router(user_health_check_router)
+
+# Include user request metric routes
+api_router.include_router(user_request_metrics_router)
+
+# Include user route template routes
+api_router.include_router(user_route_templates_router)
+
+# Include user ingestion key routes
+api_router.include_router(user_ingest_keys_router)
+
+# Include metric ingestion routes
+api_router.include_router(ingest_metrics_router)
@@ -3,7 +3,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.configs.settings import settings
 from app.schemas.auth.admin import AdminLoginRequest, AdminSignUpRequest
-from app.services.auth.admin import login_admin, refresh_admin_token, signup_admin
+from app.services.auth.admin import (
+    login_admin,
+    logout_admin,
+    refresh_admin_token,
+    signup_admin,
+)
 from app.types.db import DBSession
 from app.configs.session import get_database
 
@@ -121,3 +126,26 @@ async def admin_refresh_access_token(
         "success": True,
         "message": "Access token refreshed successfully",
     }
+
+
+@router.post("/logout")
+async def admin_logout(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_database),
+):
+    """
+    Revoke the admin session and clear the auth cookies.
+    """
+    refresh_token = request.cookies.get("refresh_token")
+
+    if refresh_token:
+        await logout_admin(db=db, refresh_token=refresh_token)
+
+    response.delete_cookie(key="access_token", path="/")
+    response.delete_cookie(key="refresh_token", path="/")
+
+    return {
+        "success": True,
+        "message": "Logout successful",
+    }
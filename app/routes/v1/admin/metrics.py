@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+
+from app.dependencies.auth import get_current_admin
+from app.schemas.auth.admin import AdminData
+from app.utils.metrics import metrics
+
+# Configure the api router
+router = APIRouter(prefix="/admin/metrics", tags=["Admin Metrics"])
+
+
+@router.get("")
+async def metrics_get(
+    _auth: AdminData = Depends(get_current_admin),
+):
+    """Router Function to expose the in-process metrics of this worker"""
+
+    return {
+        "success": True,
+        "metrics": metrics.snapshot(),
+    }
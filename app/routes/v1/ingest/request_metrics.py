@@ -0,0 +1,92 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+
+from app.configs.session import get_database
+from app.dependencies.auth import get_ingest_client
+from app.schemas.auth.ingest import IngestClientData
+from app.schemas.services.request_metric import RequestMetricBatchAdapter
+from app.services.ingest.decoders import STREAM_DECODERS
+from app.services.ingest.path_templates import template_batch_paths
+from app.services.ingest.request_metrics import (
+    check_batch_owner,
+    ensure_services_exist,
+    get_media_type,
+    parse_request_metrics,
+    read_request_body,
+    stream_request_body,
+)
+from app.tasks.ingest.hot_window import hot_window
+from app.tasks.ingest.queue import metric_queue
+from app.types.db import DBSession
+from app.utils.metrics import metrics
+
+# Configure the api router
+router = APIRouter(prefix="/ingest", tags=["Ingestion"])
+
+# The body is read raw, so describe the accepted formats for the docs
+_BATCH_SCHEMA = RequestMetricBatchAdapter.json_schema()
+_BINARY_SCHEMA = {"type": "string", "format": "binary"}
+_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": _BATCH_SCHEMA},
+            "application/x-ndjson": {"schema": _BATCH_SCHEMA["items"]},
+            "application/msgpack": {"schema": _BINARY_SCHEMA},
+            "application/x-protobuf": {"schema": _BINARY_SCHEMA},
+        },
+    }
+}
+
+
+@router.post(
+    "/request-metrics",
+    status_code=status.HTTP_202_ACCEPTED,
+    openapi_extra=_REQUEST_BODY,
+)
+async def request_metrics_ingest(
+    request: Request,
+    client: IngestClientData = Depends(get_ingest_client),
+    db: DBSession = Depends(get_database),
+):
+    """
+    Router Function to ingest a batch of request metrics as JSON, NDJSON,
+    MessagePack or length-delimited protobuf, chosen by Content-Type, and
+    optionally compressed with gzip or zstd (Content-Encoding).
+
+    Services authenticate with their ingestion key as a Bearer token.
+    """
+
+    content_type = request.headers.get("content-type", "")
+
+    # Binary formats are decoded while the body streams in
+    decoder = STREAM_DECODERS.get(get_media_type(content_type))
+    if decoder is not None:
+        with metrics.timer("ingest.request_metrics.decode"):
+            batch = await decoder(stream_request_body(request))
+    else:
+        body = await read_request_body(request)
+        with metrics.timer("ingest.request_metrics.parse"):
+            batch = parse_request_metrics(body, content_type)
+
+    check_batch_owner(batch, client.service_id)
+    await ensure_services_exist(db, set(batch.service_ids))
+
+    # Raw paths would make every id its own series in the rollups
+    with metrics.timer("ingest.request_metrics.paths"):
+        await template_batch_paths(batch)
+
+    # Shed load instead of queueing without bound; the rows are written later
+    if not metric_queue.offer(batch):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Metric ingestion is overloaded, retry later",
+            headers={"Retry-After": str(metric_queue.retry_after())},
+        )
+
+    # Live views read accepted rows from memory before they are written
+    hot_window.add(batch)
+
+    return {
+        "success": True,
+        "accepted": len(batch),
+    }
@@ -4,7 +4,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.configs.session import get_database
 from app.configs.settings import settings
 from app.schemas.auth.user import UserLoginRequest, UserSignUpRequest
-from app.services.auth.user import refresh_user_token, user_login, user_signup
+from app.services.auth.user import (
+    refresh_user_token,
+    user_login,
+    user_logout,
+    user_signup,
+)
 
 # Configure the router
 router = APIRouter(prefix="/v1/user/auth", tags=["User Authentication"])
@@ -99,3 +104,22 @@ async def refresh_access_token(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to refresh access token",
         )
+
+
+# Router to log the user out
+@router.post("/logout", status_code=status.HTTP_200_OK)
+async def logout_user(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_database),
+):
+    """Route to revoke the session of the refresh token cookie"""
+    refresh_token: str | None = request.cookies.get("refresh_token")
+
+    if refresh_token is not None:
+        await user_logout(db=db, refresh_token=refresh_token)
+
+    response.delete_cookie(key="access_token")
+    response.delete_cookie(key="refresh_token")
+
+    return {"message": "Logout successful"}
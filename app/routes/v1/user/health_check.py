@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+from fastapi import APIRouter, Depends, Query
+
+from app.configs.session import get_database
+from app.dependencies.auth import get_current_user
+from app.schemas.auth.user import UserData
+from app.services.services.health_checks import (
+    get_latency_breakdown,
+    get_uptime_summary,
+)
+from app.types.auth import TypeUUID
+from app.types.db import DBSession
+from app.utils.generators import get_current_datetime
+
+# Configure the api router
+router = APIRouter(prefix="/user/health-checks", tags=["User Health Checks"])
+
+
+# Route to get the probe latency breakdown of a service
+@router.get("/latency")
+async def health_check_latency(
+    _auth: UserData = Depends(get_current_user),
+    service_id: TypeUUID = Query(..., description="Service to aggregate"),
+    window_minutes: int = Query(60, ge=1, le=7 * 24 * 60),
+    db: DBSession = Depends(get_database),
+):
+    """Router Function to return per-phase p50/p95 probe timings of a service"""
+
+    since = get_current_datetime() - timedelta(minutes=window_minutes)
+    phases = await get_latency_breakdown(db=db, service_id=service_id, since=since)
+
+    return {
+        "success": True,
+        "service_id": str(service_id),
+        "window_minutes": window_minutes,
+        "phases": phases,
+    }
+
+
+# Route to get the uptime summary of a service
+@router.get("/uptime")
+async def health_check_uptime(
+    _auth: UserData = Depends(get_current_user),
+    service_id: TypeUUID = Query(..., description="Service to summarise"),
+    window_minutes: int = Query(24 * 60, ge=1, le=90 * 24 * 60),
+    db: DBSession = Depends(get_database),
+):
+    """Router Function to return uptime, latency and state changes of a service"""
+
+    since = get_current_datetime() - timedelta(minutes=window_minutes)
+    summary = await get_uptime_summary(db=db, service_id=service_id, since=since)
+
+    return {
+        "success": True,
+        "service_id": str(service_id),
+        "window_minutes": window_minutes,
+        **summary,
+    }
@@ -0,0 +1,79 @@
+from fastapi import APIRouter, Body, Depends, Query, status
+
+from app.configs.session import get_database
+from app.dependencies.auth import get_current_user
+from app.schemas.auth.user import UserData
+from app.schemas.services.ingest_key import (
+    IngestKeyCreateRequest,
+    IngestKeyRevokeRequest,
+)
+from app.services.services.ingest_keys import (
+    create_ingest_key,
+    get_ingest_keys,
+    revoke_ingest_key,
+)
+from app.types.auth import TypeUUID
+from app.types.db import DBSession
+
+# Configure the api router
+router = APIRouter(prefix="/user/ingest-keys", tags=["User Ingestion Keys"])
+
+
+# Route to create an ingestion key for a service
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def ingest_key_create(
+    _auth: UserData = Depends(get_current_user),
+    payload: IngestKeyCreateRequest = Body(...),
+    db: DBSession = Depends(get_database),
+):
+    """Router Function to create an ingestion key; the key is only shown once"""
+
+    ingest_key, key = await create_ingest_key(db=db, payload=payload)
+
+    return {
+        "success": True,
+        "key_id": str(ingest_key.key_id),
+        "key": key,
+    }
+
+
+# Route to get the ingestion keys of a service
+@router.get("")
+async def ingest_key_list(
+    _auth: UserData = Depends(get_current_user),
+    service_id: TypeUUID = Query(..., description="Service to list keys of"),
+    db: DBSession = Depends(get_database),
+):
+    """Router Function to list the ingestion keys of a service"""
+
+    ingest_keys = await get_ingest_keys(db=db, service_id=service_id)
+
+    return {
+        "success": True,
+        "ingest_keys": [
+            {
+                "key_id": str(ingest_key.key_id),
+                "name": ingest_key.name,
+                "key_prefix": ingest_key.key_prefix,
+                "created_at": ingest_key.created_at.isoformat(),
+                "revoked_at": ingest_key.revoked_at.isoformat()
+                if ingest_key.revoked_at
+                else None,
+            }
+            for ingest_key in ingest_keys
+        ],
+    }
+
+
+# Route to revoke an ingestion key
+@router.delete("")
+async def ingest_key_revoke(
+    _auth: UserData = Depends(get_current_user),
+    payload: IngestKeyRevokeRequest = Body(...),
+    db: DBSession = Depends(get_database),
+):
+    """Router Function to revoke an ingestion key on every worker within seconds"""
+
+    await revoke_ingest_key(db=db, payload=payload)
+
+    return {"success": True}
@@ -0,0 +1,151 @@
+from datetime import datetime, timedelta
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import AwareDatetime
+
+from app.configs.session import get_database
+from app.configs.settings import settings
+from app.dependencies.auth import get_current_user
+from app.schemas.auth.user import UserData
+from app.services.services.request_metrics import (
+    get_downsampled_series,
+    get_request_metric_series,
+)
+from app.tasks.ingest.hot_window import hot_window, summarize_hot_window
+from app.types.auth import TypeUUID
+from app.types.db import DBSession
+
+# Configure the api router
+router = APIRouter(prefix="/user/request-metrics", tags=["User Request Metrics"])
+
+
+def _floor_minute(moment: datetime) -> datetime:
+    return moment.replace(second=0, microsecond=0)
+
+
+def _ceil_minute(moment: datetime) -> datetime:
+    floored = _floor_minute(moment)
+    return floored if floored == moment else floored + timedelta(minutes=1)
+
+
+# Route to get the request metric series of a service
+@router.get("/series")
+async def request_metric_series(
+    _auth: UserData = Depends(get_current_user),
+    service_id: TypeUUID = Query(..., description="Service to aggregate"),
+    start: AwareDatetime = Query(..., alias="from"),
+    end: AwareDatetime = Query(..., alias="to"),
+    step_seconds: int = Query(60, ge=60, multiple_of=60),
+    path: str | None = Query(None),
+    method: str | None = Query(None),
+    db: DBSession = Depends(get_database),
+):
+    """Router Function to return request count, error rate and latency per step"""
+
+    # Rollups start at one minute, so the range is widened to whole minutes
+    start = _floor_minute(start)
+    end = _ceil_minute(end)
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="'to' must be after 'from'",
+        )
+
+    points = (end - start).total_seconds() / step_seconds
+    if points > settings.ROLLUP_MAX_SERIES_POINTS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=f"Requests are limited to {settings.ROLLUP_MAX_SERIES_POINTS} steps",
+        )
+
+    series = await get_request_metric_series(
+        db=db,
+        service_id=service_id,
+        start=start,
+        end=end,
+        step_seconds=step_seconds,
+        path=path,
+        method=method,
+    )
+
+    return {
+        "success": True,
+        "service_id": str(service_id),
+        "step_seconds": step_seconds,
+        **series,
+    }
+
+
+# Route to get a latency and error rate series sized for a chart
+@router.get("/downsampled")
+async def request_metric_downsampled(
+    _auth: UserData = Depends(get_current_user),
+    service_id: TypeUUID = Query(..., description="Service to aggregate"),
+    start: AwareDatetime = Query(..., alias="from"),
+    end: AwareDatetime = Query(..., alias="to"),
+    max_points: int = Query(800, ge=3, le=settings.ROLLUP_MAX_SERIES_POINTS),
+    agg: Literal["avg", "max", "p50", "p90", "p95", "p99"] = Query("p95"),
+    downsample: Literal["lttb", "minmax"] = Query("lttb"),
+    path: str | None = Query(None),
+    method: str | None = Query(None),
+    db: DBSession = Depends(get_database),
+):
+    """Router Function to return latency and error rate in at most max_points"""
+
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="'to' must be after 'from'",
+        )
+
+    series = await get_downsampled_series(
+        db=db,
+        service_id=service_id,
+        start=start,
+        end=end,
+        max_points=max_points,
+        agg=agg,
+        downsample=downsample,
+        path=path,
+        method=method,
+    )
+
+    return {
+        "success": True,
+        "service_id": str(service_id),
+        "agg": agg,
+        "downsample": downsample,
+        **series,
+    }
+
+
+# Route to get the live view of a service from this worker's hot window
+@router.get("/live")
+async def request_metric_live(
+    _auth: UserData = Depends(get_current_user),
+    service_id: TypeUUID = Query(..., description="Service to aggregate"),
+    window_seconds: int = Query(
+        settings.HOT_WINDOW_SECONDS, ge=60, le=settings.HOT_WINDOW_SECONDS
+    ),
+    step_seconds: int = Query(60, ge=5, le=3600),
+    path: str | None = Query(None),
+    method: str | None = Query(None),
+):
+    """Router Function to return the last minutes of a service from memory"""
+
+    live = summarize_hot_window(
+        hot_window.get(service_id),
+        window_seconds=window_seconds,
+        step_seconds=step_seconds,
+        path=path,
+        method=method,
+    )
+
+    return {
+        "success": True,
+        "service_id": str(service_id),
+        "window_seconds": window_seconds,
+        "step_seconds": step_seconds,
+        **live,
+    }
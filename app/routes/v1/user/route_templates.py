@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Body, Depends, Query, status
+
+from app.configs.session import get_database
+from app.dependencies.auth import get_current_user
+from app.schemas.auth.user import UserData
+from app.schemas.services.route_template import (
+    RouteTemplateCreateRequest,
+    RouteTemplateDeleteRequest,
+)
+from app.services.services.route_templates import (
+    add_route_template,
+    delete_route_template,
+    get_route_templates,
+)
+from app.types.auth import TypeUUID
+from app.types.db import DBSession
+
+# Configure the api router
+router = APIRouter(prefix="/user/route-templates", tags=["User Route Templates"])
+
+
+# Route to add a route template that ingested paths are matched to
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def route_template_add(
+    _auth: UserData = Depends(get_current_user),
+    payload: RouteTemplateCreateRequest = Body(...),
+    db: DBSession = Depends(get_database),
+):
+    """Router Function to add a route template such as /users/{user_id}"""
+
+    route_template = await add_route_template(db=db, payload=payload)
+
+    return {
+        "success": True,
+        "template_id": str(route_template.template_id),
+    }
+
+
+# Route to get the route templates of a service
+@router.get("")
+async def route_template_list(
+    _auth: UserData = Depends(get_current_user),
+    service_id: TypeUUID = Query(..., description="Service to list templates of"),
+    db: DBSession = Depends(get_database),
+):
+    """Router Function to list the route templates of a service"""
+
+    route_templates = await get_route_templates(db=db, service_id=service_id)
+
+    return {
+        "success": True,
+        "route_templates": [
+            {
+                "template_id": str(route_template.template_id),
+                "template": route_template.template,
+            }
+            for route_template in route_templates
+        ],
+    }
+
+
+# Route to remove a route template
+@router.delete("")
+async def route_template_delete(
+    _auth: UserData = Depends(get_current_user),
+    payload: RouteTemplateDeleteRequest = Body(...),
+    db: DBSession = Depends(get_database),
+):
+    """Router Function to remove a route template from a service"""
+
+    await delete_route_template(db=db, payload=payload)
+
+    return {"success": True}
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+from app.types.auth import TypeUUID
+
+
+# Ingestion client Schema for the dependency
+class IngestClientData(BaseModel):
+    # Set for service ingestion keys, which only ingest for their own service
+    service_id: TypeUUID | None = None
+    user_id: str | None = None
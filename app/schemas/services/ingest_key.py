@@ -0,0 +1,17 @@
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+from app.types.auth import TypeUUID
+
+
+# Schema to create an ingestion key for a service
+class IngestKeyCreateRequest(BaseModel):
+    service_id: TypeUUID
+    name: Annotated[str, Field(min_length=1, max_length=100)]
+
+
+# Schema to revoke an ingestion key of a service
+class IngestKeyRevokeRequest(BaseModel):
+    service_id: TypeUUID
+    key_id: TypeUUID
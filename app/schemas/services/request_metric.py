@@ -0,0 +1,28 @@
+from typing import Annotated
+
+from pydantic import AwareDatetime, Field, TypeAdapter
+from typing_extensions import TypedDict
+
+from app.types.auth import TypeUUID
+
+# Field limits, shared with the binary decoders that skip pydantic
+PATH_MAX_LENGTH = 2048
+METHOD_MAX_LENGTH = 16
+STATUS_CODE_MIN = 100
+STATUS_CODE_MAX = 599
+LATENCY_MS_MAX = 2_147_483_647
+
+
+# Schema of one request record in an ingestion batch
+class RequestMetricRecord(TypedDict):
+    service_id: TypeUUID
+    path: Annotated[str, Field(min_length=1, max_length=PATH_MAX_LENGTH)]
+    method: Annotated[str, Field(min_length=1, max_length=METHOD_MAX_LENGTH)]
+    status_code: Annotated[int, Field(ge=STATUS_CODE_MIN, le=STATUS_CODE_MAX)]
+    latency_ms: Annotated[int, Field(ge=0, le=LATENCY_MS_MAX)]
+    occurred_at: AwareDatetime
+
+
+# Validator for a whole batch; a TypedDict list is checked in one pass over
+# the raw JSON without building a model object per record
+RequestMetricBatchAdapter = TypeAdapter(list[RequestMetricRecord])
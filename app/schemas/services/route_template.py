@@ -0,0 +1,18 @@
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+from app.types.auth import TypeUUID
+from app.utils.paths import ROUTE_TEMPLATE_PATTERN
+
+
+# Schema to add a route template to a service
+class RouteTemplateCreateRequest(BaseModel):
+    service_id: TypeUUID
+    template: Annotated[str, Field(max_length=512, pattern=ROUTE_TEMPLATE_PATTERN)]
+
+
+# Schema to remove a route template from a service
+class RouteTemplateDeleteRequest(BaseModel):
+    service_id: TypeUUID
+    template_id: TypeUUID
@@ -8,11 +8,13 @@ from app.utils.auth import (
     create_access_token,
     create_refresh_token,
     hash_password,
+    refresh_token_digest,
     verify_password,
 )
 from app.models.auth.admin import Admin
 from app.configs.settings import settings
 from app.utils.generators import get_current_datetime
+from app.utils.token_cache import verified_tokens
 
 
 async def signup_admin(db: AsyncSession, payload: AdminSignUpRequest):
@@ -31,7 +33,7 @@ async def signup_admin(db: AsyncSession, payload: AdminSignUpRequest):
         email = payload.email
 
         # Securely hash the password before storage
-        password_hash = hash_password(password=password)
+        password_hash = await hash_password(password=password)
 
         # Create admin entity
         admin = Admin(
@@ -47,6 +49,10 @@ async def signup_admin(db: AsyncSession, payload: AdminSignUpRequest):
 
         return admin
 
+    except HTTPException:
+        # Re-raise refusals such as a full password hashing pool
+        raise
+
     except Exception:
         # Generic failure during signup
         raise HTTPException(
@@ -82,20 +88,12 @@ async def login_admin(
             )
 
         # Verify password
-        if not verify_password(payload.password, admin.password_hash):
+        if not await verify_password(payload.password, admin.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials",
             )
 
-        # Prepare access token payload
-        access_token_payload = {
-            "admin_id": str(admin.admin_id),
-        }
-
-        # Generate short-lived access token
-        access_token = create_access_token(access_token_payload)
-
         # Create a new session (refresh token will be attached later)
         session = AdminSession(
             admin_id=str(admin.admin_id),
@@ -106,6 +104,15 @@ async def login_admin(
         db.add(session)
         await db.flush()
 
+        # Prepare access token payload bound to this session
+        access_token_payload = {
+            "admin_id": str(admin.admin_id),
+            "session_id": str(session.admin_session_id),
+        }
+
+        # Generate short-lived access token
+        access_token = create_access_token(access_token_payload)
+
         # Prepare refresh token payload bound to this session
         refresh_token_payload = {
             "admin_id": str(admin.admin_id),
@@ -117,6 +124,7 @@ async def login_admin(
 
         # Update session with refresh token and expiry
         session.refresh_token = refresh_token
+        session.refresh_token_digest = refresh_token_digest(refresh_token)
         session.expires_at = get_current_datetime() + settings.refresh_token_expire
 
         # Commit all changes atomically
@@ -150,9 +158,11 @@ async def refresh_admin_token(db: AsyncSession, refresh_token: str) -> dict[str,
     3. Optionally issue new refresh token
     """
     try:
-        # Fetch session by refresh token
+        # Fetch session by the digest of the refresh token
         result = await db.execute(
-            select(AdminSession).where(AdminSession.refresh_token == refresh_token)
+            select(AdminSession).where(
+                AdminSession.refresh_token_digest == refresh_token_digest(refresh_token)
+            )
         )
         session = result.scalar_one_or_none()
 
@@ -173,6 +183,7 @@ async def refresh_admin_token(db: AsyncSession, refresh_token: str) -> dict[str,
         # Prepare new access token payload
         access_token_payload = {
             "admin_id": str(admin_id),
+            "session_id": str(session.admin_session_id),
         }
 
         # Generate new access token
@@ -192,6 +203,30 @@ async def refresh_admin_token(db: AsyncSession, refresh_token: str) -> dict[str,
         )
 
 
+# Function to log an admin out
+async def logout_admin(db: AsyncSession, refresh_token: str) -> None:
+    """
+    Revoke the admin session a refresh token belongs to.
+
+    The access tokens of the session are dropped from the verified token
+    cache and refused from then on.
+    """
+    result = await db.execute(
+        select(AdminSession).where(
+            AdminSession.refresh_token_digest == refresh_token_digest(refresh_token)
+        )
+    )
+    session = result.scalar_one_or_none()
+
+    if not session:
+        return
+
+    session.is_active = False
+    await db.commit()
+
+    verified_tokens.revoke_session(str(session.admin_session_id))
+
+
 # Function to handle the admin forgot password
 # TODO: Implement the flow after wards with resend
 # async def forgot_password_admin(db:AsyncSession,)
@@ -11,9 +11,11 @@ from app.utils.auth import (
     create_access_token,
     create_refresh_token,
     hash_password,
+    refresh_token_digest,
     verify_password,
 )
 from app.utils.generators import get_current_datetime
+from app.utils.token_cache import verified_tokens
 
 
 #  Function to user signup
@@ -33,7 +35,7 @@ async def user_signup(db: AsyncSession, payload: UserSignUpRequest):
         city_id = payload.city_id
 
         #  hash the password
-        hashed_password = hash_password(password)
+        hashed_password = await hash_password(password)
 
         new_user = User(
             email=email,
@@ -50,6 +52,10 @@ async def user_signup(db: AsyncSession, payload: UserSignUpRequest):
         await db.refresh(new_user)
         return new_user
 
+    except HTTPException:
+        await db.rollback()
+        raise
+
     except Exception as e:
         await db.rollback()
         raise HTTPException(
@@ -77,7 +83,7 @@ async def user_login(
             )
 
         #  check the password
-        if not verify_password(payload.password, existing_user.hashed_password):
+        if not await verify_password(payload.password, existing_user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials",
@@ -106,12 +112,17 @@ async def user_login(
 
         # add the refresh token to the session
         new_session.refresh_token = refresh_token
+        new_session.refresh_token_digest = refresh_token_digest(refresh_token)
         new_session.is_active = True
         new_session.expires_at = get_current_datetime() + settings.refresh_token_expire
 
         # return the access token and refresh token
         return TokenResponse(access_token=access_token, refresh_token=refresh_token)
 
+    except HTTPException:
+        await db.rollback()
+        raise
+
     except Exception as e:
         await db.rollback()
         raise HTTPException(
@@ -130,9 +141,11 @@ async def refresh_user_token(db: AsyncSession, refresh_token: str) -> str:
     3. Optionally issue new refresh token
     """
     try:
-        # Fetch session by refresh token
+        # Fetch session by the digest of the refresh token
         result = await db.execute(
-            select(UserSession).where(UserSession.refresh_token == refresh_token)
+            select(UserSession).where(
+                UserSession.refresh_token_digest == refresh_token_digest(refresh_token)
+            )
         )
         session = result.scalar_one_or_none()
 
@@ -168,3 +181,27 @@ async def refresh_user_token(db: AsyncSession, refresh_token: str) -> str:
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Token refresh failed due to internal error",
         )
+
+
+# Function to log a user out
+async def user_logout(db: AsyncSession, refresh_token: str) -> None:
+    """
+    Revoke the user session a refresh token belongs to.
+
+    The access tokens of the session are dropped from the verified token
+    cache and refused from then on.
+    """
+    result = await db.execute(
+        select(UserSession).where(
+            UserSession.refresh_token_digest == refresh_token_digest(refresh_token)
+        )
+    )
+    session = result.scalar_one_or_none()
+
+    if not session:
+        return
+
+    session.is_active = False
+    await db.commit()
+
+    verified_tokens.revoke_session(str(session.user_session_id))
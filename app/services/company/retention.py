@@ -0,0 +1,85 @@
+import logging
+import time
+from collections.abc import Iterable
+
+from sqlalchemy import select
+
+from app.configs.session import AsyncSessionLocal
+from app.configs.settings import settings
+from app.models.company.retention_policy import CompanyRetentionPolicy
+from app.models.services.services import Service
+from app.types.auth import TypeUUID
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Tier for retentions beyond the longest configured one; it is never expired
+UNBOUNDED_TIER = 0
+
+# Retention tier per service with the monotonic time it expires at
+_service_tiers: dict[TypeUUID, tuple[int, float]] = {}
+
+
+# Function to round a retention period up to the nearest configured tier
+def retention_tier(days: int | None) -> int:
+    """Function to map a company retention onto a partition tier, never shorter"""
+    if days is None:
+        days = settings.METRIC_RETENTION_DEFAULT_DAYS
+
+    for tier in sorted(settings.METRIC_RETENTION_TIERS_DAYS):
+        if tier >= days:
+            return tier
+    return UNBOUNDED_TIER
+
+
+# Function to resolve the retention tier the raw rows of each service go to
+async def get_retention_tiers(service_ids: Iterable[TypeUUID]) -> dict[TypeUUID, int]:
+    """
+    Function to look up the retention tier of every service of a batch.
+
+    Tiers are cached per service for a short while, so writers only query
+    for services they have not seen recently. Services without a company
+    policy, or that no longer exist, get the default tier.
+    """
+    now = time.monotonic()
+    tiers: dict[TypeUUID, int] = {}
+    missing = set()
+
+    for service_id in set(service_ids):
+        cached = _service_tiers.get(service_id)
+        if cached is not None and cached[1] > now:
+            tiers[service_id] = cached[0]
+        else:
+            missing.add(service_id)
+
+    if missing:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Service.service_id, CompanyRetentionPolicy.retention_days)
+                .outerjoin(
+                    CompanyRetentionPolicy,
+                    CompanyRetentionPolicy.company_id == Service.company_id,
+                )
+                .where(Service.service_id.in_(missing))
+            )
+
+        expires_at = now + settings.METRIC_RETENTION_CACHE_SECONDS
+        for service_id, days in result.all():
+            tier = retention_tier(days)
+            if tier == UNBOUNDED_TIER:
+                # Capping would drop rows the company still has to keep
+                logger.error(
+                    "Retention of %d days for service %s exceeds every tier,"
+                    " its rows are kept without expiry",
+                    days,
+                    service_id,
+                )
+                metrics.increment("retention.unbounded_services")
+            _service_tiers[service_id] = (tier, expires_at)
+            tiers[service_id] = tier
+
+        default = retention_tier(None)
+        for service_id in missing - tiers.keys():
+            tiers[service_id] = default
+
+    return tiers
@@ -0,0 +1,504 @@
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+import msgpack
+from fastapi import HTTPException, status
+
+from app.configs.settings import settings
+from app.schemas.services.request_metric import (
+    LATENCY_MS_MAX,
+    METHOD_MAX_LENGTH,
+    PATH_MAX_LENGTH,
+    STATUS_CODE_MAX,
+    STATUS_CODE_MIN,
+)
+from app.services.ingest.request_metrics import (
+    MAX_REPORTED_ERRORS,
+    check_batch_rows,
+    check_batch_window,
+)
+from app.types.ingest import MetricBatch
+
+MSGPACK_MEDIA_TYPES = {
+    "application/msgpack",
+    "application/x-msgpack",
+    "application/vnd.msgpack",
+}
+
+PROTOBUF_MEDIA_TYPES = {
+    "application/x-protobuf",
+    "application/protobuf",
+    "application/vnd.google.protobuf",
+}
+
+# A single encoded record is far below this; anything larger is corrupt framing
+MAX_PROTOBUF_MESSAGE_BYTES = 64 * 1024
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Microseconds from the epoch that still make a datetime either way
+_MAX_MICROS = 253_402_300_799_999_999
+
+# Marks a field absent from a MessagePack record
+_MISSING = object()
+
+# fixarray, array 16 and array 32
+_ARRAY_MARKERS = {*range(0x90, 0xA0), 0xDC, 0xDD}
+
+
+# Class to collect decoded records into a columnar batch
+class MetricBatchBuilder:
+    """
+    Append decoded records to a MetricBatch column by column, checking them
+    against the limits of RequestMetricRecord without a model per record.
+
+    Each decoded chunk is checked with one pass per column; only a chunk
+    that fails is walked record by record to report errors the way pydantic
+    does, with the record index and field, so every format rejects a batch
+    with the same 422 body. Service ids repeat across a batch and are parsed
+    once per distinct value.
+    """
+
+    __slots__ = ("batch", "rows", "error_count", "errors", "_service_ids")
+
+    def __init__(self):
+        self.batch = MetricBatch()
+        self.rows = 0
+        self.error_count = 0
+        self.errors: list[dict] = []
+        self._service_ids: dict = {}
+
+    def service_ids(self, values) -> list[UUID | None]:
+        """Parse service ids from their text or 16 byte form, None when invalid"""
+        known = self._service_ids
+        try:
+            return [
+                known[value] if value in known else self._service_id(value)
+                for value in values
+            ]
+        except TypeError:
+            # Unhashable values are never valid ids
+            return [_to_uuid(value) for value in values]
+
+    def _service_id(self, value) -> UUID | None:
+        service_id = self._service_ids[value] = _to_uuid(value)
+        return service_id
+
+    def extend(
+        self,
+        service_ids: list,
+        paths: list,
+        methods: list,
+        status_codes: list,
+        latencies_ms: list,
+        occurred_at: list,
+    ) -> None:
+        """Append decoded columns; values are _MISSING when absent, None when invalid"""
+        start = self.rows
+        self.rows += len(paths)
+        check_batch_rows(self.rows)
+
+        valid = (
+            all(type(value) is UUID for value in service_ids)
+            and all(
+                type(value) is str and 0 < len(value) <= PATH_MAX_LENGTH
+                for value in paths
+            )
+            and all(
+                type(value) is str and 0 < len(value) <= METHOD_MAX_LENGTH
+                for value in methods
+            )
+            and all(
+                type(value) is int and STATUS_CODE_MIN <= value <= STATUS_CODE_MAX
+                for value in status_codes
+            )
+            and all(
+                type(value) is int and 0 <= value <= LATENCY_MS_MAX
+                for value in latencies_ms
+            )
+            and all(type(value) is datetime for value in occurred_at)
+        )
+        if not valid:
+            records = zip(
+                service_ids, paths, methods, status_codes, latencies_ms, occurred_at
+            )
+            for index, record in enumerate(records, start):
+                self._report(index, *record)
+
+        # A rejected batch is never written, so stop collecting rows
+        if self.error_count:
+            return
+
+        batch = self.batch
+        batch.service_ids.extend(service_ids)
+        batch.paths.extend(paths)
+        batch.methods.extend([method.upper() for method in methods])
+        batch.status_codes.extend(status_codes)
+        batch.latencies_ms.extend(latencies_ms)
+        batch.occurred_at.extend(occurred_at)
+
+    def _report(
+        self, index, service_id, path, method, status_code, latency_ms, occurred_at
+    ) -> None:
+        """Record an error for each invalid field of one record"""
+        if type(service_id) is not UUID:
+            self._field_error(index, "service_id", service_id, "a valid UUID")
+        if type(path) is not str or not 0 < len(path) <= PATH_MAX_LENGTH:
+            self._field_error(
+                index, "path", path, f"a string of 1 to {PATH_MAX_LENGTH} characters"
+            )
+        if type(method) is not str or not 0 < len(method) <= METHOD_MAX_LENGTH:
+            self._field_error(
+                index,
+                "method",
+                method,
+                f"a string of 1 to {METHOD_MAX_LENGTH} characters",
+            )
+        if (
+            type(status_code) is not int
+            or not STATUS_CODE_MIN <= status_code <= STATUS_CODE_MAX
+        ):
+            self._field_error(
+                index,
+                "status_code",
+                status_code,
+                f"an integer from {STATUS_CODE_MIN} to {STATUS_CODE_MAX}",
+            )
+        if type(latency_ms) is not int or not 0 <= latency_ms <= LATENCY_MS_MAX:
+            self._field_error(
+                index,
+                "latency_ms",
+                latency_ms,
+                f"an integer from 0 to {LATENCY_MS_MAX}",
+            )
+        if type(occurred_at) is not datetime:
+            self._field_error(
+                index, "occurred_at", occurred_at, "a datetime with a timezone"
+            )
+
+    def _field_error(self, index: int, field: str, value, expected: str) -> None:
+        self.error(
+            [index, field],
+            "Field required" if value is _MISSING else f"Input should be {expected}",
+        )
+
+    def error(self, loc: list, msg: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"loc": loc, "msg": msg})
+
+    def reject(self, msg: str) -> None:
+        """Count a record that could not be read at all"""
+        self.error([self.rows], msg)
+        self.rows += 1
+        check_batch_rows(self.rows)
+
+    def malformed(self, msg: str) -> None:
+        """Reject the whole body when it cannot be decoded any further"""
+        self.error([self.rows], msg)
+        self._raise()
+
+    def finish(self) -> MetricBatch:
+        if self.error_count:
+            self._raise()
+        check_batch_window(self.batch)
+        return self.batch
+
+    def _raise(self) -> None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail={
+                "message": "Invalid request metric batch",
+                "error_count": self.error_count,
+                "errors": self.errors,
+            },
+        )
+
+
+# Function to read a service id from its text or 16 byte form
+def _to_uuid(value) -> UUID | None:
+    if value is _MISSING:
+        return value
+    try:
+        if type(value) is str:
+            return UUID(value)
+        if type(value) is bytes:
+            return UUID(bytes=value) if len(value) == 16 else UUID(value.decode())
+    except ValueError:
+        pass
+    return None
+
+
+# Function to read a MessagePack occurred_at value
+def _to_datetime(value) -> datetime | None:
+    """Function to accept a Timestamp extension, epoch seconds or ISO 8601 text"""
+    if value is _MISSING or type(value) is datetime:
+        return value
+    try:
+        if type(value) is int or type(value) is float:
+            return datetime.fromtimestamp(value, timezone.utc)
+        if type(value) is str:
+            moment = datetime.fromisoformat(value)
+            return moment if moment.tzinfo is not None else None
+    except (ValueError, OverflowError, OSError):
+        pass
+    return None
+
+
+# Function to add decoded MessagePack records to the batch
+def _extend_msgpack_records(builder: MetricBatchBuilder, records: list) -> None:
+    if not all(type(record) is dict for record in records):
+        # Keep record indexes right around values that are not maps
+        for record in records:
+            if type(record) is dict:
+                _extend_msgpack_records(builder, [record])
+            else:
+                builder.reject("Input should be a map")
+        return
+
+    builder.extend(
+        builder.service_ids([record.get("service_id", _MISSING) for record in records]),
+        [record.get("path", _MISSING) for record in records],
+        [record.get("method", _MISSING) for record in records],
+        [record.get("status_code", _MISSING) for record in records],
+        [record.get("latency_ms", _MISSING) for record in records],
+        [_to_datetime(record.get("occurred_at", _MISSING)) for record in records],
+    )
+
+
+# Function to decode a MessagePack body as it arrives
+async def decode_msgpack_stream(chunks: AsyncIterator[bytes]) -> MetricBatch:
+    """
+    Function to decode a stream of MessagePack maps, optionally wrapped in
+    one top-level array, into a columnar batch.
+
+    Records are unpacked chunk by chunk as the body is received, so the body
+    is never held whole and decoding overlaps with the upload. Maps use the
+    field names of the JSON format; occurred_at may be a Timestamp extension,
+    epoch seconds or ISO 8601 text, and service_id text or 16 raw bytes.
+    """
+    unpacker = msgpack.Unpacker(
+        timestamp=3, max_buffer_size=settings.INGEST_MAX_BODY_BYTES
+    )
+    builder = MetricBatchBuilder()
+
+    # Records announced by a top-level array, -1 for a bare stream of maps
+    declared = None
+    received = 0
+
+    try:
+        async for chunk in chunks:
+            unpacker.feed(chunk)
+            received += len(chunk)
+
+            # The first byte tells a top-level array from a stream of maps
+            if declared is None:
+                if received == len(chunk) and chunk[0] not in _ARRAY_MARKERS:
+                    declared = -1
+                else:
+                    try:
+                        declared = unpacker.read_array_header()
+                    except msgpack.OutOfData:
+                        continue
+                    check_batch_rows(declared)
+
+            _extend_msgpack_records(builder, list(unpacker))
+    except (msgpack.UnpackException, ValueError) as exc:
+        builder.malformed(f"Invalid MessagePack: {str(exc) or type(exc).__name__}")
+
+    if unpacker.tell() != received or (
+        declared is not None and declared > builder.rows
+    ):
+        builder.malformed("Invalid MessagePack: body ends in the middle of a value")
+    if declared is not None and 0 <= declared < builder.rows:
+        builder.malformed("Invalid MessagePack: data after the top-level array")
+
+    return builder.finish()
+
+
+# Function to read a protobuf base 128 varint
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    """Function to return the value and the position after it"""
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+        if shift >= 64:
+            raise ValueError("varint is longer than 10 bytes")
+
+
+# Function to read the fields of one RequestMetric message
+def _read_protobuf_message(data: bytes, pos: int, end: int) -> tuple:
+    """Function to return the fields of request_metric.proto, skipping unknown ones"""
+    # proto3 leaves out fields at their default value
+    service_id = path = method = b""
+    status_code = latency_ms = occurred_at_us = 0
+
+    # Keys and lengths mostly fit one byte and are read inline, as are values
+    while pos < end:
+        key = data[pos]
+        pos += 1
+        if key >= 0x80:
+            key, pos = _read_varint(data, pos - 1)
+        wire_type = key & 0x07
+
+        if wire_type == 2:
+            length = data[pos]
+            pos += 1
+            if length >= 0x80:
+                length, pos = _read_varint(data, pos - 1)
+            value = data[pos : pos + length]
+            pos += length
+            if key == 0x0A:
+                service_id = value
+            elif key == 0x12:
+                path = value
+            elif key == 0x1A:
+                method = value
+        elif wire_type == 0:
+            value = 0
+            shift = 0
+            while True:
+                byte = data[pos]
+                pos += 1
+                value |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+                if shift >= 64:
+                    raise ValueError("varint is longer than 10 bytes")
+            if key == 0x20:
+                status_code = value
+            elif key == 0x28:
+                latency_ms = value
+            elif key == 0x30:
+                # int64 is sent as its 64 bit two's complement
+                occurred_at_us = value - (1 << 64) if value >= 1 << 63 else value
+        elif wire_type == 1:
+            pos += 8
+        elif wire_type == 5:
+            pos += 4
+        else:
+            raise ValueError(f"unsupported wire type {wire_type}")
+
+    if pos > end:
+        raise ValueError("field runs past the end of the message")
+
+    return service_id, path, method, status_code, latency_ms, occurred_at_us
+
+
+# Function to decode protobuf strings, None for invalid UTF-8
+def _decode_strings(values) -> list[str | None]:
+    try:
+        return [value.decode() for value in values]
+    except UnicodeDecodeError:
+        decoded = []
+        for value in values:
+            try:
+                decoded.append(value.decode())
+            except UnicodeDecodeError:
+                decoded.append(None)
+        return decoded
+
+
+# Function to turn protobuf microsecond timestamps into datetimes
+def _from_micros(values) -> list[datetime | None]:
+    try:
+        return [_EPOCH + timedelta(microseconds=value) for value in values]
+    except OverflowError:
+        return [
+            _EPOCH + timedelta(microseconds=value)
+            if -_MAX_MICROS <= value <= _MAX_MICROS
+            else None
+            for value in values
+        ]
+
+
+# Function to add decoded protobuf fields to the batch
+def _extend_protobuf_records(builder: MetricBatchBuilder, records: list) -> None:
+    if not records:
+        return
+    service_ids, paths, methods, status_codes, latencies_ms, occurred_at_us = zip(
+        *records
+    )
+    builder.extend(
+        builder.service_ids(service_ids),
+        _decode_strings(paths),
+        _decode_strings(methods),
+        list(status_codes),
+        list(latencies_ms),
+        _from_micros(occurred_at_us),
+    )
+
+
+# Function to decode the complete messages of a buffer into the batch
+def _decode_protobuf_messages(builder: MetricBatchBuilder, data: bytes) -> int:
+    """Function to return where the first incomplete message starts"""
+    records = []
+    size = len(data)
+    pos = 0
+    while pos < size:
+        try:
+            length, start = _read_varint(data, pos)
+        except IndexError:
+            break
+        except ValueError as exc:
+            builder.malformed(f"Invalid protobuf framing: {exc}")
+        if length > MAX_PROTOBUF_MESSAGE_BYTES:
+            builder.malformed(
+                "Invalid protobuf framing: message is larger than"
+                f" {MAX_PROTOBUF_MESSAGE_BYTES} bytes"
+            )
+        end = start + length
+        if end > size:
+            break
+
+        try:
+            records.append(_read_protobuf_message(data, start, end))
+        except (IndexError, ValueError) as exc:
+            # Add the records before it first, so the error gets its own index
+            _extend_protobuf_records(builder, records)
+            records = []
+            builder.reject(f"Invalid protobuf message: {exc}")
+        pos = end
+
+    _extend_protobuf_records(builder, records)
+    return pos
+
+
+# Function to decode a length-delimited protobuf body as it arrives
+async def decode_protobuf_stream(chunks: AsyncIterator[bytes]) -> MetricBatch:
+    """
+    Function to decode RequestMetric messages (app/schemas/services/
+    request_metric.proto), each prefixed by its varint length, into a
+    columnar batch.
+
+    Complete messages are decoded as soon as their chunk arrives and only
+    the tail of an unfinished message is kept between chunks.
+    """
+    builder = MetricBatchBuilder()
+    pending = b""
+
+    async for chunk in chunks:
+        data = pending + chunk if pending else chunk
+        pending = data[_decode_protobuf_messages(builder, data) :]
+
+    if pending:
+        builder.malformed(
+            "Invalid protobuf framing: body ends in the middle of a message"
+        )
+
+    return builder.finish()
+
+
+# Streaming decoders by media type
+STREAM_DECODERS = {
+    **{media_type: decode_msgpack_stream for media_type in MSGPACK_MEDIA_TYPES},
+    **{media_type: decode_protobuf_stream for media_type in PROTOBUF_MEDIA_TYPES},
+}
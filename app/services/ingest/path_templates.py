@@ -0,0 +1,147 @@
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from sqlalchemy import select
+
+from app.configs.session import AsyncSessionLocal
+from app.configs.settings import settings
+from app.models.services.route_template import ServiceRouteTemplate
+from app.types.auth import TypeUUID
+from app.types.ingest import MetricBatch
+from app.utils.metrics import metrics
+from app.utils.paths import (
+    OVERFLOW_PATH,
+    compile_route_templates,
+    normalize_segments,
+    path_segments,
+)
+
+
+# Class to map the raw paths of one service to a bounded set of templates
+class ServicePathTemplates:
+    """
+    Template the paths of one service with a cap on distinct templates.
+
+    A path takes the first user-defined route template it matches, otherwise
+    its identifier segments are collapsed by ``normalize_segments``. The
+    templates in use are tracked least recently used first; when the cap is
+    reached a new template replaces the oldest one only if that one has been
+    idle, and is counted under ``OVERFLOW_PATH`` otherwise. User templates
+    never overflow. Raw paths are cached with their template, so a repeated
+    path costs a few dict operations. State is per worker.
+    """
+
+    __slots__ = ("expires_at", "_templates", "_match", "_paths", "_seen")
+
+    def __init__(self, templates: Iterable[str] = (), expires_at: float = 0.0):
+        self.expires_at = expires_at
+        self._templates: frozenset[str] = frozenset()
+        self._match = compile_route_templates(())
+        self._paths: OrderedDict[str, str] = OrderedDict()
+        self._seen: OrderedDict[str, float] = OrderedDict()
+        self.set_templates(templates)
+
+    def set_templates(self, templates: Iterable[str]) -> None:
+        templates = frozenset(templates)
+        if templates != self._templates:
+            self._templates = templates
+            self._match = compile_route_templates(templates)
+            self._paths.clear()
+
+    def template(self, path: str, now: float) -> str:
+        template = self._paths.get(path)
+        if template is None:
+            segments = path_segments(path)
+            template = self._match("/".join(segments))
+            if template is None:
+                template = normalize_segments(segments)
+
+            # Bounded like the templates: forget the oldest raw path first
+            if len(self._paths) >= settings.INGEST_PATH_CACHE_SIZE:
+                self._paths.popitem(last=False)
+            self._paths[path] = template
+
+        if template in self._templates:
+            return template
+        return self._admit(template, now)
+
+    def _admit(self, template: str, now: float) -> str:
+        seen = self._seen
+        if template in seen:
+            seen.move_to_end(template)
+            seen[template] = now
+            return template
+
+        if len(seen) >= settings.INGEST_MAX_PATH_TEMPLATES:
+            oldest, last_seen = next(iter(seen.items()))
+            if now - last_seen < settings.INGEST_PATH_TEMPLATE_IDLE_SECONDS:
+                return OVERFLOW_PATH
+            del seen[oldest]
+
+        seen[template] = now
+        return template
+
+
+# Path templaters per service, refreshed once their route templates expire
+_service_templates: dict[TypeUUID, ServicePathTemplates] = {}
+
+
+# Function to resolve the path templaters of the services of a batch
+async def get_path_templates(
+    service_ids: Iterable[TypeUUID],
+) -> dict[TypeUUID, ServicePathTemplates]:
+    """Function to return a templater per service, reloading expired ones"""
+    now = time.monotonic()
+    templaters = {}
+    stale = set()
+
+    for service_id in set(service_ids):
+        templater = _service_templates.get(service_id)
+        if templater is None:
+            templater = _service_templates[service_id] = ServicePathTemplates()
+        if templater.expires_at <= now:
+            stale.add(service_id)
+        templaters[service_id] = templater
+
+    if stale:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(
+                    ServiceRouteTemplate.service_id, ServiceRouteTemplate.template
+                ).where(ServiceRouteTemplate.service_id.in_(stale))
+            )
+
+        loaded: dict[TypeUUID, list[str]] = {service_id: [] for service_id in stale}
+        for service_id, template in result.all():
+            loaded[service_id].append(template)
+
+        expires_at = now + settings.INGEST_ROUTE_TEMPLATE_CACHE_SECONDS
+        for service_id, templates in loaded.items():
+            templaters[service_id].set_templates(templates)
+            templaters[service_id].expires_at = expires_at
+
+    return templaters
+
+
+# Function to make a service reload its route templates on its next batch
+def forget_path_templates(service_id: TypeUUID) -> None:
+    templater = _service_templates.get(service_id)
+    if templater is not None:
+        templater.expires_at = 0.0
+
+
+# Function to replace the raw paths of a batch with their templates
+async def template_batch_paths(batch: MetricBatch) -> None:
+    """Function to template every path of a batch in place"""
+    templaters = await get_path_templates(batch.service_ids)
+    now = time.monotonic()
+
+    batch.paths = [
+        templaters[service_id].template(path, now)
+        for service_id, path in zip(batch.service_ids, batch.paths)
+    ]
+
+    overflowed = batch.paths.count(OVERFLOW_PATH)
+    if overflowed:
+        metrics.increment("ingest.paths_overflowed", overflowed)
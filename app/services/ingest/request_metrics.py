@@ -0,0 +1,373 @@
+import time
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta, timezone
+from itertools import repeat
+
+import numpy as np
+from fastapi import HTTPException, Request, status
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.configs.settings import settings
+from app.models.services.services import Service
+from app.schemas.services.request_metric import RequestMetricBatchAdapter
+from app.services.company.retention import get_retention_tiers
+from app.types.auth import TypeUUID
+from app.types.ingest import MetricBatch
+from app.utils.bulk import copy_record_sets
+from app.utils.compression import DECOMPRESSORS, DecompressionError
+from app.utils.generators import get_current_datetime, get_uuid_batch
+from app.utils.metrics import metrics
+from app.utils.sketch import group_sketches
+
+REQUEST_METRIC_COLUMNS = (
+    "metric_id",
+    "service_id",
+    "path",
+    "method",
+    "status_code",
+    "latency_ms",
+    "occurred_at",
+    "retention_days",
+    "created_at",
+    "updated_at",
+)
+
+REQUEST_METRIC_PARTIAL_COLUMNS = (
+    "service_id",
+    "path",
+    "method",
+    "status_class",
+    "bucket_start",
+    "request_count",
+    "error_count",
+    "latency_sum_ms",
+    "latency_min_ms",
+    "latency_max_ms",
+    "latency_sketch",
+    "created_at",
+)
+
+NDJSON_MEDIA_TYPES = {
+    "application/x-ndjson",
+    "application/ndjson",
+    "application/jsonl",
+    "application/x-jsonlines",
+}
+
+# Content-Encoding values the ingestion endpoints decode
+SUPPORTED_ENCODINGS = ("gzip", "zstd", "identity")
+
+# Validation errors reported back per rejected batch
+MAX_REPORTED_ERRORS = 20
+
+# Services confirmed recently, so steady ingestion does not query per batch
+_known_services: dict[TypeUUID, float] = {}
+
+
+# Function to stream a request body without receiving more than the limit
+async def stream_limited_body(request: Request, max_bytes: int) -> AsyncIterator[bytes]:
+    """Function to yield the raw body chunks, stopping as soon as it is too large"""
+    too_large = HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"Request body is larger than {max_bytes} bytes",
+    )
+
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > max_bytes:
+        raise too_large
+
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_bytes:
+            raise too_large
+        if chunk:
+            yield chunk
+
+
+# Function to stream a request body decoded per its Content-Encoding
+async def stream_request_body(request: Request) -> AsyncIterator[bytes]:
+    """
+    Function to yield the body as plain bytes, decompressing gzip or zstd
+    bodies chunk by chunk as they arrive.
+
+    The compressed size is held to INGEST_MAX_BODY_BYTES and the decompressed
+    size to INGEST_MAX_DECOMPRESSED_BYTES; output is produced in bounded
+    pieces, so a decompression bomb is refused after inflating at most the
+    limit instead of exhausting memory.
+    """
+    chunks = stream_limited_body(request, settings.INGEST_MAX_BODY_BYTES)
+
+    encoding = request.headers.get("content-encoding", "identity").strip().lower()
+    if encoding == "identity":
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    decompressor_class = DECOMPRESSORS.get(encoding)
+    if decompressor_class is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported Content-Encoding {encoding!r}",
+            headers={"Accept-Encoding": ", ".join(SUPPORTED_ENCODINGS)},
+        )
+
+    decompressor = decompressor_class()
+    max_bytes = settings.INGEST_MAX_DECOMPRESSED_BYTES
+    produced = 0
+    try:
+        async for chunk in chunks:
+            for piece in decompressor.decompress(chunk):
+                produced += len(piece)
+                if produced > max_bytes:
+                    metrics.increment("ingest.decompression_rejected")
+                    raise HTTPException(
+                        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                        detail=f"Decompressed body is larger than {max_bytes} bytes",
+                    )
+                yield piece
+    except DecompressionError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    if not decompressor.eof:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Request body ends in the middle of the {encoding} stream",
+        )
+
+
+# Function to read a whole request body, decoded per its Content-Encoding
+async def read_request_body(request: Request) -> bytes:
+    return b"".join([chunk async for chunk in stream_request_body(request)])
+
+
+# Function to read the media type out of a Content-Type header
+def get_media_type(content_type: str) -> str:
+    return content_type.split(";")[0].strip().lower()
+
+
+# Function to reject a batch that is too large
+def check_batch_rows(rows: int) -> None:
+    if rows > settings.INGEST_MAX_BATCH_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"Batches are limited to {settings.INGEST_MAX_BATCH_ROWS} records",
+        )
+
+
+# Function to reject a batch with rows outside the accepted event time window
+def check_batch_window(batch: MetricBatch) -> None:
+    """Function to raise a 422 naming the records whose occurred_at is out of range"""
+    # Rows outside the window would have no partition to land in
+    now = get_current_datetime()
+    earliest = now - timedelta(seconds=settings.INGEST_MAX_LATENESS_SECONDS)
+    latest = now + timedelta(seconds=settings.INGEST_MAX_FUTURE_SKEW_SECONDS)
+    out_of_window = [
+        index
+        for index, occurred_at in enumerate(batch.occurred_at)
+        if not earliest <= occurred_at <= latest
+    ]
+    if out_of_window:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail={
+                "message": "Invalid request metric batch",
+                "error_count": len(out_of_window),
+                "errors": [
+                    {
+                        "loc": [index, "occurred_at"],
+                        "msg": f"occurred_at must be between {earliest.isoformat()}"
+                        f" and {latest.isoformat()}",
+                    }
+                    for index in out_of_window[:MAX_REPORTED_ERRORS]
+                ],
+            },
+        )
+
+
+# Function to decode and validate a whole batch of request metrics
+def parse_request_metrics(body: bytes, content_type: str) -> MetricBatch:
+    """
+    Function to turn a JSON array or NDJSON body into a columnar batch.
+
+    NDJSON lines are joined into one JSON array so the whole batch is parsed
+    and validated in a single pass; the batch is accepted or rejected as a
+    whole and the first errors are reported with their record index.
+    """
+    if get_media_type(content_type) in NDJSON_MEDIA_TYPES:
+        lines = [line for line in body.splitlines() if line.strip()]
+        body = b"[" + b",".join(lines) + b"]"
+
+    try:
+        records = RequestMetricBatchAdapter.validate_json(body)
+    except ValidationError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail={
+                "message": "Invalid request metric batch",
+                "error_count": exc.error_count(),
+                "errors": [
+                    {"loc": error["loc"], "msg": error["msg"]}
+                    for error in exc.errors(include_url=False)[:MAX_REPORTED_ERRORS]
+                ],
+            },
+        )
+
+    check_batch_rows(len(records))
+
+    batch = MetricBatch(
+        service_ids=[record["service_id"] for record in records],
+        paths=[record["path"] for record in records],
+        methods=[record["method"].upper() for record in records],
+        status_codes=[record["status_code"] for record in records],
+        latencies_ms=[record["latency_ms"] for record in records],
+        occurred_at=[record["occurred_at"] for record in records],
+    )
+    check_batch_window(batch)
+    return batch
+
+
+# Function to keep a service ingestion key to its own service's metrics
+def check_batch_owner(batch: MetricBatch, service_id: TypeUUID | None) -> None:
+    if service_id is None:
+        return
+    foreign = set(batch.service_ids) - {service_id}
+    if foreign:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "message": "The ingestion key only accepts metrics of its service",
+                "service_ids": sorted(str(service_id) for service_id in foreign),
+            },
+        )
+
+
+# Function to reject batches that reference unknown services
+async def ensure_services_exist(db: AsyncSession, service_ids: set[TypeUUID]) -> None:
+    """Function to check the services of a batch, querying only unconfirmed ones"""
+    now = time.monotonic()
+    pending = {
+        service_id
+        for service_id in service_ids
+        if _known_services.get(service_id, 0) < now
+    }
+    if not pending:
+        return
+
+    result = await db.execute(
+        select(Service.service_id).where(Service.service_id.in_(pending))
+    )
+    found = set(result.scalars().all())
+
+    expires_at = now + settings.INGEST_SERVICE_CACHE_SECONDS
+    for service_id in found:
+        _known_services[service_id] = expires_at
+
+    unknown = pending - found
+
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail={
+                "message": "Unknown service ids in batch",
+                "service_ids": sorted(str(service_id) for service_id in unknown),
+            },
+        )
+
+
+# Function to pre-aggregate a batch per minute for the rollups
+def build_metric_partials(batch: MetricBatch, created_at: datetime) -> list[tuple]:
+    """
+    Function to group a batch by service, path, method, status class and
+    minute, with counts, latency totals and a latency sketch per group.
+
+    The rollup job merges these instead of re-reading the raw rows.
+    """
+    keys: dict[tuple, int] = {}
+    groups = [
+        keys.setdefault(
+            (
+                service_id,
+                path,
+                method,
+                status_code // 100,
+                int(occurred_at.timestamp()) // 60,
+            ),
+            len(keys),
+        )
+        for service_id, path, method, status_code, occurred_at in zip(
+            batch.service_ids,
+            batch.paths,
+            batch.methods,
+            batch.status_codes,
+            batch.occurred_at,
+        )
+    ]
+
+    size = len(keys)
+    group_ids = np.asarray(groups, dtype=np.int64)
+    latencies = np.asarray(batch.latencies_ms, dtype=np.int64)
+
+    counts = np.bincount(group_ids, minlength=size).tolist()
+    sums = np.bincount(group_ids, weights=latencies, minlength=size).tolist()
+    minimums = np.full(size, np.iinfo(np.int64).max)
+    np.minimum.at(minimums, group_ids, latencies)
+    maximums = np.full(size, np.iinfo(np.int64).min)
+    np.maximum.at(maximums, group_ids, latencies)
+    sketches = group_sketches(group_ids, latencies, size)
+
+    return [
+        (
+            service_id,
+            path,
+            method,
+            status_class,
+            datetime.fromtimestamp(minute * 60, timezone.utc),
+            counts[group],
+            counts[group] if status_class >= 5 else 0,
+            int(sums[group]),
+            minimum,
+            maximum,
+            sketches[group].to_bytes(),
+            created_at,
+        )
+        for (
+            (service_id, path, method, status_class, minute),
+            group,
+        ), minimum, maximum in zip(keys.items(), minimums.tolist(), maximums.tolist())
+    ]
+
+
+# Function to write a batch of request metrics with COPY
+async def write_request_metrics(batch: MetricBatch) -> None:
+    """Function to COPY a validated batch and its partials in one transaction"""
+    now = get_current_datetime()
+    tiers = await get_retention_tiers(batch.service_ids)
+
+    await copy_record_sets(
+        (
+            (
+                "request_metrics",
+                REQUEST_METRIC_COLUMNS,
+                zip(
+                    get_uuid_batch(len(batch)),
+                    batch.service_ids,
+                    batch.paths,
+                    batch.methods,
+                    batch.status_codes,
+                    batch.latencies_ms,
+                    batch.occurred_at,
+                    map(tiers.__getitem__, batch.service_ids),
+                    repeat(now),
+                    repeat(now),
+                ),
+            ),
+            (
+                "request_metric_partials",
+                REQUEST_METRIC_PARTIAL_COLUMNS,
+                build_metric_partials(batch, now),
+            ),
+        )
+    )
@@ -0,0 +1,203 @@
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.configs.settings import settings
+from app.models.services.health_check import ServiceHealthCheck
+from app.models.services.health_counter import ServiceHealthCounter
+from app.models.services.health_transition import ServiceHealthTransition
+from app.models.services.ping_pong import ServicePingLog
+from app.models.services.services import Service
+from app.types.auth import TypeUUID
+from app.types.health_check import HealthCheckSpec, HealthState
+
+
+# Function to load every active health check together with its service url
+async def get_active_health_checks(db: AsyncSession) -> list[HealthCheckSpec]:
+    """Function to load the active health checks as scheduler specs"""
+    result = await db.execute(
+        select(
+            ServiceHealthCheck.health_check_id,
+            ServiceHealthCheck.service_id,
+            Service.base_url,
+            ServiceHealthCheck.path,
+            ServiceHealthCheck.method,
+            ServiceHealthCheck.expected_status,
+            ServiceHealthCheck.timeout_ms,
+            ServiceHealthCheck.interval_seconds,
+            ServiceHealthCheck.adaptive_interval,
+            ServiceHealthCheck.min_interval_seconds,
+            ServiceHealthCheck.max_interval_seconds,
+        )
+        .join(Service, Service.service_id == ServiceHealthCheck.service_id)
+        .where(ServiceHealthCheck.is_active.is_(True), Service.is_active.is_(True))
+    )
+
+    checks = []
+    for row in result.all():
+        interval = max(row.interval_seconds, 1)
+        url = row.base_url.rstrip("/") + "/" + row.path.lstrip("/")
+
+        checks.append(
+            HealthCheckSpec(
+                health_check_id=row.health_check_id,
+                service_id=row.service_id,
+                url=url,
+                host=urlsplit(url).netloc,
+                method=row.method.upper(),
+                expected_status=row.expected_status,
+                timeout_ms=row.timeout_ms,
+                interval_seconds=interval,
+                adaptive=row.adaptive_interval,
+                min_interval_seconds=min(
+                    row.min_interval_seconds
+                    or settings.HEALTH_CHECK_ADAPTIVE_MIN_SECONDS,
+                    interval,
+                ),
+                max_interval_seconds=max(
+                    row.max_interval_seconds
+                    or settings.HEALTH_CHECK_ADAPTIVE_MAX_SECONDS,
+                    interval,
+                ),
+            )
+        )
+
+    return checks
+
+
+# Phases reported by the latency breakdown, in request order
+LATENCY_PHASES = {
+    "dns_ms": ServicePingLog.dns_ms,
+    "connect_ms": ServicePingLog.connect_ms,
+    "tls_ms": ServicePingLog.tls_ms,
+    "ttfb_ms": ServicePingLog.ttfb_ms,
+    "total_ms": ServicePingLog.response_time_ms,
+}
+
+
+# Function to aggregate the probe phase timings of a service
+async def get_latency_breakdown(
+    db: AsyncSession, service_id: TypeUUID, since: datetime
+) -> dict:
+    """
+    Function to return p50/p95 per probe phase for a service since a time.
+
+    Percentiles of the connection phases only cover probes that opened a new
+    connection, and all phases only cover the sampled raw ping rows;
+    ``samples`` says how many pings each phase is based on.
+    """
+    quantiles = array([0.5, 0.95])
+    columns = []
+    for name, column in LATENCY_PHASES.items():
+        columns.append(func.count(column).label(f"{name}_samples"))
+        columns.append(func.percentile_cont(quantiles).within_group(column).label(name))
+
+    result = await db.execute(
+        select(*columns).where(
+            ServicePingLog.service_id == service_id,
+            ServicePingLog.checked_at >= since,
+        )
+    )
+    row = result.one()._mapping
+
+    phases = {}
+    for name in LATENCY_PHASES:
+        p50, p95 = row[name] or (None, None)
+        phases[name] = {"samples": row[f"{name}_samples"], "p50": p50, "p95": p95}
+
+    return phases
+
+
+# Function to summarise uptime and latency of a service from the compact history
+async def get_uptime_summary(
+    db: AsyncSession, service_id: TypeUUID, since: datetime
+) -> dict:
+    """
+    Function to return uptime, latency and state changes of a service.
+
+    Reads the per-bucket counters and the state transitions only, so it works
+    whether or not raw ping rows are kept. Degraded probes count as up.
+    """
+    counters = (
+        await db.execute(
+            select(
+                func.coalesce(func.sum(ServiceHealthCounter.up_count), 0).label("up"),
+                func.coalesce(func.sum(ServiceHealthCounter.degraded_count), 0).label(
+                    "degraded"
+                ),
+                func.coalesce(func.sum(ServiceHealthCounter.down_count), 0).label(
+                    "down"
+                ),
+                func.coalesce(func.sum(ServiceHealthCounter.latency_count), 0).label(
+                    "latency_count"
+                ),
+                func.coalesce(func.sum(ServiceHealthCounter.latency_sum_ms), 0).label(
+                    "latency_sum"
+                ),
+                func.max(ServiceHealthCounter.latency_max_ms).label("latency_max"),
+            ).where(
+                ServiceHealthCounter.service_id == service_id,
+                ServiceHealthCounter.bucket_start >= since,
+            )
+        )
+    ).one()
+
+    transitions = (
+        await db.execute(
+            select(ServiceHealthTransition)
+            .where(
+                ServiceHealthTransition.service_id == service_id,
+                ServiceHealthTransition.changed_at >= since,
+            )
+            .order_by(ServiceHealthTransition.changed_at)
+        )
+    ).scalars()
+
+    # Latest state of every check of the service, whenever it changed
+    current = (
+        await db.execute(
+            select(ServiceHealthTransition.state)
+            .where(ServiceHealthTransition.service_id == service_id)
+            .distinct(ServiceHealthTransition.health_check_id)
+            .order_by(
+                ServiceHealthTransition.health_check_id,
+                ServiceHealthTransition.changed_at.desc(),
+            )
+        )
+    ).scalars()
+    states = set(current)
+
+    # A service is only as healthy as its worst check
+    state = None
+    for candidate in (HealthState.DOWN, HealthState.DEGRADED, HealthState.UP):
+        if candidate.value in states:
+            state = candidate.value
+            break
+
+    probes = counters.up + counters.degraded + counters.down
+
+    return {
+        "state": state,
+        "probes": probes,
+        "uptime_ratio": (counters.up + counters.degraded) / probes if probes else None,
+        "degraded_ratio": counters.degraded / probes if probes else None,
+        "avg_latency_ms": (
+            counters.latency_sum / counters.latency_count
+            if counters.latency_count
+            else None
+        ),
+        "max_latency_ms": counters.latency_max,
+        "transitions": [
+            {
+                "health_check_id": str(transition.health_check_id),
+                "state": transition.state,
+                "previous_state": transition.previous_state,
+                "status_code": transition.status_code,
+                "changed_at": transition.changed_at,
+            }
+            for transition in transitions
+        ],
+    }
@@ -0,0 +1,77 @@
+from fastapi import status
+from fastapi.exceptions import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.services.ingest_key import ServiceIngestKey
+from app.models.services.services import Service
+from app.schemas.services.ingest_key import (
+    IngestKeyCreateRequest,
+    IngestKeyRevokeRequest,
+)
+from app.tasks.ingest.ingest_keys import ingest_keys
+from app.types.auth import TypeUUID
+from app.utils.auth import generate_ingest_key, ingest_key_fingerprint
+from app.utils.generators import get_current_datetime
+
+# Characters of a key kept in clear to tell keys apart, "imk_" included
+KEY_PREFIX_LENGTH = 12
+
+
+# Service to create an ingestion key for a service
+async def create_ingest_key(
+    db: AsyncSession, payload: IngestKeyCreateRequest
+) -> tuple[ServiceIngestKey, str]:
+    """Service to store a new key hashed and return it with the plain key"""
+    service = await db.get(Service, payload.service_id)
+    if not service:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Service not found"
+        )
+
+    key = generate_ingest_key()
+    ingest_key = ServiceIngestKey(
+        service_id=payload.service_id,
+        name=payload.name,
+        key_hash=ingest_key_fingerprint(key),
+        key_prefix=key[:KEY_PREFIX_LENGTH],
+    )
+    db.add(ingest_key)
+    await db.commit()
+    await db.refresh(ingest_key)
+
+    return ingest_key, key
+
+
+# Function to get the ingestion keys of a service
+async def get_ingest_keys(db: AsyncSession, service_id: TypeUUID):
+    result = await db.execute(
+        select(ServiceIngestKey)
+        .where(ServiceIngestKey.service_id == service_id)
+        .order_by(ServiceIngestKey.created_at)
+    )
+    return result.scalars().all()
+
+
+# Service to revoke an ingestion key
+async def revoke_ingest_key(db: AsyncSession, payload: IngestKeyRevokeRequest):
+    result = await db.execute(
+        select(ServiceIngestKey).where(
+            ServiceIngestKey.key_id == payload.key_id,
+            ServiceIngestKey.service_id == payload.service_id,
+        )
+    )
+    ingest_key = result.scalar_one_or_none()
+
+    if not ingest_key:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Ingestion key not found"
+        )
+
+    if ingest_key.revoked_at is None:
+        ingest_key.revoked_at = get_current_datetime()
+        await db.commit()
+
+    # Other workers evict it on their next revocation poll
+    ingest_keys.forget(ingest_key.key_hash)
+    return {"detail": "Ingestion key revoked successfully"}
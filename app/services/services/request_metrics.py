@@ -0,0 +1,234 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import BigInteger, cast, func, literal, select
+from sqlalchemy.dialects.postgresql import array_agg
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.configs.settings import settings
+from app.models.services.request_metric_rollup import (
+    RequestMetricRollup1d,
+    RequestMetricRollup1h,
+    RequestMetricRollup1m,
+)
+from app.models.services.rollup_watermark import RollupWatermark
+from app.tasks.rollups.request_metrics import WATERMARK_NAME
+from app.types.auth import TypeUUID
+from app.utils.downsample import lttb, min_max
+from app.utils.sketch import group_quantiles, merge_sketches
+
+# Rollup resolutions, coarsest first
+ROLLUPS = (
+    (86400, RequestMetricRollup1d),
+    (3600, RequestMetricRollup1h),
+    (60, RequestMetricRollup1m),
+)
+
+SERIES_QUANTILES = {"p50": 0.5, "p90": 0.9, "p95": 0.95, "p99": 0.99}
+
+DOWNSAMPLERS = {"lttb": lttb, "minmax": min_max}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+# Function to choose the rollup table a series is read from
+def pick_rollup(start: datetime, end: datetime, step_seconds: int):
+    """
+    Function to return the coarsest rollup whose buckets tile the request.
+
+    A resolution fits when the step is a multiple of it and both ends of the
+    range fall on its bucket boundaries, so no bucket is counted partially.
+    """
+    for seconds, model in ROLLUPS:
+        if (
+            step_seconds % seconds == 0
+            and int(start.timestamp()) % seconds == 0
+            and int(end.timestamp()) % seconds == 0
+        ):
+            return seconds, model
+    return ROLLUPS[-1]
+
+
+# Function to read a request metric time series from the rollups
+async def get_request_metric_series(
+    db: AsyncSession,
+    service_id: TypeUUID,
+    start: datetime,
+    end: datetime,
+    step_seconds: int,
+    path: str | None = None,
+    method: str | None = None,
+) -> dict:
+    """
+    Function to return count, error rate and latency per step for a service.
+
+    Steps are aligned to the epoch, so the same request always gets the same
+    buckets; steps without traffic are left out. Data younger than the
+    rollup watermark is not included yet.
+    """
+    resolution, model = pick_rollup(start, end, step_seconds)
+
+    step = func.date_bin(
+        literal(timedelta(seconds=step_seconds)), model.bucket_start, _EPOCH
+    ).label("bucket_start")
+
+    # sum() of bigint is numeric in PostgreSQL; cast back to get ints
+    def total(column):
+        return cast(func.sum(column), BigInteger)
+
+    query = (
+        select(
+            step,
+            total(model.request_count).label("count"),
+            total(model.error_count).label("errors"),
+            total(model.latency_sum_ms).label("latency_sum"),
+            func.min(model.latency_min_ms).label("latency_min"),
+            func.max(model.latency_max_ms).label("latency_max"),
+            array_agg(model.latency_sketch).label("sketches"),
+        )
+        .where(
+            model.service_id == service_id,
+            model.bucket_start >= start,
+            model.bucket_start < end,
+        )
+        .group_by(step)
+        .order_by(step)
+    )
+    if path is not None:
+        query = query.where(model.path == path)
+    if method is not None:
+        query = query.where(model.method == method.upper())
+
+    points = []
+    for row in (await db.execute(query)).all():
+        point = {
+            "bucket_start": row.bucket_start,
+            "count": row.count,
+            "error_count": row.errors,
+            "error_rate": row.errors / row.count,
+            "avg_latency_ms": row.latency_sum / row.count,
+            "min_latency_ms": row.latency_min,
+            "max_latency_ms": row.latency_max,
+        }
+        # Merged sketches give every step the same 1% relative accuracy
+        sketch = merge_sketches(row.sketches)
+        for name, q in SERIES_QUANTILES.items():
+            value = sketch.quantile(q)
+            point[f"{name}_latency_ms"] = min(
+                max(value, row.latency_min), row.latency_max
+            )
+        points.append(point)
+
+    return {
+        "resolution_seconds": resolution,
+        "complete_until": await get_rollup_watermark(db),
+        "points": points,
+    }
+
+
+# Function to read up to when the rollups are complete
+async def get_rollup_watermark(db: AsyncSession) -> datetime | None:
+    return await db.scalar(
+        select(RollupWatermark.watermark).where(RollupWatermark.name == WATERMARK_NAME)
+    )
+
+
+# Function to choose the rollup a downsampled series is read from
+def pick_source_rollup(start: datetime, end: datetime, max_buckets: int):
+    """Function to return the finest rollup with at most ``max_buckets`` buckets"""
+    for seconds, model in reversed(ROLLUPS):
+        if (end - start).total_seconds() / seconds <= max_buckets:
+            return seconds, model
+    return ROLLUPS[0]
+
+
+# Function to read a latency and error rate series reduced to a point budget
+async def get_downsampled_series(
+    db: AsyncSession,
+    service_id: TypeUUID,
+    start: datetime,
+    end: datetime,
+    max_points: int,
+    agg: str,
+    downsample: str = "lttb",
+    path: str | None = None,
+    method: str | None = None,
+) -> dict:
+    """
+    Function to return at most ``max_points`` latency and error rate points.
+
+    The series is read at the finest rollup that keeps the range within
+    ROLLUP_DOWNSAMPLE_SOURCE_POINTS buckets, then each series is reduced on
+    its own with LTTB or per-bucket min/max, so the work and the payload are
+    bounded whatever the range. ``agg`` is the latency per bucket: avg, max
+    or a quantile from the merged sketches.
+    """
+    resolution, model = pick_source_rollup(
+        start, end, settings.ROLLUP_DOWNSAMPLE_SOURCE_POINTS
+    )
+    start = _EPOCH + timedelta(
+        seconds=int((start - _EPOCH).total_seconds()) // resolution * resolution
+    )
+
+    def total(column):
+        return cast(func.sum(column), BigInteger)
+
+    columns = [
+        model.bucket_start,
+        total(model.request_count).label("count"),
+        total(model.error_count).label("errors"),
+        total(model.latency_sum_ms).label("latency_sum"),
+        func.max(model.latency_max_ms).label("latency_max"),
+    ]
+    if agg in SERIES_QUANTILES:
+        columns.append(array_agg(model.latency_sketch).label("sketches"))
+
+    query = (
+        select(*columns)
+        .where(
+            model.service_id == service_id,
+            model.bucket_start >= start,
+            model.bucket_start < end,
+        )
+        .group_by(model.bucket_start)
+        .order_by(model.bucket_start)
+    )
+    if path is not None:
+        query = query.where(model.path == path)
+    if method is not None:
+        query = query.where(model.method == method.upper())
+
+    rows = (await db.execute(query)).all()
+
+    timestamps = [row.bucket_start for row in rows]
+    x = np.array([moment.timestamp() for moment in timestamps])
+    counts = np.array([row.count for row in rows], dtype=np.float64)
+    error_rate = np.array([row.errors for row in rows], dtype=np.float64) / counts
+
+    if agg == "avg":
+        latency = np.array([row.latency_sum for row in rows], dtype=np.float64) / counts
+    elif agg == "max":
+        latency = np.array([row.latency_max for row in rows], dtype=np.float64)
+    else:
+        groups = [index for index, row in enumerate(rows) for _ in row.sketches]
+        payloads = [payload for row in rows for payload in row.sketches]
+        latency = group_quantiles(groups, payloads, len(rows), [SERIES_QUANTILES[agg]])[
+            :, 0
+        ]
+
+    reduce = DOWNSAMPLERS[downsample]
+
+    def series(values: np.ndarray) -> dict:
+        kept = reduce(x, values, max_points).tolist()
+        return {
+            "timestamps": [timestamps[index] for index in kept],
+            "values": values[kept].tolist(),
+        }
+
+    return {
+        "resolution_seconds": resolution,
+        "source_points": len(rows),
+        "complete_until": await get_rollup_watermark(db),
+        "latency_ms": series(latency),
+        "error_rate": series(error_rate),
+    }
@@ -0,0 +1,86 @@
+from fastapi import status
+from fastapi.exceptions import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.configs.settings import settings
+from app.models.services.route_template import ServiceRouteTemplate
+from app.models.services.services import Service
+from app.schemas.services.route_template import (
+    RouteTemplateCreateRequest,
+    RouteTemplateDeleteRequest,
+)
+from app.services.ingest.path_templates import forget_path_templates
+from app.types.auth import TypeUUID
+
+
+# Service to add a route template to a service
+async def add_route_template(db: AsyncSession, payload: RouteTemplateCreateRequest):
+    service = await db.get(Service, payload.service_id)
+    if not service:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Service not found"
+        )
+
+    # User templates bypass the per-worker template cap, so bound them here
+    count = await db.scalar(
+        select(func.count()).where(
+            ServiceRouteTemplate.service_id == payload.service_id
+        )
+    )
+    if count >= settings.INGEST_MAX_PATH_TEMPLATES:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Services are limited to {settings.INGEST_MAX_PATH_TEMPLATES}"
+            " route templates",
+        )
+
+    route_template = ServiceRouteTemplate(
+        service_id=payload.service_id, template=payload.template
+    )
+    db.add(route_template)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Route template already exists",
+        )
+    await db.refresh(route_template)
+
+    forget_path_templates(payload.service_id)
+    return route_template
+
+
+# Function to get the route templates of a service
+async def get_route_templates(db: AsyncSession, service_id: TypeUUID):
+    result = await db.execute(
+        select(ServiceRouteTemplate)
+        .where(ServiceRouteTemplate.service_id == service_id)
+        .order_by(ServiceRouteTemplate.template)
+    )
+    return result.scalars().all()
+
+
+# Service to remove a route template from a service
+async def delete_route_template(db: AsyncSession, payload: RouteTemplateDeleteRequest):
+    result = await db.execute(
+        select(ServiceRouteTemplate).where(
+            ServiceRouteTemplate.template_id == payload.template_id,
+            ServiceRouteTemplate.service_id == payload.service_id,
+        )
+    )
+    route_template = result.scalar_one_or_none()
+
+    if not route_template:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Route template not found"
+        )
+
+    await db.delete(route_template)
+    await db.commit()
+
+    forget_path_templates(payload.service_id)
+    return {"detail": "Route template deleted successfully"}
@@ -0,0 +1,80 @@
+from app.configs.settings import settings
+from app.types.health_check import HealthCheckSpec, ProbeResult
+
+
+# Class to track the recent outcome of a single check
+class CheckState:
+    __slots__ = ("interval", "is_up", "streak")
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.is_up: bool | None = None
+        self.streak = 0
+
+
+# Function to work out the interval to use after a probe result
+def next_interval(
+    check: HealthCheckSpec, state: CheckState, result: ProbeResult
+) -> float:
+    """
+    Update the check state with a result and return the interval to use next.
+
+    Non-adaptive checks always use their configured interval. Adaptive checks
+    drop to ``min_interval_seconds`` right after a state change so that the
+    change is confirmed quickly, then double the interval on every probe that
+    agrees: up to ``max_interval_seconds`` while the target stays down, and
+    back to the configured interval once it is healthy again.
+    """
+    if result.is_success == state.is_up:
+        state.streak += 1
+    else:
+        state.is_up = result.is_success
+        state.streak = 0
+
+    if not check.adaptive:
+        state.interval = check.interval_seconds
+    elif state.streak == 0:
+        state.interval = check.min_interval_seconds
+    else:
+        ceiling = check.interval_seconds if state.is_up else check.max_interval_seconds
+        state.interval = min(state.interval * 2, ceiling)
+
+    return state.interval
+
+
+# Class to cap the in-flight probes to hosts that are timing out
+class HostGuard:
+    """
+    Limit concurrent probes to hosts whose last probe timed out.
+
+    A host that has stopped answering would otherwise tie up one probe slot
+    per check for the full ``timeout_ms``. Healthy hosts are not limited.
+    """
+
+    def __init__(self, max_suspect_inflight: int | None = None):
+        self._limit = (
+            max_suspect_inflight or settings.HEALTH_CHECK_MAX_SUSPECT_PROBES_PER_HOST
+        )
+        self._suspect: set[str] = set()
+        self._inflight: dict[str, int] = {}
+
+    def acquire(self, host: str) -> bool:
+        """Reserve a probe slot for the host, or return False to skip the run"""
+        inflight = self._inflight.get(host, 0)
+        if host in self._suspect and inflight >= self._limit:
+            return False
+
+        self._inflight[host] = inflight + 1
+        return True
+
+    def release(self, host: str, timed_out: bool) -> None:
+        inflight = self._inflight[host] - 1
+        if inflight:
+            self._inflight[host] = inflight
+        else:
+            del self._inflight[host]
+
+        if timed_out:
+            self._suspect.add(host)
+        else:
+            self._suspect.discard(host)
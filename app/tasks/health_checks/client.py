@@ -0,0 +1,170 @@
+import time
+
+import httpcore
+import httpx
+
+from app.configs.settings import settings
+from app.tasks.health_checks.dns import (
+    CachingNetworkBackend,
+    DnsCache,
+    resolve_duration,
+)
+from app.types.health_check import ProbeTimings
+
+Origin = tuple[bytes, bytes, int]
+
+# Small-int columns hold the timings, so clamp anything longer
+_MAX_PHASE_MS = 32767
+
+
+def _ms(seconds: float) -> int:
+    return min(max(int(seconds * 1000), 0), _MAX_PHASE_MS)
+
+
+# Class to turn httpcore trace events into per-phase probe timings
+class _PhaseTrace:
+    __slots__ = ("_timings", "_started")
+
+    def __init__(self, timings: ProbeTimings):
+        self._timings = timings
+        self._started: dict[str, float] = {}
+
+    async def __call__(self, event: str, info: dict) -> None:
+        now = time.perf_counter()
+        step, _, edge = event.rpartition(".")
+
+        if edge == "started":
+            self._started[step] = now
+            return
+        if edge != "complete" or step not in self._started:
+            return
+
+        elapsed = now - self._started[step]
+        if step == "connection.connect_tcp":
+            # The DNS cache runs inside connect_tcp and reports its share
+            resolving = min(resolve_duration.get(), elapsed)
+            self._timings.dns_ms = _ms(resolving)
+            self._timings.connect_ms = _ms(elapsed - resolving)
+        elif step == "connection.start_tls":
+            self._timings.tls_ms = _ms(elapsed)
+        elif step.endswith(".receive_response_headers"):
+            protocol = step.partition(".")[0]
+            sent = self._started.get(f"{protocol}.send_request_headers")
+            if sent is not None:
+                self._timings.ttfb_ms = _ms(now - sent)
+
+
+# Class to hold one keep-alive connection pool per probed origin
+class ProbeConnectionPool:
+    """
+    Keep-alive connection pools for the prober, one per (scheme, host, port).
+
+    A separate pool per origin gives every host its own connection cap, so a
+    slow target can never starve probes to the others. Connections are reused
+    across probes; HTTP/2 is negotiated through ALPN where the target offers
+    it. Host names are resolved through one shared ``DnsCache`` rather than
+    the blocking system resolver. Pools for origins that have not been probed
+    recently are closed by ``evict_idle``.
+    """
+
+    def __init__(
+        self,
+        max_connections_per_host: int | None = None,
+        keepalive_expiry_seconds: float | None = None,
+        idle_pool_seconds: float | None = None,
+        http2: bool | None = None,
+        dns_cache: DnsCache | None = None,
+    ):
+        self._max_connections = (
+            max_connections_per_host
+            or settings.HEALTH_CHECK_POOL_MAX_CONNECTIONS_PER_HOST
+        )
+        self._keepalive_expiry = (
+            keepalive_expiry_seconds or settings.HEALTH_CHECK_POOL_KEEPALIVE_SECONDS
+        )
+        self._idle_pool_seconds = (
+            idle_pool_seconds or settings.HEALTH_CHECK_POOL_IDLE_SECONDS
+        )
+        self._http2 = settings.HEALTH_CHECK_HTTP2_ENABLED if http2 is None else http2
+
+        # Loading the CA bundle is expensive, so every origin shares one context
+        self._ssl_context = httpx.create_ssl_context()
+        self.dns_cache = dns_cache or DnsCache()
+        self._network_backend = CachingNetworkBackend(self.dns_cache)
+        self._pools: dict[Origin, httpcore.AsyncConnectionPool] = {}
+        self._last_used: dict[Origin, float] = {}
+
+    @property
+    def origin_count(self) -> int:
+        return len(self._pools)
+
+    def _pool_for(self, url: httpcore.URL) -> httpcore.AsyncConnectionPool:
+        origin = url.origin
+        key = (origin.scheme, origin.host, origin.port)
+        self._last_used[key] = time.monotonic()
+
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = httpcore.AsyncConnectionPool(
+                ssl_context=self._ssl_context,
+                max_connections=self._max_connections,
+                max_keepalive_connections=self._max_connections,
+                keepalive_expiry=self._keepalive_expiry,
+                http1=True,
+                http2=self._http2,
+                network_backend=self._network_backend,
+            )
+            self._pools[key] = pool
+
+        return pool
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        timeout: float,
+        timings: ProbeTimings | None = None,
+    ) -> int:
+        """
+        Send a request over a pooled connection and return the status code.
+
+        When ``timings`` is given it is filled in as the phases complete, so a
+        request that times out still reports the phases it got through.
+        """
+        target = httpcore.URL(url)
+        extensions: dict = {
+            "timeout": {
+                "connect": timeout,
+                "read": timeout,
+                "write": timeout,
+                "pool": timeout,
+            }
+        }
+        if timings is not None:
+            extensions["trace"] = _PhaseTrace(timings)
+
+        response = await self._pool_for(target).request(
+            method, target, extensions=extensions
+        )
+        return response.status
+
+    async def evict_idle(self) -> int:
+        """Close the pools of origins that have not been probed recently"""
+        cutoff = time.monotonic() - self._idle_pool_seconds
+        stale = [key for key, used in self._last_used.items() if used < cutoff]
+
+        for key in stale:
+            del self._last_used[key]
+            pool = self._pools.pop(key, None)
+            if pool is not None:
+                await pool.aclose()
+
+        return len(stale)
+
+    async def aclose(self) -> None:
+        """Close every pooled connection"""
+        for pool in self._pools.values():
+            await pool.aclose()
+        self._pools.clear()
+        self._last_used.clear()
+        await self.dns_cache.aclose()
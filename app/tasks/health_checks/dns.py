@@ -0,0 +1,321 @@
+import asyncio
+import contextvars
+import ipaddress
+import logging
+import socket
+import time
+from collections.abc import Awaitable, Callable, Iterable
+
+import aiodns
+import httpcore
+import pycares
+
+from app.configs.settings import settings
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+Lookup = Callable[[str], Awaitable[tuple[list[str], int]]]
+
+# Seconds the current task spent resolving its last connect, for probe timings
+resolve_duration: contextvars.ContextVar[float] = contextvars.ContextVar(
+    "resolve_duration", default=0.0
+)
+
+# Answers that mean the name does not exist, as opposed to a failed lookup
+_NEGATIVE_CODES = {
+    pycares.errno.ARES_ENOTFOUND,
+    pycares.errno.ARES_ENODATA,
+    pycares.errno.ARES_ENONAME,
+}
+
+
+# Error raised when a host cannot be resolved
+class DnsLookupError(Exception):
+    def __init__(self, host: str, reason: str):
+        super().__init__(f"Could not resolve {host}: {reason}")
+        self.host = host
+
+
+# Class to resolve host names through c-ares on the event loop
+class AresResolver:
+    """
+    Non-blocking resolver backed by c-ares.
+
+    Lookups run on the event loop instead of the default executor, consult the
+    hosts file first and return the addresses together with the smallest TTL
+    of the answer. Point ``nameservers`` at a stub resolver to test against
+    canned answers.
+    """
+
+    def __init__(
+        self,
+        nameservers: list[str] | None = None,
+        timeout: float | None = None,
+    ):
+        self._nameservers = nameservers or settings.HEALTH_CHECK_DNS_NAMESERVERS
+        self._timeout = timeout or settings.HEALTH_CHECK_DNS_TIMEOUT_SECONDS
+        self._resolver: aiodns.DNSResolver | None = None
+
+    async def lookup(self, host: str) -> tuple[list[str], int]:
+        # The channel binds to the running loop, so it is created lazily
+        if self._resolver is None:
+            self._resolver = aiodns.DNSResolver(
+                nameservers=self._nameservers or None,
+                timeout=self._timeout,
+                tries=2,
+            )
+
+        try:
+            result = await self._resolver.getaddrinfo(
+                host, family=socket.AF_UNSPEC, type=socket.SOCK_STREAM
+            )
+        except aiodns.error.DNSError as exc:
+            code = exc.args[0] if exc.args else None
+            reason = exc.args[1] if len(exc.args) > 1 else "lookup failed"
+            if code in _NEGATIVE_CODES:
+                raise DnsLookupError(host, reason) from exc
+            raise ConnectionError(f"DNS lookup for {host} failed: {reason}") from exc
+
+        # Prefer IPv4; dual-stack targets are far more often reachable on it
+        nodes = sorted(result.nodes, key=lambda node: node.family != socket.AF_INET)
+        addresses = list(dict.fromkeys(_decode(node.addr[0]) for node in nodes))
+        if not addresses:
+            raise DnsLookupError(host, "no addresses")
+
+        ttl = min(node.ttl for node in result.nodes)
+        return addresses, ttl
+
+    async def aclose(self) -> None:
+        if self._resolver is not None:
+            await self._resolver.close()
+            self._resolver = None
+
+
+def _decode(address: bytes | str) -> str:
+    return address.decode() if isinstance(address, bytes) else address
+
+
+# Class to hold one cached answer
+class _Entry:
+    __slots__ = ("addresses", "expires_at", "stale_until")
+
+    def __init__(
+        self, addresses: list[str] | None, expires_at: float, stale_until: float
+    ):
+        # None marks a negative answer
+        self.addresses = addresses
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+
+# Class to cache DNS answers for every probe of the worker
+class DnsCache:
+    """
+    TTL-respecting DNS cache shared by all probes of a worker.
+
+    Answers are kept for their own TTL, clamped to a configured range, and
+    concurrent lookups of the same host share one query. Names that do not
+    exist are cached for a short negative TTL. Once an answer expires it is
+    still served for a stale window while a single background lookup
+    refreshes it, and it keeps being served if that lookup fails, so a
+    resolver outage does not turn into probe failures.
+    """
+
+    def __init__(
+        self,
+        lookup: Lookup | None = None,
+        min_ttl: float | None = None,
+        max_ttl: float | None = None,
+        negative_ttl: float | None = None,
+        stale_seconds: float | None = None,
+        max_entries: int | None = None,
+    ):
+        self._resolver = AresResolver() if lookup is None else None
+        self._lookup = lookup or self._resolver.lookup
+        self._min_ttl = min_ttl or settings.HEALTH_CHECK_DNS_MIN_TTL_SECONDS
+        self._max_ttl = max_ttl or settings.HEALTH_CHECK_DNS_MAX_TTL_SECONDS
+        self._negative_ttl = (
+            negative_ttl or settings.HEALTH_CHECK_DNS_NEGATIVE_TTL_SECONDS
+        )
+        self._stale_seconds = (
+            settings.HEALTH_CHECK_DNS_STALE_SECONDS
+            if stale_seconds is None
+            else stale_seconds
+        )
+        self._max_entries = max_entries or settings.HEALTH_CHECK_DNS_MAX_ENTRIES
+
+        self._entries: dict[str, _Entry] = {}
+        self._pending: dict[str, asyncio.Task] = {}
+        self._hits = 0
+        self._lookups = 0
+
+    @property
+    def size(self) -> int:
+        return len(self._entries)
+
+    async def resolve(self, host: str) -> list[str]:
+        """Return the addresses of a host, resolving it only when needed"""
+        if _is_ip_address(host):
+            return [host]
+
+        now = time.monotonic()
+        entry = self._entries.get(host)
+
+        if entry is not None and now < entry.expires_at:
+            self._record(hit=True)
+            if entry.addresses is None:
+                metrics.increment("dns.negative_hits")
+                raise DnsLookupError(host, "cached negative answer")
+            return entry.addresses
+
+        if (
+            entry is not None
+            and entry.addresses is not None
+            and now < entry.stale_until
+        ):
+            self._record(hit=True)
+            metrics.increment("dns.stale_hits")
+            self._refresh(host)
+            return entry.addresses
+
+        self._record(hit=False)
+        return await asyncio.shield(self._refresh(host))
+
+    def _refresh(self, host: str) -> asyncio.Task:
+        """Start a lookup for the host unless one is already running"""
+        task = self._pending.get(host)
+        if task is None:
+            task = asyncio.create_task(self._resolve_uncached(host))
+            self._pending[host] = task
+            task.add_done_callback(lambda done: self._finish(host, done))
+        return task
+
+    def _finish(self, host: str, task: asyncio.Task) -> None:
+        self._pending.pop(host, None)
+
+        # Background refreshes have no waiter, so read the error here
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("DNS lookup for %s failed: %s", host, task.exception())
+
+    async def _resolve_uncached(self, host: str) -> list[str]:
+        started = time.perf_counter()
+        try:
+            addresses, ttl = await self._lookup(host)
+        except DnsLookupError:
+            self._store(host, None, self._negative_ttl)
+            raise
+        except Exception:
+            metrics.increment("dns.errors")
+
+            # Keep serving the last good answer while the resolver is failing
+            entry = self._entries.get(host)
+            if (
+                entry is not None
+                and entry.addresses is not None
+                and time.monotonic() < entry.stale_until
+            ):
+                return entry.addresses
+            raise
+        finally:
+            metrics.observe("dns.resolve", time.perf_counter() - started)
+
+        self._store(host, addresses, min(max(ttl, self._min_ttl), self._max_ttl))
+        return addresses
+
+    def _store(self, host: str, addresses: list[str] | None, ttl: float) -> None:
+        now = time.monotonic()
+        stale = self._stale_seconds if addresses is not None else 0
+
+        # Re-inserting moves the host to the end, so the oldest entry goes first
+        self._entries.pop(host, None)
+        if len(self._entries) >= self._max_entries:
+            del self._entries[next(iter(self._entries))]
+
+        self._entries[host] = _Entry(addresses, now + ttl, now + ttl + stale)
+        metrics.set_gauge("dns.entries", len(self._entries))
+
+    def _record(self, hit: bool) -> None:
+        self._lookups += 1
+        if hit:
+            self._hits += 1
+            metrics.increment("dns.hits")
+        else:
+            metrics.increment("dns.misses")
+        metrics.set_gauge("dns.hit_ratio", self._hits / self._lookups)
+
+    async def aclose(self) -> None:
+        for task in list(self._pending.values()):
+            task.cancel()
+        await asyncio.gather(*self._pending.values(), return_exceptions=True)
+
+        if self._resolver is not None:
+            await self._resolver.aclose()
+
+
+def _is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+# Class to connect the probe pools through the DNS cache
+class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """
+    httpcore network backend that resolves hosts through a ``DnsCache``.
+
+    The pool keeps using the host name for TLS SNI and certificate checks;
+    only the TCP connect goes to a cached address, trying each in turn.
+    """
+
+    def __init__(
+        self, cache: DnsCache, backend: httpcore.AsyncNetworkBackend | None = None
+    ):
+        self._cache = cache
+        self._backend = backend or httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: Iterable[httpcore.SOCKET_OPTION] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        started = time.perf_counter()
+        try:
+            addresses = await self._cache.resolve(host)
+        except (DnsLookupError, ConnectionError) as exc:
+            raise httpcore.ConnectError(str(exc)) from exc
+        finally:
+            resolve_duration.set(time.perf_counter() - started)
+
+        error: Exception | None = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except httpcore.ConnectError as exc:
+                error = exc
+
+        raise error
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: float | None = None,
+        socket_options: Iterable[httpcore.SOCKET_OPTION] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        return await self._backend.connect_unix_socket(
+            path, timeout=timeout, socket_options=socket_options
+        )
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
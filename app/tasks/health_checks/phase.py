@@ -0,0 +1,35 @@
+import math
+import random
+
+from app.configs.settings import settings
+from app.types.auth import TypeUUID
+
+
+# Function to get the fixed offset of a check inside its interval
+def phase_offset(check_id: TypeUUID, interval_seconds: float) -> float:
+    """
+    Spread checks evenly across their interval by hashing the check id.
+
+    The offset only depends on the id and the interval, so a check keeps the
+    same slot across restarts and on whichever replica ends up owning it.
+    """
+    interval_ms = max(int(interval_seconds * 1000), 1)
+    return (check_id.int % interval_ms) / 1000
+
+
+# Function to find the next slot of a check on its wall-clock grid
+def next_slot(check_id: TypeUUID, interval_seconds: float, after: float) -> float:
+    """Return the first slot strictly after ``after`` (unix seconds)"""
+    phase = phase_offset(check_id, interval_seconds)
+    cycles = math.floor((after - phase) / interval_seconds) + 1
+    return phase + cycles * interval_seconds
+
+
+# Function to pick a bounded random jitter for a single run
+def jitter(interval_seconds: float) -> float:
+    """Return a jitter in seconds, bounded by a ratio of the interval and a cap"""
+    bound = min(
+        interval_seconds * settings.HEALTH_CHECK_JITTER_RATIO,
+        settings.HEALTH_CHECK_MAX_JITTER_SECONDS,
+    )
+    return random.uniform(-bound, bound) if bound > 0 else 0.0
@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+import httpcore
+
+from app.configs.settings import settings
+from app.tasks.health_checks.client import ProbeConnectionPool
+from app.types.health_check import (
+    HealthCheckSpec,
+    HealthState,
+    ProbeResult,
+    ProbeTimings,
+)
+from app.utils.generators import get_current_datetime
+
+
+# Function to execute a single health check probe
+async def probe(pool: ProbeConnectionPool, spec: HealthCheckSpec) -> ProbeResult:
+    """Function to send the health check request and classify the outcome"""
+    checked_at = get_current_datetime()
+    started = time.perf_counter()
+    status_code: int | None = None
+    timed_out = False
+    timings = ProbeTimings()
+
+    timeout = spec.timeout_ms / 1000
+
+    try:
+        # Bound the whole exchange, not just the individual socket operations
+        async with asyncio.timeout(timeout):
+            status_code = await pool.request(spec.method, spec.url, timeout, timings)
+    except (httpcore.TimeoutException, TimeoutError):
+        timed_out = True
+    except (
+        httpcore.NetworkError,
+        httpcore.ProtocolError,
+        httpcore.UnsupportedProtocol,
+    ):
+        status_code = None
+
+    elapsed_ms = int((time.perf_counter() - started) * 1000)
+    is_success = status_code == spec.expected_status
+
+    return ProbeResult(
+        health_check_id=spec.health_check_id,
+        service_id=spec.service_id,
+        status_code=status_code,
+        response_time_ms=elapsed_ms if status_code is not None else None,
+        is_success=is_success,
+        checked_at=checked_at,
+        timed_out=timed_out,
+        state=classify(spec, is_success, elapsed_ms),
+        timings=timings,
+    )
+
+
+# Function to map a probe outcome onto a health state
+def classify(spec: HealthCheckSpec, is_success: bool, elapsed_ms: int) -> HealthState:
+    """Function to tell a healthy, a slow and a failed probe apart"""
+    if not is_success:
+        return HealthState.DOWN
+    if elapsed_ms >= spec.timeout_ms * settings.HEALTH_CHECK_DEGRADED_RATIO:
+        return HealthState.DEGRADED
+    return HealthState.UP
@@ -0,0 +1,42 @@
+from app.configs.settings import settings
+from app.tasks.health_checks.scheduler import HealthCheckScheduler
+from app.tasks.health_checks.sharding import ShardMembership
+from app.tasks.health_checks.summary import HealthSummaryWriter
+from app.tasks.health_checks.writer import PingLogWriter
+from app.types.health_check import ProbeResult
+
+
+# Class to wire the health check components together for a process
+class HealthCheckRuntime:
+    """Start and stop the writers, shard membership and scheduler in order"""
+
+    def __init__(self):
+        self.writer = PingLogWriter()
+        self.summary = HealthSummaryWriter()
+        self.membership = (
+            ShardMembership() if settings.HEALTH_CHECK_SHARDING_ENABLED else None
+        )
+        self.scheduler = HealthCheckScheduler(
+            on_result=self.record,
+            membership=self.membership,
+            on_drop=self.summary.forget,
+        )
+
+    async def record(self, result: ProbeResult) -> None:
+        await self.summary.write(result)
+        await self.writer.write(result)
+
+    async def start(self) -> None:
+        await self.writer.start()
+        await self.summary.start()
+        if self.membership is not None:
+            await self.membership.start()
+        await self.scheduler.start()
+
+    async def stop(self) -> None:
+        # Stop probing first, hand the shard back, then flush the last rows
+        await self.scheduler.stop()
+        if self.membership is not None:
+            await self.membership.stop()
+        await self.summary.stop()
+        await self.writer.stop()
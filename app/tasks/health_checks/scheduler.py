@@ -0,0 +1,267 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+from app.configs.session import AsyncSessionLocal
+from app.configs.settings import settings
+from app.services.services.health_checks import get_active_health_checks
+from app.tasks.health_checks.adaptive import CheckState, HostGuard, next_interval
+from app.tasks.health_checks.client import ProbeConnectionPool
+from app.tasks.health_checks.phase import jitter, next_slot
+from app.tasks.health_checks.prober import probe
+from app.tasks.health_checks.sharding import ShardMembership
+from app.types.auth import TypeUUID
+from app.types.health_check import HealthCheckSpec, ProbeResult
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+LoadChecks = Callable[[], Awaitable[list[HealthCheckSpec]]]
+OnResult = Callable[[ProbeResult], Awaitable[None]]
+OnDrop = Callable[[TypeUUID], None]
+
+
+# Function to load the active checks with a short lived session
+async def load_checks_from_database() -> list[HealthCheckSpec]:
+    """Function to read the active health checks from the database"""
+    async with AsyncSessionLocal() as db:
+        return await get_active_health_checks(db)
+
+
+# Function to tell whether two specs of a check run on the same intervals
+def _same_interval(first: HealthCheckSpec, second: HealthCheckSpec) -> bool:
+    return (
+        first.interval_seconds,
+        first.adaptive,
+        first.min_interval_seconds,
+        first.max_interval_seconds,
+    ) == (
+        second.interval_seconds,
+        second.adaptive,
+        second.min_interval_seconds,
+        second.max_interval_seconds,
+    )
+
+
+# Class to run the health checks on their configured intervals
+class HealthCheckScheduler:
+    """
+    Run every active health check on a single event loop.
+
+    Due checks live in a min-heap keyed by their next run time, so each tick
+    only touches the checks that are actually due. Runs sit on a wall-clock
+    grid with a per-check phase derived from the check id, so checks sharing
+    an interval are spread across it instead of firing together, and keep
+    their slot across restarts. Each run gets a small bounded jitter that
+    does not accumulate. Adaptive checks change their interval with every
+    result, and runs against hosts that keep timing out are capped. The
+    database is read on a fixed refresh interval to pick up added, changed or
+    removed checks; it is never queried per tick. With a shard membership only
+    the checks owned by this replica are scheduled, and ownership is re-applied
+    whenever the set of live replicas changes.
+    """
+
+    def __init__(
+        self,
+        on_result: OnResult,
+        load_checks: LoadChecks = load_checks_from_database,
+        max_concurrency: int | None = None,
+        refresh_seconds: int | None = None,
+        membership: ShardMembership | None = None,
+        on_drop: OnDrop | None = None,
+    ):
+        self._load_checks = load_checks
+        self._on_result = on_result
+        self._on_drop = on_drop
+        self._membership = membership
+        if membership is not None:
+            membership.set_on_change(self.reshard)
+        self._refresh_seconds = refresh_seconds or settings.HEALTH_CHECK_REFRESH_SECONDS
+        self._semaphore = asyncio.Semaphore(
+            max_concurrency or settings.HEALTH_CHECK_MAX_CONCURRENCY
+        )
+
+        # Every loaded check, and the owned subset that is actually scheduled
+        self._catalog: list[HealthCheckSpec] = []
+
+        # Current spec and live heap sequence per check; stale entries are skipped
+        self._checks: dict[TypeUUID, HealthCheckSpec] = {}
+        self._generations: dict[TypeUUID, int] = {}
+        self._states: dict[TypeUUID, CheckState] = {}
+        self._host_guard = HostGuard()
+        self._heap: list[tuple[float, int, TypeUUID, float]] = []
+        self._sequence = itertools.count()
+
+        self._wakeup = asyncio.Event()
+        self._inflight: set[asyncio.Task] = set()
+        self._tasks: list[asyncio.Task] = []
+        self._pool = ProbeConnectionPool()
+
+    @property
+    def check_count(self) -> int:
+        return len(self._checks)
+
+    @property
+    def inflight_count(self) -> int:
+        return len(self._inflight)
+
+    async def start(self) -> None:
+        """Load the checks and start the refresh and dispatch loops"""
+        self.sync(await self._load_checks())
+
+        self._tasks = [
+            asyncio.create_task(self._refresh_loop(), name="health-check-refresh"),
+            asyncio.create_task(self._dispatch_loop(), name="health-check-dispatch"),
+            asyncio.create_task(self._evict_loop(), name="health-check-evict"),
+        ]
+        logger.info("Health check scheduler started with %d checks", self.check_count)
+
+    async def stop(self) -> None:
+        """Stop scheduling and wait for the in-flight probes to finish"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+        await self._pool.aclose()
+
+        logger.info("Health check scheduler stopped")
+
+    def sync(self, checks: list[HealthCheckSpec]) -> None:
+        """Reconcile the scheduled checks with a freshly loaded set"""
+        now = time.time()
+        self._catalog = checks
+
+        membership = self._membership
+        incoming = {
+            check.health_check_id: check
+            for check in checks
+            if membership is None or membership.owns(check.health_check_id)
+        }
+
+        # Drop removed checks; their heap entries are discarded lazily
+        for check_id in self._checks.keys() - incoming.keys():
+            del self._checks[check_id]
+            del self._generations[check_id]
+            del self._states[check_id]
+            if self._on_drop is not None:
+                self._on_drop(check_id)
+
+        for check_id, check in incoming.items():
+            current = self._checks.get(check_id)
+            self._checks[check_id] = check
+
+            # Reschedule new checks and checks whose interval settings changed
+            if current is None or not _same_interval(current, check):
+                self._states[check_id] = CheckState(check.interval_seconds)
+                self._schedule(check, now)
+
+        self._wakeup.set()
+
+    def reshard(self) -> None:
+        """Re-apply shard ownership to the last loaded set of checks"""
+        self.sync(self._catalog)
+
+    def _schedule(self, check: HealthCheckSpec, after: float) -> None:
+        """Queue the first grid slot of the check strictly after ``after``"""
+        interval = self._states[check.health_check_id].interval
+        slot = next_slot(check.health_check_id, interval, after)
+
+        # The heap runs on the loop clock; the grid is anchored to wall time
+        fire_at = (
+            slot + jitter(interval) - time.time() + asyncio.get_running_loop().time()
+        )
+
+        sequence = next(self._sequence)
+        self._generations[check.health_check_id] = sequence
+        heapq.heappush(self._heap, (fire_at, sequence, check.health_check_id, slot))
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._refresh_seconds)
+            try:
+                self.sync(await self._load_checks())
+            except Exception:
+                logger.exception("Failed to refresh health checks")
+
+    async def _evict_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.HEALTH_CHECK_POOL_IDLE_SECONDS / 2)
+            try:
+                await self._pool.evict_idle()
+            except Exception:
+                logger.exception("Failed to evict idle probe connections")
+
+    async def _dispatch_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            now = loop.time()
+
+            while self._heap and self._heap[0][0] <= now:
+                fire_at, sequence, check_id, slot = heapq.heappop(self._heap)
+                if self._generations.get(check_id) != sequence:
+                    continue
+
+                check = self._checks[check_id]
+
+                # Stay on the grid, but never queue up runs missed while lagging
+                self._schedule(check, max(slot, time.time()))
+
+                if not self._host_guard.acquire(check.host):
+                    metrics.increment("health_checks.skipped_suspect_host")
+                    continue
+
+                task = asyncio.create_task(self._run_probe(check, fire_at))
+                self._inflight.add(task)
+                task.add_done_callback(self._inflight.discard)
+
+            delay = self._heap[0][0] - now if self._heap else None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except TimeoutError:
+                pass
+
+    def _adapt(self, check: HealthCheckSpec, result: ProbeResult) -> None:
+        """Reschedule the check when its result changes the interval"""
+        state = self._states.get(check.health_check_id)
+        current = self._checks.get(check.health_check_id)
+        # A refresh replaces the spec; only a changed interval voids the result
+        if state is None or current is None or not _same_interval(current, check):
+            return
+        check = current
+
+        previous = state.interval
+        interval = next_interval(check, state, result)
+        if interval != previous:
+            # Take the grid slot nearest to one new interval from now
+            self._schedule(check, time.time() + interval / 2)
+            self._wakeup.set()
+
+    async def _run_probe(self, check: HealthCheckSpec, fire_at: float) -> None:
+        timed_out = False
+        try:
+            async with self._semaphore:
+                # Lag covers both a busy loop and waiting for a probe slot
+                lag = max(asyncio.get_running_loop().time() - fire_at, 0.0)
+                metrics.observe("health_checks.schedule_lag", lag)
+
+                result = await probe(self._pool, check)
+            result.schedule_lag = lag
+            timed_out = result.timed_out
+        finally:
+            self._host_guard.release(check.host, timed_out)
+
+        self._adapt(check, result)
+
+        try:
+            await self._on_result(result)
+        except Exception:
+            logger.exception("Failed to record result for %s", check.health_check_id)
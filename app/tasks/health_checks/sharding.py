@@ -0,0 +1,157 @@
+import asyncio
+import hashlib
+import logging
+import os
+import socket
+import time
+from collections.abc import Callable
+from datetime import timedelta
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.configs.session import AsyncSessionLocal
+from app.configs.settings import settings
+from app.models.services.health_check_worker import HealthCheckWorker
+from app.types.auth import TypeUUID
+from app.utils.generators import get_uuid
+
+logger = logging.getLogger(__name__)
+
+_MASK64 = (1 << 64) - 1
+
+
+# Function to derive a stable 64-bit seed for a worker id
+def _worker_seed(worker_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(worker_id.encode(), digest_size=8).digest())
+
+
+# Function to mix a check id with a worker seed (splitmix64 finaliser)
+def _score(check_key: int, seed: int) -> int:
+    z = (check_key ^ seed) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+# Class to decide which health checks this replica owns
+class ShardMembership:
+    """
+    Split the health checks across live replicas with rendezvous hashing.
+
+    Every replica upserts a heartbeat row in ``health_check_workers`` and reads
+    back the set of replicas whose heartbeat is fresh, using the database clock
+    so replica clocks never disagree. A check belongs to the live replica with
+    the highest hash score for it, so when a replica joins or dies only its
+    share of the checks moves. A replica that cannot heartbeat for longer than
+    the TTL gives up all of its checks, since the others will already have
+    taken them over.
+    """
+
+    def __init__(self, on_change: Callable[[], None] | None = None):
+        hostname = socket.gethostname()
+        self.worker_id = f"{hostname}-{os.getpid()}-{get_uuid().hex[-8:]}"
+        self._hostname = hostname
+        self._on_change = on_change
+
+        self._seeds: list[tuple[str, int]] = []
+        self._last_heartbeat = 0.0
+        self._task: asyncio.Task | None = None
+
+    @property
+    def members(self) -> list[str]:
+        return [worker_id for worker_id, _ in self._seeds]
+
+    def set_on_change(self, on_change: Callable[[], None]) -> None:
+        self._on_change = on_change
+
+    def owns(self, check_id: TypeUUID) -> bool:
+        """Return True when this replica is responsible for the check"""
+        if not self._seeds:
+            return False
+
+        check_key = check_id.int & _MASK64
+        owner = max(self._seeds, key=lambda member: _score(check_key, member[1]))
+        return owner[0] == self.worker_id
+
+    async def start(self) -> None:
+        await self._heartbeat()
+        self._task = asyncio.create_task(self._heartbeat_loop(), name="shard-heartbeat")
+
+    async def stop(self) -> None:
+        """Stop heartbeating and leave the ring so peers take over immediately"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    delete(HealthCheckWorker).where(
+                        HealthCheckWorker.worker_id == self.worker_id
+                    )
+                )
+                await db.commit()
+        except Exception:
+            logger.exception("Failed to deregister worker %s", self.worker_id)
+
+        self._update_members([])
+
+    async def _heartbeat(self) -> None:
+        ttl = timedelta(seconds=settings.HEALTH_CHECK_WORKER_TTL_SECONDS)
+
+        async with AsyncSessionLocal() as db:
+            statement = insert(HealthCheckWorker).values(
+                worker_id=self.worker_id,
+                hostname=self._hostname,
+                started_at=func.now(),
+                heartbeat_at=func.now(),
+            )
+            await db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[HealthCheckWorker.worker_id],
+                    set_={"heartbeat_at": func.now()},
+                )
+            )
+
+            # Forget replicas that have been gone for a long time
+            await db.execute(
+                delete(HealthCheckWorker).where(
+                    HealthCheckWorker.heartbeat_at < func.now() - ttl * 10
+                )
+            )
+
+            result = await db.execute(
+                select(HealthCheckWorker.worker_id)
+                .where(HealthCheckWorker.heartbeat_at >= func.now() - ttl)
+                .order_by(HealthCheckWorker.worker_id)
+            )
+            members = list(result.scalars().all())
+            await db.commit()
+
+        self._last_heartbeat = time.monotonic()
+        self._update_members(members)
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.HEALTH_CHECK_HEARTBEAT_SECONDS)
+            try:
+                await self._heartbeat()
+            except Exception:
+                logger.exception("Health check worker heartbeat failed")
+
+                # Peers stop seeing us after the TTL, so stop probing as well
+                stale_for = time.monotonic() - self._last_heartbeat
+                if stale_for > settings.HEALTH_CHECK_WORKER_TTL_SECONDS:
+                    self._update_members([])
+
+    def _update_members(self, members: list[str]) -> None:
+        if members == self.members:
+            return
+
+        logger.info("Health check shard members changed: %s", members)
+        self._seeds = [(worker_id, _worker_seed(worker_id)) for worker_id in members]
+
+        if self._on_change is not None:
+            self._on_change()
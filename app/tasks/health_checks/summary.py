@@ -0,0 +1,267 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+from app.configs.session import AsyncSessionLocal
+from app.configs.settings import settings
+from app.types.auth import TypeUUID
+from app.types.health_check import HealthState, ProbeResult
+from app.utils.generators import get_uuid
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Counter slots: service_id, up, degraded, down, latency count, sum and max
+_STATE_SLOT = {HealthState.UP: 1, HealthState.DEGRADED: 2, HealthState.DOWN: 3}
+
+# Rows flagged ``verify`` are the first state this worker saw for a check, so
+# they are only stored when they differ from the last stored state
+INSERT_TRANSITIONS = text(
+    """
+    INSERT INTO service_health_transitions (
+        transition_id, health_check_id, service_id, state, previous_state,
+        status_code, response_time_ms, changed_at, created_at
+    )
+    SELECT t.transition_id, t.health_check_id, t.service_id, t.state,
+           coalesce(t.previous_state, last.state),
+           t.status_code, t.response_time_ms, t.changed_at, now()
+    FROM unnest(
+        CAST(:transition_ids AS uuid[]),
+        CAST(:health_check_ids AS uuid[]),
+        CAST(:service_ids AS uuid[]),
+        CAST(:states AS varchar[]),
+        CAST(:previous_states AS varchar[]),
+        CAST(:status_codes AS integer[]),
+        CAST(:response_times AS integer[]),
+        CAST(:changed_at AS timestamptz[]),
+        CAST(:verify AS boolean[])
+    ) AS t(
+        transition_id, health_check_id, service_id, state, previous_state,
+        status_code, response_time_ms, changed_at, verify
+    )
+    JOIN service_health_checks AS h ON h.health_check_id = t.health_check_id
+    LEFT JOIN LATERAL (
+        SELECT s.state
+        FROM service_health_transitions AS s
+        WHERE s.health_check_id = t.health_check_id
+        ORDER BY s.changed_at DESC
+        LIMIT 1
+    ) AS last ON t.verify
+    WHERE NOT t.verify OR last.state IS DISTINCT FROM t.state
+    """
+)
+
+UPSERT_COUNTERS = text(
+    """
+    INSERT INTO service_health_counters AS c (
+        health_check_id, bucket_start, service_id, up_count, degraded_count,
+        down_count, latency_count, latency_sum_ms, latency_max_ms
+    )
+    SELECT t.*
+    FROM unnest(
+        CAST(:health_check_ids AS uuid[]),
+        CAST(:bucket_starts AS timestamptz[]),
+        CAST(:service_ids AS uuid[]),
+        CAST(:up_counts AS integer[]),
+        CAST(:degraded_counts AS integer[]),
+        CAST(:down_counts AS integer[]),
+        CAST(:latency_counts AS integer[]),
+        CAST(:latency_sums AS bigint[]),
+        CAST(:latency_maxes AS integer[])
+    ) AS t(
+        health_check_id, bucket_start, service_id, up_count, degraded_count,
+        down_count, latency_count, latency_sum_ms, latency_max_ms
+    )
+    JOIN service_health_checks AS h ON h.health_check_id = t.health_check_id
+    ON CONFLICT (health_check_id, bucket_start) DO UPDATE SET
+        up_count = c.up_count + excluded.up_count,
+        degraded_count = c.degraded_count + excluded.degraded_count,
+        down_count = c.down_count + excluded.down_count,
+        latency_count = c.latency_count + excluded.latency_count,
+        latency_sum_ms = c.latency_sum_ms + excluded.latency_sum_ms,
+        latency_max_ms = greatest(c.latency_max_ms, excluded.latency_max_ms)
+    """
+)
+
+
+# Function to floor a timestamp to the start of its counter bucket
+def bucket_start(moment: datetime, bucket_seconds: int) -> datetime:
+    epoch = int(moment.timestamp())
+    return datetime.fromtimestamp(epoch - epoch % bucket_seconds, tz=timezone.utc)
+
+
+# Class to keep the compact health history: state changes plus bucket counters
+class HealthSummaryWriter:
+    """
+    Store health state transitions and per-bucket probe counters.
+
+    Each worker remembers the last state of the checks it probes and only
+    emits a row when that state changes. The first state it sees for a check
+    is compared with the last stored transition in the database, so restarts
+    and shard moves never duplicate or lose a change. Counters are summed in
+    memory per check and bucket and upserted additively on every flush, so a
+    bucket spanning several flushes still ends up with one row.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float | None = None,
+        bucket_seconds: int | None = None,
+        max_pending: int | None = None,
+    ):
+        self._flush_interval = flush_interval or settings.PING_LOG_FLUSH_SECONDS
+        self._bucket_seconds = bucket_seconds or settings.HEALTH_COUNTER_BUCKET_SECONDS
+        self._max_pending = max_pending or settings.PING_LOG_MAX_BUFFER
+
+        self._states: dict[TypeUUID, HealthState] = {}
+        self._transitions: list[tuple] = []
+        self._counters: dict[tuple[TypeUUID, datetime], list] = {}
+
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    def forget(self, check_id: TypeUUID) -> None:
+        """Drop the remembered state of a check this worker stopped probing"""
+        self._states.pop(check_id, None)
+
+    async def write(self, result: ProbeResult) -> None:
+        """Fold a probe result into the pending transitions and counters"""
+        check_id = result.health_check_id
+        previous = self._states.get(check_id)
+
+        if previous is not result.state:
+            self._states[check_id] = result.state
+            self._transitions.append(
+                (
+                    get_uuid(),
+                    check_id,
+                    result.service_id,
+                    result.state.value,
+                    previous.value if previous is not None else None,
+                    result.status_code,
+                    result.response_time_ms,
+                    result.checked_at,
+                    previous is None,
+                )
+            )
+            if len(self._transitions) > self._max_pending:
+                self._requeue([], {})
+
+        key = (check_id, bucket_start(result.checked_at, self._bucket_seconds))
+        counter = self._counters.get(key)
+        if counter is None:
+            # Make room by dropping the oldest bucket, as a failed flush would
+            if len(self._counters) >= self._max_pending:
+                del self._counters[next(iter(self._counters))]
+                metrics.increment("health_summary.counters_dropped")
+            counter = self._counters[key] = [result.service_id, 0, 0, 0, 0, 0, 0]
+
+        counter[_STATE_SLOT[result.state]] += 1
+        if result.response_time_ms is not None:
+            counter[4] += 1
+            counter[5] += result.response_time_ms
+            counter[6] = max(counter[6], result.response_time_ms)
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._flush_loop(), name="health-summary")
+
+    async def stop(self) -> None:
+        """Stop the background loop and flush whatever is still pending"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write the pending transitions and counters in one transaction"""
+        async with self._flush_lock:
+            if not self._transitions and not self._counters:
+                return
+
+            transitions, self._transitions = self._transitions, []
+            counters, self._counters = self._counters, {}
+            started = time.perf_counter()
+
+            try:
+                async with AsyncSessionLocal() as db:
+                    if transitions:
+                        await db.execute(
+                            INSERT_TRANSITIONS, _transition_params(transitions)
+                        )
+                    if counters:
+                        await db.execute(UPSERT_COUNTERS, _counter_params(counters))
+                    await db.commit()
+            except Exception:
+                logger.exception("Failed to flush the health summary")
+                self._requeue(transitions, counters)
+                return
+            finally:
+                metrics.observe("health_summary.flush", time.perf_counter() - started)
+
+            metrics.increment("health_summary.transitions", len(transitions))
+            metrics.increment("health_summary.counter_rows", len(counters))
+
+    def _requeue(self, transitions: list[tuple], counters: dict) -> None:
+        """Put back a failed batch, dropping the oldest pending rows over the cap"""
+        self._transitions = transitions + self._transitions
+        overflow = len(self._transitions) - self._max_pending
+        if overflow > 0:
+            del self._transitions[:overflow]
+            metrics.increment("health_summary.transitions_dropped", overflow)
+
+        for key, counter in self._counters.items():
+            pending = counters.get(key)
+            if pending is None:
+                counters[key] = counter
+                continue
+            for slot in range(1, 6):
+                pending[slot] += counter[slot]
+            pending[6] = max(pending[6], counter[6])
+        self._counters = counters
+
+        overflow = len(self._counters) - self._max_pending
+        if overflow > 0:
+            for key in list(self._counters)[:overflow]:
+                del self._counters[key]
+            metrics.increment("health_summary.counters_dropped", overflow)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush()
+
+
+def _transition_params(transitions: list[tuple]) -> dict:
+    columns = list(zip(*transitions))
+    return {
+        "transition_ids": list(columns[0]),
+        "health_check_ids": list(columns[1]),
+        "service_ids": list(columns[2]),
+        "states": list(columns[3]),
+        "previous_states": list(columns[4]),
+        "status_codes": list(columns[5]),
+        "response_times": list(columns[6]),
+        "changed_at": list(columns[7]),
+        "verify": list(columns[8]),
+    }
+
+
+def _counter_params(counters: dict) -> dict:
+    keys = list(counters)
+    values = list(counters.values())
+    return {
+        "health_check_ids": [key[0] for key in keys],
+        "bucket_starts": [key[1] for key in keys],
+        "service_ids": [value[0] for value in values],
+        "up_counts": [value[1] for value in values],
+        "degraded_counts": [value[2] for value in values],
+        "down_counts": [value[3] for value in values],
+        "latency_counts": [value[4] for value in values],
+        "latency_sums": [value[5] for value in values],
+        "latency_maxes": [value[6] for value in values],
+    }
@@ -0,0 +1,29 @@
+import asyncio
+import logging
+import signal
+
+from app.configs.session import engine
+from app.tasks.health_checks.runtime import HealthCheckRuntime
+
+
+# Function to run the scheduler until the process is asked to stop
+async def run_worker() -> None:
+    """Standalone health check worker: python -m app.tasks.health_checks.worker"""
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    health_checks = HealthCheckRuntime()
+    await health_checks.start()
+
+    try:
+        await stop_event.wait()
+    finally:
+        await health_checks.stop()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_worker())
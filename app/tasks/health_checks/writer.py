@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import random
+import time
+
+from app.configs.settings import settings
+from app.services.company.retention import get_retention_tiers
+from app.types.health_check import ProbeResult, ProbeTimings
+from app.utils.bulk import copy_records
+from app.utils.generators import get_current_datetime, get_uuid
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+PING_LOG_COLUMNS = (
+    "ping_id",
+    "service_id",
+    "status_code",
+    "response_time_ms",
+    "dns_ms",
+    "connect_ms",
+    "tls_ms",
+    "ttfb_ms",
+    "is_success",
+    "checked_at",
+    "created_at",
+    "updated_at",
+    "retention_days",
+)
+
+_NO_TIMINGS = ProbeTimings()
+
+
+# Class to buffer probe results and write them to service_ping_logs in batches
+class PingLogWriter:
+    """
+    Buffer ping log rows in memory and COPY them to the database in batches.
+
+    A flush happens when the buffer reaches ``batch_size`` rows or when
+    ``flush_interval`` seconds have passed, whichever comes first. If a flush
+    fails the rows are put back, but the buffer never grows past
+    ``max_buffer``; the oldest rows are dropped and counted instead. Only a
+    ``sample_rate`` share of the probes is kept as raw rows.
+    """
+
+    def __init__(
+        self,
+        batch_size: int | None = None,
+        flush_interval: float | None = None,
+        max_buffer: int | None = None,
+        sample_rate: float | None = None,
+    ):
+        self._batch_size = batch_size or settings.PING_LOG_BATCH_SIZE
+        self._flush_interval = flush_interval or settings.PING_LOG_FLUSH_SECONDS
+        self._max_buffer = max_buffer or settings.PING_LOG_MAX_BUFFER
+        self._sample_rate = (
+            settings.PING_LOG_RAW_SAMPLE_RATE if sample_rate is None else sample_rate
+        )
+
+        self._buffer: list[tuple] = []
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def buffer_depth(self) -> int:
+        return len(self._buffer)
+
+    async def write(self, result: ProbeResult) -> None:
+        """Queue a probe result for the next batch"""
+        if self._sample_rate < 1 and random.random() >= self._sample_rate:
+            return
+
+        now = get_current_datetime()
+        timings = result.timings or _NO_TIMINGS
+        self._buffer.append(
+            (
+                get_uuid(),
+                result.service_id,
+                result.status_code,
+                result.response_time_ms,
+                timings.dns_ms,
+                timings.connect_ms,
+                timings.tls_ms,
+                timings.ttfb_ms,
+                result.is_success,
+                result.checked_at,
+                now,
+                now,
+            )
+        )
+        if len(self._buffer) > self._max_buffer:
+            self._requeue([])
+        metrics.set_gauge("ping_writer.buffer_depth", len(self._buffer))
+
+        if len(self._buffer) >= self._batch_size:
+            self._flush_requested.set()
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._flush_loop(), name="ping-log-writer")
+
+    async def stop(self) -> None:
+        """Stop the background loop and flush whatever is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write the buffered rows with a single COPY"""
+        async with self._flush_lock:
+            if not self._buffer:
+                return
+
+            batch, self._buffer = self._buffer, []
+            started = time.perf_counter()
+
+            try:
+                tiers = await get_retention_tiers(row[1] for row in batch)
+                await copy_records(
+                    "service_ping_logs",
+                    PING_LOG_COLUMNS,
+                    [row + (tiers[row[1]],) for row in batch],
+                )
+            except Exception:
+                logger.exception("Failed to flush %d ping logs", len(batch))
+                self._requeue(batch)
+                return
+            finally:
+                metrics.observe("ping_writer.flush", time.perf_counter() - started)
+                metrics.set_gauge("ping_writer.buffer_depth", len(self._buffer))
+
+            metrics.increment("ping_writer.rows_written", len(batch))
+
+    def _requeue(self, batch: list[tuple]) -> None:
+        self._buffer = batch + self._buffer
+        overflow = len(self._buffer) - self._max_buffer
+
+        if overflow > 0:
+            del self._buffer[:overflow]
+            metrics.increment("ping_writer.rows_dropped", overflow)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._flush_requested.wait(), timeout=self._flush_interval
+                )
+            except TimeoutError:
+                pass
+            self._flush_requested.clear()
+
+            await self.flush()
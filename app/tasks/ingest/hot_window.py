@@ -0,0 +1,276 @@
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import numpy as np
+
+from app.configs.settings import settings
+from app.types.auth import TypeUUID
+from app.types.ingest import MetricBatch
+from app.utils.metrics import metrics
+from app.utils.paths import OVERFLOW_PATH
+
+# Small integer codes for paths and methods, so a row is a few fixed-size
+# fields; values past the limit share an overflow code
+_MAX_PATH_CODES = 4096
+_MAX_METHOD_CODES = 64
+_OVERFLOW_METHOD = "OTHER"
+
+HOT_WINDOW_QUANTILES = {"p50": 0.5, "p90": 0.9, "p95": 0.95, "p99": 0.99}
+
+
+# Class to hold the most recent request metrics of one service
+class ServiceRingBuffer:
+    """
+    Fixed-capacity ring of recent rows kept as parallel NumPy arrays.
+
+    A row takes 19 bytes (timestamp, latency, status, path and method
+    codes), allocated once up front, and the oldest rows are overwritten
+    when the ring is full. Queries mask the rows inside a time window.
+    """
+
+    __slots__ = (
+        "capacity",
+        "timestamps",
+        "latencies",
+        "status_codes",
+        "path_codes",
+        "method_codes",
+        "paths",
+        "methods",
+        "_head",
+        "_size",
+    )
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.latencies = np.zeros(capacity, dtype=np.int32)
+        self.status_codes = np.zeros(capacity, dtype=np.int16)
+        self.path_codes = np.zeros(capacity, dtype=np.int32)
+        self.method_codes = np.zeros(capacity, dtype=np.int8)
+        self.paths: dict[str, int] = {}
+        self.methods: dict[str, int] = {}
+        self._head = 0
+        self._size = 0
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            column.nbytes
+            for column in (
+                self.timestamps,
+                self.latencies,
+                self.status_codes,
+                self.path_codes,
+                self.method_codes,
+            )
+        )
+
+    def append(self, timestamps, latencies, status_codes, paths, methods) -> None:
+        """Write a block of rows, overwriting the oldest ones when full"""
+        count = len(timestamps)
+        if count > self.capacity:
+            timestamps, latencies, status_codes, paths, methods = (
+                column[-self.capacity :]
+                for column in (timestamps, latencies, status_codes, paths, methods)
+            )
+            count = self.capacity
+
+        path_codes = [
+            self._code(self.paths, path, _MAX_PATH_CODES, OVERFLOW_PATH)
+            for path in paths
+        ]
+        method_codes = [
+            self._code(self.methods, method, _MAX_METHOD_CODES, _OVERFLOW_METHOD)
+            for method in methods
+        ]
+
+        # At most two slices: up to the end of the arrays, then from the start
+        first = min(count, self.capacity - self._head)
+        for start, stop, offset in (
+            (self._head, self._head + first, 0),
+            (0, count - first, first),
+        ):
+            if stop <= start:
+                continue
+            rows = slice(offset, offset + stop - start)
+            self.timestamps[start:stop] = timestamps[rows]
+            self.latencies[start:stop] = latencies[rows]
+            self.status_codes[start:stop] = status_codes[rows]
+            self.path_codes[start:stop] = path_codes[rows]
+            self.method_codes[start:stop] = method_codes[rows]
+
+        self._head = (self._head + count) % self.capacity
+        self._size = min(self._size + count, self.capacity)
+
+    def window(self, since: float, path: str | None = None, method: str | None = None):
+        """Return the timestamps, latencies and status codes of matching rows"""
+        rows = slice(0, self._size)
+        mask = self.timestamps[rows] >= since
+        if path is not None:
+            code = self.paths.get(path)
+            if code is None:
+                mask[:] = False
+            else:
+                mask &= self.path_codes[rows] == code
+        if method is not None:
+            code = self.methods.get(method.upper())
+            if code is None:
+                mask[:] = False
+            else:
+                mask &= self.method_codes[rows] == code
+
+        return (
+            self.timestamps[rows][mask],
+            self.latencies[rows][mask],
+            self.status_codes[rows][mask],
+        )
+
+    @staticmethod
+    def _code(codes: dict[str, int], value: str, limit: int, overflow: str) -> int:
+        code = codes.get(value)
+        if code is None:
+            if len(codes) >= limit - 1:
+                value = overflow
+                code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(codes)
+        return code
+
+
+# Class to keep a live window of recent request metrics in this worker
+class HotWindow:
+    """
+    Per-worker rings of the request metrics ingested in the last minutes.
+
+    Batches are added as they are accepted, so live views are answered
+    from memory without waiting for the flush or touching PostgreSQL.
+    Memory is bounded by a fixed ring per service and a cap on services,
+    the least recently written service being dropped first. Each worker only
+    sees the batches it accepted itself.
+    """
+
+    def __init__(
+        self,
+        window_seconds: int | None = None,
+        rows_per_service: int | None = None,
+        max_services: int | None = None,
+    ):
+        self.window_seconds = window_seconds or settings.HOT_WINDOW_SECONDS
+        self._rows_per_service = (
+            rows_per_service or settings.HOT_WINDOW_ROWS_PER_SERVICE
+        )
+        self._max_services = max_services or settings.HOT_WINDOW_MAX_SERVICES
+        self._rings: OrderedDict[TypeUUID, ServiceRingBuffer] = OrderedDict()
+
+    def add(self, batch: MetricBatch) -> None:
+        """Append an accepted batch to the rings of its services"""
+        if not settings.HOT_WINDOW_ENABLED or not len(batch):
+            return
+
+        rows_by_service: dict[TypeUUID, list[int]] = {}
+        for index, service_id in enumerate(batch.service_ids):
+            rows_by_service.setdefault(service_id, []).append(index)
+
+        timestamps = np.array([moment.timestamp() for moment in batch.occurred_at])
+        latencies = np.asarray(batch.latencies_ms, dtype=np.int32)
+        status_codes = np.asarray(batch.status_codes, dtype=np.int16)
+        paths = np.asarray(batch.paths, dtype=object)
+        methods = np.asarray(batch.methods, dtype=object)
+
+        for service_id, rows in rows_by_service.items():
+            self._ring(service_id).append(
+                timestamps[rows],
+                latencies[rows],
+                status_codes[rows],
+                paths[rows],
+                methods[rows],
+            )
+
+        metrics.set_gauge(
+            "hot_window.bytes", sum(ring.nbytes for ring in self._rings.values())
+        )
+
+    def get(self, service_id: TypeUUID) -> ServiceRingBuffer | None:
+        return self._rings.get(service_id)
+
+    def _ring(self, service_id: TypeUUID) -> ServiceRingBuffer:
+        ring = self._rings.get(service_id)
+        if ring is None:
+            if len(self._rings) >= self._max_services:
+                self._rings.popitem(last=False)
+                metrics.increment("hot_window.services_evicted")
+            ring = self._rings[service_id] = ServiceRingBuffer(self._rows_per_service)
+        else:
+            self._rings.move_to_end(service_id)
+        return ring
+
+
+# Function to summarise the hot window of a service per step
+def summarize_hot_window(
+    ring: ServiceRingBuffer | None,
+    window_seconds: int,
+    step_seconds: int,
+    path: str | None = None,
+    method: str | None = None,
+) -> dict:
+    """
+    Function to return exact totals and per-step counts, error rates and
+    latency quantiles over the last ``window_seconds``, all vectorised.
+    """
+    now = time.time()
+    start = (now - window_seconds) // step_seconds * step_seconds
+    empty = np.zeros(0)
+    timestamps, latencies, status_codes = (
+        ring.window(start, path, method) if ring is not None else (empty,) * 3
+    )
+
+    steps = ((timestamps - start) // step_seconds).astype(np.int64)
+    size = int((now - start) // step_seconds) + 1
+    counts = np.bincount(steps, minlength=size)
+    errors = np.bincount(steps, weights=status_codes >= 500, minlength=size)
+    sums = np.bincount(steps, weights=latencies, minlength=size)
+
+    # Sorting by step then latency puts every step's quantiles at fixed offsets
+    order = np.lexsort((latencies, steps))
+    ordered = latencies[order]
+    offsets = np.cumsum(counts) - counts
+    quantiles = {}
+    for name, q in HOT_WINDOW_QUANTILES.items():
+        positions = offsets + np.floor(q * np.maximum(counts - 1, 0)).astype(np.int64)
+        quantiles[name] = (
+            ordered[np.minimum(positions, len(ordered) - 1)] if len(ordered) else None
+        )
+
+    points = []
+    for step in np.flatnonzero(counts).tolist():
+        count = int(counts[step])
+        point = {
+            "bucket_start": datetime.fromtimestamp(
+                start + step * step_seconds, timezone.utc
+            ),
+            "count": count,
+            "error_count": int(errors[step]),
+            "error_rate": float(errors[step]) / count,
+            "avg_latency_ms": float(sums[step]) / count,
+        }
+        for name, values in quantiles.items():
+            point[f"{name}_latency_ms"] = int(values[step])
+        points.append(point)
+
+    total = int(counts.sum())
+    summary = {"count": total, "error_count": int(errors.sum())}
+    if total:
+        summary["error_rate"] = summary["error_count"] / total
+        summary["avg_latency_ms"] = float(latencies.mean())
+        for name, q in HOT_WINDOW_QUANTILES.items():
+            summary[f"{name}_latency_ms"] = float(
+                np.quantile(latencies, q, method="lower")
+            )
+
+    return {"summary": summary, "points": points}
+
+
+# Shared hot window of this worker
+hot_window = HotWindow()
@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from sqlalchemy import select
+
+from app.configs.session import AsyncSessionLocal
+from app.configs.settings import settings
+from app.models.services.ingest_key import ServiceIngestKey
+from app.models.services.services import Service
+from app.types.auth import TypeUUID
+from app.utils.auth import ingest_key_fingerprint
+from app.utils.generators import get_current_datetime
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Revocations are re-read for this long, so one that commits after a poll
+# started, or stamped by a worker with a lagging clock, is still seen
+REVOCATION_OVERLAP = timedelta(seconds=60)
+
+
+# Class to verify service ingestion keys without a query per batch
+class IngestKeyCache:
+    """
+    Per-worker LRU cache of ingestion key fingerprint -> service.
+
+    A key is hashed once per request and looked up by its fingerprint; only
+    a miss queries the database. Valid keys are cached for
+    ``INGEST_KEY_CACHE_SECONDS`` and unknown or revoked ones briefly, so a
+    client retrying with a bad key cannot turn every request into a query.
+    A background poll reads the keys revoked since the previous poll and
+    evicts them, so a revocation made on any worker applies everywhere
+    within ``INGEST_KEY_REVOCATION_POLL_SECONDS``.
+    """
+
+    def __init__(
+        self,
+        max_keys: int | None = None,
+        poll_seconds: float | None = None,
+    ):
+        self._max_keys = max_keys or settings.INGEST_KEY_CACHE_SIZE
+        self._poll_seconds = poll_seconds or settings.INGEST_KEY_REVOCATION_POLL_SECONDS
+        self._keys: OrderedDict[bytes, tuple[TypeUUID | None, float]] = OrderedDict()
+        self._revoked_since = get_current_datetime() - REVOCATION_OVERLAP
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    async def verify(self, key: str) -> TypeUUID | None:
+        """Return the service a key belongs to, or None if it is not valid"""
+        fingerprint = ingest_key_fingerprint(key)
+        now = time.monotonic()
+
+        cached = self._keys.get(fingerprint)
+        if cached is not None and cached[1] > now:
+            self._keys.move_to_end(fingerprint)
+            return cached[0]
+
+        metrics.increment("ingest.keys.cache_misses")
+        async with AsyncSessionLocal() as db:
+            service_id = await db.scalar(
+                select(ServiceIngestKey.service_id)
+                .join(Service, Service.service_id == ServiceIngestKey.service_id)
+                .where(
+                    ServiceIngestKey.key_hash == fingerprint,
+                    ServiceIngestKey.revoked_at.is_(None),
+                    Service.is_active.is_(True),
+                )
+            )
+
+        ttl = (
+            settings.INGEST_KEY_CACHE_SECONDS
+            if service_id is not None
+            else settings.INGEST_KEY_NEGATIVE_CACHE_SECONDS
+        )
+        if fingerprint not in self._keys and len(self._keys) >= self._max_keys:
+            self._keys.popitem(last=False)
+        self._keys[fingerprint] = (service_id, now + ttl)
+        self._keys.move_to_end(fingerprint)
+        return service_id
+
+    def forget(self, fingerprint: bytes) -> None:
+        self._keys.pop(fingerprint, None)
+
+    async def poll_revocations(self) -> int:
+        """Evict the keys revoked since the last poll and return how many"""
+        next_since = get_current_datetime() - REVOCATION_OVERLAP
+
+        # Nothing cached means nothing to evict; later misses query anyway
+        if not self._keys:
+            self._revoked_since = next_since
+            return 0
+
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(ServiceIngestKey.key_hash).where(
+                    ServiceIngestKey.revoked_at >= self._revoked_since
+                )
+            )
+        # Only move on once the poll succeeded, so a failed one is repeated
+        self._revoked_since = next_since
+
+        evicted = 0
+        for fingerprint in result.scalars():
+            if self._keys.pop(fingerprint, None) is not None:
+                evicted += 1
+        if evicted:
+            metrics.increment("ingest.keys.revocations_applied", evicted)
+        return evicted
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(
+                self._revocation_loop(), name="ingest-key-revocations"
+            )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _revocation_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._poll_seconds)
+            try:
+                await self.poll_revocations()
+            except Exception:
+                logger.exception("Polling revoked ingestion keys failed")
+                metrics.increment("ingest.keys.poll_failures")
+
+
+# Shared ingestion key cache for the API process
+ingest_keys = IngestKeyCache()
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+
+from asyncpg.exceptions import DataError, IntegrityConstraintViolationError
+
+from app.configs.settings import settings
+from app.services.ingest.request_metrics import write_request_metrics
+from app.types.ingest import MetricBatch
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+# Class to decouple metric ingestion requests from the database writes
+class MetricIngestQueue:
+    """
+    Bounded in-memory queue of validated metric batches with background flushers.
+
+    Requests only validate and enqueue, so they never hold a database
+    connection while rows are written. The queue is bounded by rows,
+    including the rows currently being written; when a batch does not fit it
+    is refused and the caller sheds load instead of queueing without bound.
+    Flushers merge queued batches up to ``flush_rows`` per COPY and retry
+    failed writes with backoff, except for batches the database rejects as
+    invalid, which are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        max_rows: int | None = None,
+        flush_rows: int | None = None,
+        flushers: int | None = None,
+    ):
+        self._max_rows = max_rows or settings.INGEST_QUEUE_MAX_ROWS
+        self._flush_rows = flush_rows or settings.INGEST_FLUSH_ROWS
+        self._flushers = flushers or settings.INGEST_FLUSHERS
+
+        self._batches: deque[MetricBatch] = deque()
+        self._rows = 0
+        self._ready = asyncio.Event()
+        self._closing = False
+        self._tasks: list[asyncio.Task] = []
+
+        # Recent write throughput in rows/s, used for Retry-After
+        self._rate = 0.0
+
+    @property
+    def depth(self) -> int:
+        return self._rows
+
+    def offer(self, batch: MetricBatch) -> bool:
+        """Enqueue a batch, or return False when it does not fit"""
+        if self._closing or self._rows + len(batch) > self._max_rows:
+            metrics.increment("ingest.rows_rejected", len(batch))
+            metrics.increment("ingest.batches_rejected")
+            return False
+
+        self._batches.append(batch)
+        self._rows += len(batch)
+        metrics.set_gauge("ingest.queue_rows", self._rows)
+        self._ready.set()
+        return True
+
+    def retry_after(self) -> int:
+        """Seconds a refused client should wait, from the current backlog"""
+        if self._rate <= 0:
+            return settings.INGEST_MAX_RETRY_AFTER_SECONDS
+        seconds = math.ceil(self._rows / self._rate)
+        return min(max(seconds, 1), settings.INGEST_MAX_RETRY_AFTER_SECONDS)
+
+    async def start(self) -> None:
+        self._closing = False
+        self._tasks = [
+            asyncio.create_task(self._flush_loop(), name=f"ingest-flusher-{index}")
+            for index in range(self._flushers)
+        ]
+
+    async def stop(self, timeout: float | None = None) -> None:
+        """Refuse new batches, give the backlog time to drain, then stop"""
+        self._closing = True
+        deadline = time.monotonic() + (
+            settings.INGEST_DRAIN_SECONDS if timeout is None else timeout
+        )
+        while self._rows and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        if self._rows:
+            logger.warning("Dropped %d queued metric rows on shutdown", self._rows)
+            metrics.increment("ingest.rows_dropped", self._rows)
+
+    def _take(self) -> MetricBatch | None:
+        """Merge queued batches into one write of up to ``flush_rows`` rows"""
+        if not self._batches:
+            return None
+
+        batch = self._batches.popleft()
+        while self._batches and len(batch) + len(self._batches[0]) <= self._flush_rows:
+            batch.extend(self._batches.popleft())
+
+        return batch
+
+    async def _flush_loop(self) -> None:
+        while True:
+            # Clear before taking, so an offer in between always wakes us
+            self._ready.clear()
+            batch = self._take()
+            if batch is None:
+                await self._ready.wait()
+                continue
+
+            await self._write(batch)
+
+            self._rows -= len(batch)
+            metrics.set_gauge("ingest.queue_rows", self._rows)
+
+    async def _write(self, batch: MetricBatch) -> None:
+        delay = 0.5
+        while True:
+            started = time.perf_counter()
+            try:
+                await write_request_metrics(batch)
+            except (IntegrityConstraintViolationError, DataError):
+                logger.exception("Dropping %d invalid metric rows", len(batch))
+                metrics.increment("ingest.rows_dropped", len(batch))
+                return
+            except Exception:
+                logger.exception("Failed to write %d metric rows", len(batch))
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 10.0)
+                continue
+            finally:
+                metrics.observe("ingest.flush", time.perf_counter() - started)
+
+            elapsed = max(time.perf_counter() - started, 1e-6)
+            self._rate = 0.8 * self._rate + 0.2 * (len(batch) / elapsed)
+            metrics.increment("ingest.rows_written", len(batch))
+            return
+
+
+# Shared queue for the API process
+metric_queue = MetricIngestQueue()
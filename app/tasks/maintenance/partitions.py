@@ -0,0 +1,203 @@
+import asyncio
+import logging
+import math
+import re
+from datetime import date, datetime, time, timedelta, timezone
+
+from app.configs.session import engine
+from app.configs.settings import settings
+from app.services.company.retention import UNBOUNDED_TIER
+from app.utils.generators import get_current_datetime
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Raw tables partitioned by LIST (retention_days), then RANGE on the time column
+PARTITIONED_TABLES = {
+    "request_metrics": "occurred_at",
+    "service_ping_logs": "checked_at",
+}
+
+# Replicas race for this lock; the loser skips the run
+MAINTENANCE_LOCK_KEY = 0x7061_7274
+
+_TIER_NAME = re.compile(r"_r(\d+)$")
+_DAY_NAME = re.compile(r"_p(\d{8})$")
+
+CHILD_PARTITIONS = """
+    SELECT c.relname, i.inhdetachpending
+    FROM pg_inherits AS i
+    JOIN pg_class AS c ON c.oid = i.inhrelid
+    JOIN pg_class AS p ON p.oid = i.inhparent
+    WHERE p.relname = $1
+"""
+
+
+# Function to name the retention tier partition of a table
+def tier_partition_name(table: str, tier: int) -> str:
+    return f"{table}_r{tier}"
+
+
+# Function to name the daily partition of a retention tier
+def day_partition_name(table: str, tier: int, day: date) -> str:
+    return f"{tier_partition_name(table, tier)}_p{day:%Y%m%d}"
+
+
+def _day_bound(day: date) -> str:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc).isoformat()
+
+
+# Class to keep the partitions of the raw metric tables in shape
+class PartitionMaintainer:
+    """
+    Pre-create upcoming daily partitions and drop expired ones.
+
+    Every retention tier of every partitioned table gets its partitions
+    created ``precreate_days`` ahead, plus the days late rows may still
+    arrive for. A day partition is dropped as a whole once its last day is
+    older than the tier's retention: it is detached concurrently, so writers
+    are never blocked, and then dropped. Rows are never deleted one by one.
+    The unbounded tier, for retentions beyond every tier, is never expired.
+    """
+
+    def __init__(
+        self,
+        interval: float | None = None,
+        precreate_days: int | None = None,
+        tiers: list[int] | None = None,
+    ):
+        self._interval = interval or settings.PARTITION_MAINTENANCE_SECONDS
+        self._precreate_days = precreate_days or settings.PARTITION_PRECREATE_DAYS
+        self._tiers = [*(tiers or settings.METRIC_RETENTION_TIERS_DAYS), UNBOUNDED_TIER]
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        """Run once so today's partitions exist, then keep running in the background"""
+        await self._run_safely()
+        self._task = asyncio.create_task(self._maintenance_loop(), name="partitions")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run_once(self, today: date | None = None) -> dict[str, int]:
+        """Create and drop partitions for every table; returns what was done"""
+        today = today or get_current_datetime().date()
+        summary = {"created": 0, "dropped": 0}
+
+        # DETACH ... CONCURRENTLY cannot run inside a transaction block, so the
+        # statements go straight to the driver connection in autocommit mode
+        async with engine.connect() as conn:
+            raw_connection = await conn.get_raw_connection()
+            driver = raw_connection.driver_connection
+
+            if not await driver.fetchval(
+                "SELECT pg_try_advisory_lock($1)", MAINTENANCE_LOCK_KEY
+            ):
+                return summary
+
+            try:
+                await driver.execute("SET lock_timeout = '5s'")
+                for table in PARTITIONED_TABLES:
+                    await self._maintain_table(driver, table, today, summary)
+            finally:
+                await driver.execute("RESET lock_timeout")
+                await driver.execute(
+                    "SELECT pg_advisory_unlock($1)", MAINTENANCE_LOCK_KEY
+                )
+
+        metrics.increment("partitions.created", summary["created"])
+        metrics.increment("partitions.dropped", summary["dropped"])
+        return summary
+
+    async def _maintain_table(self, driver, table: str, today: date, summary) -> None:
+        # Tiers removed from the settings keep being expired until they are empty
+        tiers = set(self._tiers)
+        for name, _ in await driver.fetch(CHILD_PARTITIONS, table):
+            match = _TIER_NAME.search(name)
+            if match:
+                tiers.add(int(match.group(1)))
+
+        late_days = math.ceil(settings.INGEST_MAX_LATENESS_SECONDS / 86400)
+        first_day = today - timedelta(days=late_days)
+
+        for tier in sorted(tiers):
+            tier_table = tier_partition_name(table, tier)
+            await driver.execute(
+                f'CREATE TABLE IF NOT EXISTS "{tier_table}" PARTITION OF "{table}"'
+                f' FOR VALUES IN ({tier}) PARTITION BY RANGE ("{PARTITIONED_TABLES[table]}")'
+            )
+
+            existing = {}
+            for name, detach_pending in await driver.fetch(
+                CHILD_PARTITIONS, tier_table
+            ):
+                match = _DAY_NAME.search(name)
+                if match:
+                    day = datetime.strptime(match.group(1), "%Y%m%d").date()
+                    existing[day] = (name, detach_pending)
+
+            if tier in self._tiers:
+                for offset in range((today - first_day).days + self._precreate_days):
+                    day = first_day + timedelta(days=offset)
+                    if day in existing:
+                        continue
+                    await driver.execute(
+                        f'CREATE TABLE IF NOT EXISTS "{day_partition_name(table, tier, day)}"'
+                        f' PARTITION OF "{tier_table}" FOR VALUES'
+                        f" FROM ('{_day_bound(day)}') TO ('{_day_bound(day + timedelta(days=1))}')"
+                    )
+                    summary["created"] += 1
+
+            if tier == UNBOUNDED_TIER:
+                continue
+
+            # A day expires once all of it is older than the retention period
+            cutoff = today - timedelta(days=tier)
+            for day, (name, detach_pending) in sorted(existing.items()):
+                if day >= cutoff:
+                    continue
+                mode = "FINALIZE" if detach_pending else "CONCURRENTLY"
+                await driver.execute(
+                    f'ALTER TABLE "{tier_table}" DETACH PARTITION "{name}" {mode}'
+                )
+                await driver.execute(f'DROP TABLE "{name}"')
+                summary["dropped"] += 1
+                logger.info("Dropped expired partition %s", name)
+
+    async def _run_safely(self) -> None:
+        try:
+            summary = await self.run_once()
+        except Exception:
+            logger.exception("Partition maintenance failed")
+            metrics.increment("partitions.failures")
+            return
+
+        if summary["created"] or summary["dropped"]:
+            logger.info(
+                "Partition maintenance created %d and dropped %d partitions",
+                summary["created"],
+                summary["dropped"],
+            )
+
+    async def _maintenance_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            await self._run_safely()
+
+
+# Function to run a single maintenance pass, e.g. from cron
+async def run_maintenance() -> None:
+    """Standalone run: python -m app.tasks.maintenance.partitions"""
+    try:
+        summary = await PartitionMaintainer().run_once()
+        logger.info("Partition maintenance: %s", summary)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_maintenance())
@@ -0,0 +1,300 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, text
+
+from app.configs.session import AsyncSessionLocal
+from app.configs.settings import settings
+from app.models.services.request_metric_partial import RequestMetricPartial
+from app.models.services.request_metric_rollup import (
+    RequestMetricRollup1d,
+    RequestMetricRollup1h,
+    RequestMetricRollup1m,
+)
+from app.models.services.rollup_watermark import RollupWatermark
+from app.utils.generators import get_current_datetime
+from app.utils.metrics import metrics
+from app.utils.sketch import LatencySketch
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_NAME = "request_metrics"
+
+ROLLUP_TABLES = (
+    (RequestMetricRollup1m.__tablename__, 60),
+    (RequestMetricRollup1h.__tablename__, 3600),
+    (RequestMetricRollup1d.__tablename__, 86400),
+)
+
+KEY_COLUMNS = ("service_id", "path", "method", "status_class", "bucket_start")
+VALUE_COLUMNS = (
+    "request_count",
+    "error_count",
+    "latency_sum_ms",
+    "latency_min_ms",
+    "latency_max_ms",
+    "latency_sketch",
+)
+COLUMN_TYPES = {
+    "service_id": "uuid",
+    "path": "varchar",
+    "method": "varchar",
+    "status_class": "smallint",
+    "bucket_start": "timestamptz",
+    "request_count": "bigint",
+    "error_count": "bigint",
+    "latency_sum_ms": "bigint",
+    "latency_min_ms": "integer",
+    "latency_max_ms": "integer",
+    "latency_sketch": "bytea",
+}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Deleting and returning in one statement hands over exactly the rows removed,
+# including ones committed late with an older created_at
+CONSUME_PARTIALS = text(
+    f"""
+    DELETE FROM {RequestMetricPartial.__tablename__}
+    WHERE created_at <= :until
+    RETURNING {", ".join(KEY_COLUMNS + VALUE_COLUMNS)}
+    """
+)
+
+
+def _unnest(columns: tuple[str, ...]) -> str:
+    arrays = ", ".join(f"CAST(:{name} AS {COLUMN_TYPES[name]}[])" for name in columns)
+    return f"unnest({arrays}) AS k({', '.join(columns)})"
+
+
+def _fetch_rollups(table: str) -> text:
+    return text(
+        f"""
+        SELECT {", ".join(f"r.{name}" for name in KEY_COLUMNS + VALUE_COLUMNS)}
+        FROM {table} AS r
+        JOIN {_unnest(KEY_COLUMNS)} USING ({", ".join(KEY_COLUMNS)})
+        """
+    )
+
+
+def _upsert_rollups(table: str) -> text:
+    # Values are already merged with the stored row, so they simply replace it
+    columns = KEY_COLUMNS + VALUE_COLUMNS
+    return text(
+        f"""
+        INSERT INTO {table} ({", ".join(columns)})
+        SELECT k.* FROM {_unnest(columns)}
+        JOIN services AS s ON s.service_id = k.service_id
+        ON CONFLICT ({", ".join(KEY_COLUMNS)}) DO UPDATE SET
+            {", ".join(f"{name} = excluded.{name}" for name in VALUE_COLUMNS)}
+        """
+    )
+
+
+FETCH_ROLLUPS = {table: _fetch_rollups(table) for table, _ in ROLLUP_TABLES}
+UPSERT_ROLLUPS = {table: _upsert_rollups(table) for table, _ in ROLLUP_TABLES}
+
+
+# Class to accumulate one rollup row
+class RollupAggregate:
+    __slots__ = (
+        "count",
+        "errors",
+        "latency_sum",
+        "latency_min",
+        "latency_max",
+        "sketch",
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.latency_sum = 0
+        self.latency_min = None
+        self.latency_max = None
+        self.sketch = LatencySketch()
+
+    def add(self, count, errors, latency_sum, latency_min, latency_max, sketch):
+        self.count += count
+        self.errors += errors
+        self.latency_sum += latency_sum
+        self.latency_min = (
+            latency_min
+            if self.latency_min is None
+            else min(self.latency_min, latency_min)
+        )
+        self.latency_max = (
+            latency_max
+            if self.latency_max is None
+            else max(self.latency_max, latency_max)
+        )
+        self.sketch.merge(sketch)
+
+
+# Function to fold per-minute partials into buckets of a coarser width
+def fold_partials(rows, seconds: int) -> dict[tuple, RollupAggregate]:
+    """Function to merge partial rows (with decoded sketches) per rollup key"""
+    buckets: dict[datetime, datetime] = {}
+    aggregates: dict[tuple, RollupAggregate] = {}
+    for service_id, path, method, status_class, minute, *values in rows:
+        bucket_start = buckets.get(minute)
+        if bucket_start is None:
+            offset = int((minute - _EPOCH).total_seconds()) // seconds * seconds
+            bucket_start = buckets[minute] = _EPOCH + timedelta(seconds=offset)
+
+        key = (service_id, path, method, status_class, bucket_start)
+        aggregate = aggregates.get(key)
+        if aggregate is None:
+            aggregate = aggregates[key] = RollupAggregate()
+        aggregate.add(*values)
+    return aggregates
+
+
+# Class to keep the request metric rollups current
+class RequestMetricRollupJob:
+    """
+    Fold the ingestion partials into the 1m, 1h and 1d rollups.
+
+    Ingestion writes per-minute partials with a latency sketch next to the raw
+    rows; each run takes the partials created up to the settled watermark,
+    merges them per resolution with the stored rollup rows and writes the
+    result back, then deletes the partials in the same transaction, so every
+    request is counted exactly once. Sketches merge without losing accuracy,
+    which keeps percentiles of any window within the sketch's relative error.
+    The watermark trails the clock by the settle delay and tells readers up
+    to when the rollups are complete.
+    """
+
+    def __init__(
+        self,
+        interval: float | None = None,
+        settle_seconds: int | None = None,
+        max_window_seconds: int | None = None,
+    ):
+        self._interval = interval or settings.ROLLUP_INTERVAL_SECONDS
+        self._settle = timedelta(
+            seconds=settle_seconds or settings.ROLLUP_SETTLE_SECONDS
+        )
+        self._max_window = timedelta(
+            seconds=max_window_seconds or settings.ROLLUP_MAX_WINDOW_SECONDS
+        )
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._rollup_loop(), name="metric-rollups")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run_once(self) -> bool:
+        """Fold in the next window; returns True while the job is behind"""
+        started = time.perf_counter()
+        settled = get_current_datetime() - self._settle
+
+        async with AsyncSessionLocal() as db:
+            # Replicas take turns on the watermark row instead of double counting
+            watermark = (
+                await db.execute(
+                    select(RollupWatermark)
+                    .where(RollupWatermark.name == WATERMARK_NAME)
+                    .with_for_update(skip_locked=True)
+                )
+            ).scalar_one_or_none()
+            if watermark is None:
+                return await self._create_watermark(db)
+
+            since = watermark.watermark
+            until = min(settled, since + self._max_window)
+            if until <= since:
+                return False
+
+            rows = (await db.execute(CONSUME_PARTIALS, {"until": until})).all()
+            partials = [
+                (*row[:-1], LatencySketch.from_bytes(row.latency_sketch))
+                for row in rows
+            ]
+            for table, seconds in ROLLUP_TABLES:
+                await self._merge_into(db, table, fold_partials(partials, seconds))
+
+            watermark.watermark = until
+            await db.commit()
+
+        metrics.increment("rollups.request_metrics.partials", len(partials))
+        metrics.observe("rollups.request_metrics", time.perf_counter() - started)
+        metrics.set_gauge(
+            "rollups.request_metrics.lag_seconds",
+            (get_current_datetime() - until).total_seconds(),
+        )
+        return until < settled
+
+    async def _merge_into(
+        self, db, table: str, aggregates: dict[tuple, RollupAggregate]
+    ) -> None:
+        """Merge aggregates with the stored rows of one rollup table"""
+        if not aggregates:
+            return
+
+        keys = list(aggregates)
+        key_params = {
+            name: [key[index] for key in keys] for index, name in enumerate(KEY_COLUMNS)
+        }
+        stored = await db.execute(FETCH_ROLLUPS[table], key_params)
+        for row in stored:
+            aggregates[tuple(row[: len(KEY_COLUMNS)])].add(
+                row.request_count,
+                row.error_count,
+                row.latency_sum_ms,
+                row.latency_min_ms,
+                row.latency_max_ms,
+                LatencySketch.from_bytes(row.latency_sketch),
+            )
+
+        values = aggregates.values()
+        await db.execute(
+            UPSERT_ROLLUPS[table],
+            {
+                **key_params,
+                "request_count": [value.count for value in values],
+                "error_count": [value.errors for value in values],
+                "latency_sum_ms": [value.latency_sum for value in values],
+                "latency_min_ms": [value.latency_min for value in values],
+                "latency_max_ms": [value.latency_max for value in values],
+                "latency_sketch": [value.sketch.to_bytes() for value in values],
+            },
+        )
+
+    async def _create_watermark(self, db) -> bool:
+        """Start before the oldest partial, so pending data gets rolled up too"""
+        # Nothing is inserted when the row exists but another replica holds it
+        result = await db.execute(
+            text(
+                """
+                INSERT INTO rollup_watermarks (name, watermark, updated_at)
+                SELECT :name,
+                       coalesce(min(created_at) - interval '1 microsecond', now()),
+                       now()
+                FROM request_metric_partials
+                ON CONFLICT (name) DO NOTHING
+                """
+            ),
+            {"name": WATERMARK_NAME},
+        )
+        await db.commit()
+        return result.rowcount == 1
+
+    async def _rollup_loop(self) -> None:
+        while True:
+            try:
+                behind = await self.run_once()
+            except Exception:
+                logger.exception("Request metric rollup failed")
+                metrics.increment("rollups.request_metrics.failures")
+                behind = False
+
+            if not behind:
+                await asyncio.sleep(self._interval)
@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+
+from app.types.auth import TypeUUID
+
+
+# Snapshot of a health check row joined with its service, used by the scheduler
+@dataclass(slots=True, frozen=True)
+class HealthCheckSpec:
+    health_check_id: TypeUUID
+    service_id: TypeUUID
+    url: str
+    host: str
+    method: str
+    expected_status: int
+    timeout_ms: int
+    interval_seconds: int
+    adaptive: bool = False
+    min_interval_seconds: int = 10
+    max_interval_seconds: int = 600
+
+
+# Health state of a check as derived from one probe
+class HealthState(str, Enum):
+    UP = "up"
+    DEGRADED = "degraded"
+    DOWN = "down"
+
+
+# Per-phase durations of one probe; connection phases are None on reuse
+@dataclass(slots=True)
+class ProbeTimings:
+    dns_ms: int | None = None
+    connect_ms: int | None = None
+    tls_ms: int | None = None
+    ttfb_ms: int | None = None
+
+
+# Outcome of a single probe, mapped onto a ServicePingLog row
+@dataclass(slots=True)
+class ProbeResult:
+    health_check_id: TypeUUID
+    service_id: TypeUUID
+    status_code: int | None
+    response_time_ms: int | None
+    is_success: bool
+    checked_at: datetime
+    timed_out: bool = False
+    state: HealthState = HealthState.DOWN
+    timings: ProbeTimings | None = None
+
+    # Seconds between the planned run time and the start of the probe
+    schedule_lag: float = 0.0
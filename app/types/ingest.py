@@ -0,0 +1,42 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from app.types.auth import TypeUUID
+
+
+# Column-oriented batch of request metrics on its way to the database
+@dataclass(slots=True)
+class MetricBatch:
+    service_ids: list[TypeUUID] = field(default_factory=list)
+    paths: list[str] = field(default_factory=list)
+    methods: list[str] = field(default_factory=list)
+    status_codes: list[int] = field(default_factory=list)
+    latencies_ms: list[int] = field(default_factory=list)
+    occurred_at: list[datetime] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.service_ids)
+
+    def append(
+        self,
+        service_id: TypeUUID,
+        path: str,
+        method: str,
+        status_code: int,
+        latency_ms: int,
+        occurred_at: datetime,
+    ) -> None:
+        self.service_ids.append(service_id)
+        self.paths.append(path)
+        self.methods.append(method)
+        self.status_codes.append(status_code)
+        self.latencies_ms.append(latency_ms)
+        self.occurred_at.append(occurred_at)
+
+    def extend(self, other: "MetricBatch") -> None:
+        self.service_ids.extend(other.service_ids)
+        self.paths.extend(other.paths)
+        self.methods.extend(other.methods)
+        self.status_codes.extend(other.status_codes)
+        self.latencies_ms.extend(other.latencies_ms)
+        self.occurred_at.extend(other.occurred_at)
@@ -1,21 +1,43 @@
+import hashlib
+import secrets
+
 from app.utils.generators import get_current_datetime
 from app.configs.settings import settings
+from app.utils.password_hashing import password_hash_pool
 import jwt
 import bcrypt
 
+# Prefix that makes ingestion keys recognisable, e.g. to secret scanners
+INGEST_KEY_PREFIX = "imk_"
 
-def hash_password(password: str) -> str:
-    """This is the utility function to generate the hash password"""
+
+def _hash_password(password: str) -> str:
     return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """This is the utility function to verify the password"""
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(
         plain_password.encode("utf-8"), hashed_password.encode("utf-8")
     )
 
 
+async def hash_password(password: str) -> str:
+    """This is the utility function to generate the hash password"""
+    return await password_hash_pool.run(_hash_password, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """This is the utility function to verify the password"""
+    return await password_hash_pool.run(
+        _verify_password, plain_password, hashed_password
+    )
+
+
+def refresh_token_digest(refresh_token: str) -> bytes:
+    """This is the utility function to digest a refresh token for lookups"""
+    return hashlib.sha256(refresh_token.encode("utf-8")).digest()
+
+
 def create_access_token(
     payload: dict,
 ) -> str:
@@ -62,3 +84,18 @@ def create_refresh_token(
     )
 
     return token
+
+
+def generate_ingest_key() -> str:
+    """This is the utility function to generate a service ingestion key"""
+    return INGEST_KEY_PREFIX + secrets.token_urlsafe(32)
+
+
+def ingest_key_fingerprint(key: str) -> bytes:
+    """
+    This is the utility function to fingerprint an ingestion key.
+
+    Keys are 256 random bits, so a single SHA-256 is as safe to store as a
+    slow password hash while costing well under a microsecond per batch.
+    """
+    return hashlib.sha256(key.encode("utf-8")).digest()
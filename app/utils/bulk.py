@@ -0,0 +1,34 @@
+from collections.abc import Iterable, Sequence
+
+from app.configs.session import engine
+
+
+# Function to bulk load rows with the PostgreSQL COPY protocol
+async def copy_records(
+    table_name: str, columns: Sequence[str], records: Iterable[tuple]
+) -> None:
+    """This is the utility function to COPY rows into a table in one round trip"""
+    async with engine.connect() as conn:
+        raw_connection = await conn.get_raw_connection()
+
+        # COPY runs as a single statement, so the batch lands atomically
+        await raw_connection.driver_connection.copy_records_to_table(
+            table_name, records=records, columns=list(columns)
+        )
+
+
+# Function to bulk load rows into several tables in one transaction
+async def copy_record_sets(
+    record_sets: Iterable[tuple[str, Sequence[str], Iterable[tuple]]],
+) -> None:
+    """This is the utility function to COPY into several tables atomically"""
+    async with engine.connect() as conn:
+        raw_connection = await conn.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+
+        # Either every table gets its rows or none does
+        async with driver_connection.transaction():
+            for table_name, columns, records in record_sets:
+                await driver_connection.copy_records_to_table(
+                    table_name, records=records, columns=list(columns)
+                )
@@ -0,0 +1,96 @@
+import zlib
+from collections.abc import Iterator
+
+try:
+    from compression import zstd
+except ImportError:  # Python < 3.14
+    from backports import zstd
+
+# Decompressed output is handed out in pieces of at most this size, so a
+# tiny input can never inflate into one huge allocation
+OUTPUT_CHUNK_BYTES = 256 * 1024
+
+
+# Class to signal a compressed stream that cannot be decoded
+class DecompressionError(Exception):
+    pass
+
+
+# Class to incrementally decompress a gzip stream
+class GzipStream:
+    """Decompress gzip input as it arrives, including concatenated members"""
+
+    def __init__(self):
+        self._decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    @property
+    def eof(self) -> bool:
+        return self._decoder.eof
+
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        try:
+            while True:
+                # Input after the end of a member starts the next one
+                if self._decoder.eof:
+                    self._decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                decoder = self._decoder
+                output = decoder.decompress(data, OUTPUT_CHUNK_BYTES)
+                if output:
+                    yield output
+
+                if decoder.eof:
+                    data = decoder.unused_data
+                    if not data:
+                        return
+                    continue
+
+                # A full piece may leave output behind even without input left
+                data = decoder.unconsumed_tail
+                if not data and len(output) < OUTPUT_CHUNK_BYTES:
+                    return
+        except zlib.error as exc:
+            raise DecompressionError(f"Invalid gzip data: {exc}") from exc
+
+
+# Class to incrementally decompress a zstd stream
+class ZstdStream:
+    """Decompress zstd input as it arrives, including concatenated frames"""
+
+    def __init__(self):
+        self._decoder = zstd.ZstdDecompressor()
+
+    @property
+    def eof(self) -> bool:
+        return self._decoder.eof
+
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        try:
+            while True:
+                # Input after the end of a frame starts the next one
+                if self._decoder.eof:
+                    self._decoder = zstd.ZstdDecompressor()
+                decoder = self._decoder
+                output = decoder.decompress(data, OUTPUT_CHUNK_BYTES)
+                if output:
+                    yield output
+
+                if decoder.eof:
+                    data = decoder.unused_data
+                    if not data:
+                        return
+                    continue
+
+                # The decoder keeps unread input itself until it asks for more
+                if decoder.needs_input:
+                    return
+                data = b""
+        except zstd.ZstdError as exc:
+            raise DecompressionError(f"Invalid zstd data: {exc}") from exc
+
+
+# Stream decompressors by Content-Encoding token
+DECOMPRESSORS = {
+    "gzip": GzipStream,
+    "x-gzip": GzipStream,
+    "zstd": ZstdStream,
+}
@@ -0,0 +1,67 @@
+import numpy as np
+
+
+# Function to pick the points that keep the shape of a series (LTTB)
+def lttb(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Function to return the indexes kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; every bucket in between
+    keeps the point forming the largest triangle with the point kept before
+    it and the average of the next bucket. Each bucket is one vectorised
+    step, so the cost is linear in the input.
+    """
+    size = len(x)
+    if max_points >= size or max_points < 3:
+        return np.arange(size)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Bucket edges over the points between the first and the last one
+    edges = np.linspace(1, size - 1, max_points - 1).astype(np.int64)
+    kept = np.empty(max_points, dtype=np.int64)
+    kept[0], kept[-1] = 0, size - 1
+
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        after_end = edges[bucket + 2] if bucket + 2 < len(edges) else size
+        next_x = x[end:after_end].mean()
+        next_y = y[end:after_end].mean()
+
+        # Twice the triangle area; the constant factor does not change argmax
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(areas.argmax())
+        kept[bucket + 1] = previous
+
+    return kept
+
+
+# Function to keep the extremes of every bucket of a series
+def min_max(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Function to return the indexes of the minimum and maximum of each of
+    ``max_points // 2`` equal-count buckets, in order, so spikes survive.
+    """
+    size = len(x)
+    if max_points >= size or max_points < 2:
+        return np.arange(size)
+
+    y = np.asarray(y, dtype=np.float64)
+    starts = np.linspace(0, size, max_points // 2, endpoint=False).astype(np.int64)
+    lengths = np.diff(np.append(starts, size))
+    buckets = np.repeat(np.arange(len(starts)), lengths)
+
+    kept = []
+    for reduce in (np.minimum, np.maximum):
+        extreme = np.repeat(reduce.reduceat(y, starts), lengths)
+        positions = np.flatnonzero(y == extreme)
+        # First position reaching the extreme within each bucket
+        _, first = np.unique(buckets[positions], return_index=True)
+        kept.append(positions[first])
+
+    return np.unique(np.concatenate(kept))
@@ -0,0 +1,83 @@
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+# Class to hold the observations of a single timed operation
+class _Timing:
+    __slots__ = ("count", "total", "max", "recent")
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def snapshot(self) -> dict:
+        recent = sorted(self.recent)
+
+        def quantile(q: float) -> float:
+            return recent[min(int(q * len(recent)), len(recent) - 1)] if recent else 0.0
+
+        return {
+            "count": self.count,
+            "avg_ms": (self.total / self.count * 1000) if self.count else 0.0,
+            "p50_ms": quantile(0.50) * 1000,
+            "p95_ms": quantile(0.95) * 1000,
+            "p99_ms": quantile(0.99) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+# Class to collect the in-process metrics of this worker
+class MetricsRegistry:
+    """
+    Per-worker counters, gauges and timings.
+
+    Everything lives in plain dicts on the event loop thread, so recording a
+    value is a dict update and never blocks. Timings keep running totals plus
+    a bounded window of recent observations for the percentiles.
+    """
+
+    def __init__(self, timing_window: int = 1024):
+        self._timing_window = timing_window
+        self._counters: dict[str, int] = {}
+        self._gauges: dict[str, float] = {}
+        self._timings: dict[str, _Timing] = {}
+
+    def increment(self, name: str, value: int = 1) -> None:
+        self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        self._gauges[name] = value
+
+    def observe(self, name: str, seconds: float) -> None:
+        timing = self._timings.get(name)
+        if timing is None:
+            timing = self._timings[name] = _Timing(self._timing_window)
+        timing.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def snapshot(self) -> dict:
+        return {
+            "counters": dict(self._counters),
+            "gauges": dict(self._gauges),
+            "timings": {name: t.snapshot() for name, t in self._timings.items()},
+        }
+
+
+# Shared registry for the worker process
+metrics = MetricsRegistry()
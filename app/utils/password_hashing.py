@@ -0,0 +1,81 @@
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from fastapi import HTTPException, status
+
+from app.configs.settings import settings
+from app.utils.metrics import metrics
+
+
+def _timed(func: Callable[..., Any], *args) -> tuple[Any, float, float]:
+    started = time.perf_counter()
+    result = func(*args)
+    return result, started, time.perf_counter()
+
+
+# Class to run password hashing off the event loop with bounded concurrency
+class PasswordHashPool:
+    """
+    Bounded thread pool for bcrypt.
+
+    bcrypt releases the GIL while it hashes, so hashes run in parallel on
+    ``workers`` threads while the event loop keeps serving other requests.
+    At most ``max_queued`` more hashes wait for a thread; past that a login
+    or signup is refused with a 503 instead of queueing behind seconds of
+    hashing. Time spent waiting for a thread and time spent hashing are
+    recorded as separate timings.
+    """
+
+    def __init__(self, workers: int | None = None, max_queued: int | None = None):
+        self._workers = workers or settings.PASSWORD_HASH_WORKERS
+        self._max_queued = (
+            settings.PASSWORD_HASH_MAX_QUEUED if max_queued is None else max_queued
+        )
+        self._executor: ThreadPoolExecutor | None = None
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        if self._in_flight >= self._workers + self._max_queued:
+            metrics.increment("auth.password_hash.rejected")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many sign-ins in progress, retry shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._workers, thread_name_prefix="password-hash"
+            )
+
+        loop = asyncio.get_running_loop()
+        self._in_flight += 1
+        metrics.set_gauge("auth.password_hash.in_flight", self._in_flight)
+        queued = time.perf_counter()
+        try:
+            result, started, finished = await loop.run_in_executor(
+                self._executor, _timed, func, *args
+            )
+        finally:
+            self._in_flight -= 1
+            metrics.set_gauge("auth.password_hash.in_flight", self._in_flight)
+
+        metrics.observe("auth.password_hash.queue_wait", started - queued)
+        metrics.observe("auth.password_hash.hash", finished - started)
+        return result
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+# Shared password hashing pool for the API process
+password_hash_pool = PasswordHashPool()
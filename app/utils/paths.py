@@ -0,0 +1,74 @@
+import re
+from collections.abc import Iterable
+
+# Placeholder for path segments that identify a record
+ID_SEGMENT = "{id}"
+
+# Paths beyond a service's template cap are counted here
+OVERFLOW_PATH = "/{other}"
+
+# A route template is "/" or literal and "{name}" segments, e.g.
+# "/users/{user_id}/orders"
+ROUTE_TEMPLATE_PATTERN = r"^/$|^(/([^/{}?#]+|\{[A-Za-z_][A-Za-z0-9_]*\}))+$"
+
+# Integers, UUIDs, hex digests and long tokens containing a digit
+_ID_PATTERN = re.compile(
+    r"\d+"
+    r"|[0-9a-fA-F]{8}(?:-?[0-9a-fA-F]{4}){3}-?[0-9a-fA-F]{12}"
+    r"|[0-9a-fA-F]{16,}"
+    r"|(?=[A-Za-z_-]*\d)[A-Za-z0-9_-]{20,}"
+)
+_PARAM_PATTERN = re.compile(r"\{[A-Za-z_][A-Za-z0-9_]*\}")
+
+
+# Function to split a raw path into its non-empty segments
+def path_segments(path: str) -> list[str]:
+    """Function to drop the query, fragment and empty segments of a path"""
+    path = path.partition("?")[0].partition("#")[0]
+    return [segment for segment in path.split("/") if segment]
+
+
+# Function to collapse identifier segments into a template
+def normalize_segments(segments: Iterable[str]) -> str:
+    """
+    Function to turn path segments into a template, e.g. those of
+    ``/users/8412/orders/991?x=1`` into ``/users/{id}/orders/{id}``.
+    """
+    return "/" + "/".join(
+        ID_SEGMENT if _ID_PATTERN.fullmatch(segment) else segment
+        for segment in segments
+    )
+
+
+# Function to compile user-defined route templates into one matcher
+def compile_route_templates(templates: Iterable[str]):
+    """
+    Function to return a matcher mapping a path to its route template.
+
+    Literal segments win over parameters, so ``/users/me`` is chosen before
+    ``/users/{user_id}``. The matcher returns None for paths no template
+    covers; it takes the segment-joined path built by ``path_segments``.
+    """
+    ordered = sorted(
+        set(templates),
+        key=lambda template: [
+            bool(_PARAM_PATTERN.fullmatch(segment)) for segment in template.split("/")
+        ],
+    )
+    if not ordered:
+        return lambda path: None
+
+    alternatives = []
+    for index, template in enumerate(ordered):
+        segments = (
+            "[^/]+" if _PARAM_PATTERN.fullmatch(segment) else re.escape(segment)
+            for segment in template.strip("/").split("/")
+        )
+        alternatives.append(f"(?P<t{index}>{'/'.join(segments)})")
+    pattern = re.compile("|".join(alternatives))
+
+    def match(path: str) -> str | None:
+        found = pattern.fullmatch(path)
+        return ordered[int(found.lastgroup[1:])] if found else None
+
+    return match
@@ -0,0 +1,236 @@
+import math
+import struct
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+# Quantiles come back within 1% of the true value
+RELATIVE_ACCURACY = 0.01
+
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+# Latencies are whole milliseconds, so anything below 1 ms is kept as zero
+_MIN_VALUE = 1.0
+
+# Wire format: version, count width, zero count, bin count, then the bin
+# indexes (int16) followed by their counts (uint32 or uint64), little-endian
+_VERSION = 1
+_HEADER = struct.Struct("<BBQI")
+_MAX_U32 = 2**32 - 1
+
+# Shifts int16 bin indexes to non-negative numbers for packing
+_INDEX_OFFSET = 2**15
+
+
+# Class to summarise a latency distribution in a small, mergeable form
+class LatencySketch:
+    """
+    DDSketch with logarithmic bins of 1% relative accuracy.
+
+    A value lands in bin ``ceil(log(v) / log(gamma))``, so every quantile is
+    reported within 1% of the true value whatever the distribution. Merging
+    adds the bin counts, which makes the result exactly the sketch of the
+    combined values; partial sketches built at ingestion can therefore be
+    merged into minute, hour and day rollups without losing accuracy. Bins
+    only exist for values seen, about 350 per decade at most, and a whole
+    sketch serialises to a few bytes per used bin.
+    """
+
+    __slots__ = ("bins", "zero_count")
+
+    def __init__(self, bins: dict[int, int] | None = None, zero_count: int = 0):
+        self.bins = bins if bins is not None else {}
+        self.zero_count = zero_count
+
+    @property
+    def count(self) -> int:
+        return self.zero_count + sum(self.bins.values())
+
+    @classmethod
+    def from_values(cls, values: Iterable[float] | np.ndarray) -> "LatencySketch":
+        """Build a sketch from many values at once"""
+        # numpy only pays off past a few dozen values
+        if isinstance(values, list) and len(values) < 64:
+            sketch = cls()
+            for value in values:
+                sketch.add(value)
+            return sketch
+
+        values = np.asarray(values, dtype=np.float64)
+        positive = values[values >= _MIN_VALUE]
+
+        indexes, counts = np.unique(
+            np.ceil(np.log(positive) / _LOG_GAMMA).astype(np.int64),
+            return_counts=True,
+        )
+        return cls(
+            dict(zip(indexes.tolist(), counts.tolist())),
+            int(values.size - positive.size),
+        )
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value < _MIN_VALUE:
+            self.zero_count += count
+            return
+        index = math.ceil(math.log(value) / _LOG_GAMMA)
+        self.bins[index] = self.bins.get(index, 0) + count
+
+    def merge(self, other: "LatencySketch") -> None:
+        """Fold another sketch into this one"""
+        self.zero_count += other.zero_count
+        bins = self.bins
+        for index, count in other.bins.items():
+            bins[index] = bins.get(index, 0) + count
+
+    def quantile(self, q: float) -> float | None:
+        """Return the value at quantile ``q`` (0..1), or None when empty"""
+        total = self.count
+        if not total:
+            return None
+
+        rank = q * (total - 1)
+        if rank < self.zero_count:
+            return 0.0
+
+        seen = self.zero_count
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen > rank:
+                # Midpoint of the bin in relative terms
+                return 2 * _GAMMA**index / (_GAMMA + 1)
+
+        return 2 * _GAMMA ** max(self.bins) / (_GAMMA + 1)
+
+    def to_bytes(self) -> bytes:
+        size = len(self.bins)
+        counts = list(self.bins.values())
+        width = 8 if counts and max(counts) > _MAX_U32 else 4
+        return _HEADER.pack(_VERSION, width, self.zero_count, size) + struct.pack(
+            f"<{size}h{size}{'I' if width == 4 else 'Q'}", *self.bins, *counts
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "LatencySketch":
+        version, width, zero_count, size = _HEADER.unpack_from(data)
+        if version != _VERSION:
+            raise ValueError(f"Unsupported latency sketch version {version}")
+
+        fields = struct.unpack_from(
+            f"<{size}h{size}{'I' if width == 4 else 'Q'}", data, _HEADER.size
+        )
+        return cls(dict(zip(fields[:size], fields[size:])), zero_count)
+
+
+# Function to build one sketch per group in a single vectorised pass
+def group_sketches(
+    groups: Sequence[int] | np.ndarray, values: Sequence[float] | np.ndarray, size: int
+) -> list[LatencySketch]:
+    """Function to sketch ``values`` split by their group number (0..size-1)"""
+    groups = np.asarray(groups, dtype=np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    positive = values >= _MIN_VALUE
+
+    zero_counts = np.bincount(groups[~positive], minlength=size).tolist()
+
+    # One sort over (group, bin) pairs instead of one per group
+    indexes = np.ceil(np.log(values[positive]) / _LOG_GAMMA).astype(np.int64)
+    pairs, counts = np.unique(
+        (groups[positive] << 16) | (indexes + _INDEX_OFFSET), return_counts=True
+    )
+    bounds = np.searchsorted(pairs >> 16, np.arange(size + 1)).tolist()
+    indexes = ((pairs & 0xFFFF) - _INDEX_OFFSET).tolist()
+    counts = counts.tolist()
+
+    return [
+        LatencySketch(
+            dict(
+                zip(
+                    indexes[bounds[group] : bounds[group + 1]],
+                    counts[bounds[group] : bounds[group + 1]],
+                )
+            ),
+            zero_counts[group],
+        )
+        for group in range(size)
+    ]
+
+
+# Function to merge serialised sketches into one
+def merge_sketches(payloads: Iterable[bytes]) -> LatencySketch:
+    sketch = LatencySketch()
+    for payload in payloads:
+        sketch.merge(LatencySketch.from_bytes(payload))
+    return sketch
+
+
+# Function to merge serialised sketches per group and read quantiles of each
+def group_quantiles(
+    groups: Sequence[int],
+    payloads: Sequence[bytes],
+    size: int,
+    quantiles: Sequence[float],
+) -> np.ndarray:
+    """
+    Function to return a ``size x len(quantiles)`` array of the quantiles of
+    the sketches merged per group number, NaN for groups without values.
+
+    Bins of all sketches are merged in one sort instead of sketch by sketch,
+    so thousands of groups are answered in a few vectorised passes.
+    """
+    zero_counts = np.zeros(size, dtype=np.int64)
+    indexes, counts, lengths = [], [], []
+    for group, payload in zip(groups, payloads):
+        version, width, zero_count, bins = _HEADER.unpack_from(payload)
+        if version != _VERSION:
+            raise ValueError(f"Unsupported latency sketch version {version}")
+        zero_counts[group] += zero_count
+        indexes.append(np.frombuffer(payload, "<i2", bins, _HEADER.size))
+        counts.append(
+            np.frombuffer(
+                payload, "<u4" if width == 4 else "<u8", bins, _HEADER.size + 2 * bins
+            )
+        )
+        lengths.append(bins)
+
+    result = np.full((size, len(quantiles)), np.nan)
+    if not payloads:
+        return result
+
+    # Sum the counts of equal (group, bin) pairs, ordered by group then bin
+    owners = np.repeat(np.asarray(groups, dtype=np.int64), lengths)
+    pairs, inverse = np.unique(
+        (owners << 16) | (np.concatenate(indexes).astype(np.int64) + _INDEX_OFFSET),
+        return_inverse=True,
+    )
+    merged = np.bincount(inverse, weights=np.concatenate(counts).astype(np.float64))
+    pair_groups = pairs >> 16
+    values = 2 * _GAMMA ** ((pairs & 0xFFFF) - _INDEX_OFFSET) / (_GAMMA + 1)
+
+    # Running count over all groups, each group's zero bin before its bins,
+    # so one searchsorted finds the bin of every (group, quantile) rank
+    totals = zero_counts + np.bincount(pair_groups, weights=merged, minlength=size)
+
+    # Only zero bins, e.g. every latency under a millisecond
+    if not pairs.size:
+        result[totals > 0] = 0.0
+        return result
+
+    bases = np.cumsum(totals) - totals
+    firsts = np.searchsorted(pair_groups, np.arange(size))
+    running = np.cumsum(merged, dtype=np.float64)
+    previous = np.concatenate(([0.0], running))[firsts]
+    running += (bases + zero_counts - previous)[pair_groups]
+
+    filled = np.flatnonzero(totals)
+    ends = np.searchsorted(pair_groups, filled, side="right") - 1
+    for column, q in enumerate(quantiles):
+        ranks = q * (totals[filled] - 1)
+        positions = np.minimum(
+            np.searchsorted(running, bases[filled] + ranks, side="right"), ends
+        )
+        result[filled, column] = np.where(
+            ranks < zero_counts[filled], 0.0, values[positions]
+        )
+
+    return result
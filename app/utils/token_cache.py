@@ -0,0 +1,180 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from datetime import timedelta
+
+from sqlalchemy import select
+
+from app.configs.session import AsyncSessionLocal
+from app.configs.settings import settings
+from app.models.auth.admin_session import AdminSession
+from app.models.auth.user_session import UserSession
+from app.utils.generators import get_current_datetime
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Revocations are re-read for this long, so one that commits after a poll
+# started, or stamped by a worker with a lagging clock, is still seen
+REVOCATION_OVERLAP = timedelta(seconds=60)
+
+
+# Function to key a token by a short digest instead of the token itself
+def token_digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+
+# Class to remember the claims of access tokens that already passed verification
+class VerifiedTokenCache:
+    """
+    Bounded LRU cache of token digest -> verified claims, per worker.
+
+    A token is only cached after ``jwt.decode`` accepted it, and only when it
+    carries an ``exp``; a cached token stops matching the moment it expires,
+    so the next request decodes it again and gets the usual expiry error.
+    Tokens are indexed by their ``session_id`` claim: revoking a session
+    drops its tokens at once and remembers the session until its access
+    tokens have expired anyway, so they are not verified and cached again.
+    A background poll reads the sessions deactivated since the previous poll,
+    so a logout on any worker applies everywhere within
+    ``JWT_REVOCATION_POLL_SECONDS``.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int | None = None,
+        poll_seconds: float | None = None,
+    ):
+        self._max_tokens = max_tokens or settings.JWT_CACHE_SIZE
+        self._poll_seconds = poll_seconds or settings.JWT_REVOCATION_POLL_SECONDS
+        self._tokens: OrderedDict[bytes, tuple[dict, float]] = OrderedDict()
+        self._sessions: dict[str, set[bytes]] = {}
+        self._revoked: dict[str, float] = {}
+        self._revoked_since = get_current_datetime() - REVOCATION_OVERLAP
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def get(self, token: str) -> dict | None:
+        digest = token_digest(token)
+        cached = self._tokens.get(digest)
+        if cached is None:
+            return None
+
+        claims, expires_at = cached
+        if expires_at <= time.time():
+            self._discard(digest)
+            return None
+
+        self._tokens.move_to_end(digest)
+        return claims
+
+    def put(self, token: str, claims: dict) -> None:
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return
+
+        digest = token_digest(token)
+        if digest not in self._tokens and len(self._tokens) >= self._max_tokens:
+            self._discard(next(iter(self._tokens)))
+        self._tokens[digest] = (claims, expires_at)
+
+        session_id = claims.get("session_id")
+        if session_id is not None:
+            self._sessions.setdefault(session_id, set()).add(digest)
+
+    def is_revoked(self, session_id: str | None) -> bool:
+        if session_id is None or not self._revoked:
+            return False
+        revoked_until = self._revoked.get(session_id)
+        if revoked_until is None:
+            return False
+        if revoked_until <= time.time():
+            del self._revoked[session_id]
+            return False
+        return True
+
+    def revoke_session(self, session_id: str) -> None:
+        """Drop the cached tokens of a session and refuse them from now on"""
+        self.revoke_sessions((session_id,))
+
+    def revoke_sessions(self, session_ids: Iterable[str]) -> None:
+        now = time.time()
+        self._revoked = {
+            revoked: until for revoked, until in self._revoked.items() if until > now
+        }
+        until = now + settings.access_token_expire.total_seconds()
+
+        for session_id in session_ids:
+            for digest in self._sessions.pop(session_id, ()):
+                self._tokens.pop(digest, None)
+            # Polls re-read recent revocations; keep the first deadline
+            self._revoked.setdefault(session_id, until)
+
+    async def poll_revocations(self) -> int:
+        """Revoke the sessions deactivated on any worker since the last poll"""
+        next_since = get_current_datetime() - REVOCATION_OVERLAP
+
+        async with AsyncSessionLocal() as db:
+            session_ids = [
+                str(session_id)
+                for model, column in (
+                    (UserSession, UserSession.user_session_id),
+                    (AdminSession, AdminSession.admin_session_id),
+                )
+                for session_id in (
+                    await db.scalars(
+                        select(column).where(
+                            model.is_active.is_(False),
+                            model.updated_at >= self._revoked_since,
+                        )
+                    )
+                )
+            ]
+        # Only move on once the poll succeeded, so a failed one is repeated
+        self._revoked_since = next_since
+
+        self.revoke_sessions(session_ids)
+        return len(session_ids)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(
+                self._revocation_loop(), name="session-revocations"
+            )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _revocation_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._poll_seconds)
+            try:
+                await self.poll_revocations()
+            except Exception:
+                logger.exception("Polling revoked sessions failed")
+                metrics.increment("auth.session_poll_failures")
+
+    def clear(self) -> None:
+        self._tokens.clear()
+        self._sessions.clear()
+
+    def _discard(self, digest: bytes) -> None:
+        claims, _ = self._tokens.pop(digest)
+        session_id = claims.get("session_id")
+        digests = self._sessions.get(session_id)
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._sessions[session_id]
+
+
+# Shared verified token cache for the API process
+verified_tokens = VerifiedTokenCache()
@@ -0,0 +1,227 @@
+"""
+Client middleware overhead benchmark.
+
+Calls an ASGI app directly, in process, with and without the InfraMind
+middleware in front of it and reports what the middleware adds per request.
+Two apps are measured: a bare ASGI app, which shows the raw cost of timing
+and recording a request, and a Starlette router with a templated route, which
+is what a monitored service looks like. The exporter is never started, so no
+network is involved; its encoding and compression cost, paid later off the
+request path, is reported per record on its own.
+
+    python -m benchmarks.client_overhead --requests 200000 --repeat 5
+
+Each figure is the best of ``--repeat`` runs. ``--output`` also writes the
+report as JSON so runs can be compared between releases.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from starlette.responses import Response
+from starlette.routing import Route, Router
+
+from inframind_client import InfraMindMiddleware, MetricExporter
+from inframind_client.exporter import zstd
+
+COMPRESSIONS = ("zstd", "gzip", None) if zstd is not None else ("gzip", None)
+
+STATUSES = (200, 200, 200, 201, 204, 404, 500)
+
+
+# ------------------------- #
+#           Apps            #
+# ------------------------- #
+
+
+async def bare_app(scope, receive, send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def item_endpoint(request) -> Response:
+    return Response(b"ok")
+
+
+def router_app() -> Router:
+    return Router(routes=[Route("/items/{item_id}", item_endpoint)])
+
+
+def make_exporter(args) -> MetricExporter:
+    # Sized like a real buffer, so the benchmark also covers dropping
+    return MetricExporter(
+        "http://127.0.0.1:8000",
+        "00000000-0000-0000-0000-000000000001",
+        buffer_size=args.buffer_size,
+    )
+
+
+# ------------------------- #
+#        Measurement        #
+# ------------------------- #
+
+
+async def _receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message: dict) -> None:
+    pass
+
+
+def make_scope() -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/items/42",
+        "raw_path": b"/items/42",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8000),
+    }
+
+
+async def _drive(app, requests: int) -> float:
+    scope = make_scope()
+    started = time.perf_counter()
+    for _ in range(requests):
+        # Routers write into the scope, so each request gets its own
+        await app(dict(scope), _receive, _send)
+    return time.perf_counter() - started
+
+
+def _best_ns_per_request(apps: list, args) -> list[float]:
+    """Best time of each app, alternating between them so noise hits both"""
+    best = [float("inf")] * len(apps)
+    for _ in range(args.repeat):
+        for index, app in enumerate(apps):
+            elapsed = asyncio.run(_drive(app, args.requests))
+            best[index] = min(best[index], elapsed)
+    return [elapsed * 1e9 / args.requests for elapsed in best]
+
+
+def _best_encode_us_per_record(exporter: MetricExporter, records, repeat: int):
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = len(exporter.encode(records))
+        best = min(best, time.perf_counter() - started)
+    return best * 1e6 / len(records), size / len(records)
+
+
+def build_records(args) -> list[tuple]:
+    rng = random.Random(args.seed)
+    paths = [f"/api/v1/resource{index}/{{id}}" for index in range(200)]
+    now = time.time()
+    return [
+        (
+            rng.choice(paths),
+            rng.choice(("GET", "GET", "POST", "PUT", "DELETE")),
+            rng.choice(STATUSES),
+            rng.lognormvariate(-3.5, 0.8),
+            now - rng.random() * args.interval,
+        )
+        for _ in range(args.batch_rows)
+    ]
+
+
+def run_benchmark(args) -> dict:
+    results = []
+    for name, build in (("bare", lambda: bare_app), ("router", router_app)):
+        exporter = make_exporter(args)
+        plain, wrapped = _best_ns_per_request(
+            [build(), InfraMindMiddleware(build(), exporter)], args
+        )
+        results.append(
+            {
+                "app": name,
+                "plain_ns": plain,
+                "with_middleware_ns": wrapped,
+                "overhead_ns": wrapped - plain,
+                "recorded": len(exporter.buffer),
+                "dropped": exporter.buffer.dropped,
+            }
+        )
+
+    records = build_records(args)
+    encoding = []
+    for compression in COMPRESSIONS:
+        exporter = MetricExporter(
+            "http://127.0.0.1:8000",
+            "00000000-0000-0000-0000-000000000001",
+            compression=compression,
+        )
+        us_per_record, bytes_per_record = _best_encode_us_per_record(
+            exporter, records, args.repeat
+        )
+        encoding.append(
+            {
+                "compression": compression or "identity",
+                "encode_us_per_record": us_per_record,
+                "wire_bytes_per_record": bytes_per_record,
+            }
+        )
+
+    return {
+        "requests": args.requests,
+        "buffer_size": args.buffer_size,
+        "batch_rows": args.batch_rows,
+        "results": results,
+        "encoding": encoding,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"{report['requests']} requests per run,"
+        f" buffer of {report['buffer_size']} records"
+    )
+    print(f"{'app':<8}{'plain ns':>11}{'wrapped ns':>12}{'overhead ns':>13}")
+    for result in report["results"]:
+        print(
+            f"{result['app']:<8}{result['plain_ns']:>11.0f}"
+            f"{result['with_middleware_ns']:>12.0f}{result['overhead_ns']:>13.0f}"
+        )
+    print()
+    print(f"Exporter, {report['batch_rows']} records per batch")
+    print(f"{'compression':<13}{'us/record':>11}{'bytes/record':>14}")
+    for result in report["encoding"]:
+        print(
+            f"{result['compression']:<13}{result['encode_us_per_record']:>11.2f}"
+            f"{result['wire_bytes_per_record']:>14.1f}"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--buffer-size", type=int, default=100_000)
+    parser.add_argument("--batch-rows", type=int, default=10_000)
+    parser.add_argument("--interval", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="also write the report to this JSON file")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    report = run_benchmark(args)
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
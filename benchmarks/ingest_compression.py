@@ -0,0 +1,302 @@
+"""
+Ingestion payload compression benchmark.
+
+Builds a synthetic batch of request metrics, encodes it in every accepted body
+format (JSON, NDJSON, MessagePack, length-delimited protobuf), compresses each
+with gzip and zstd and replays it through the real body reader and decoders of
+the ingestion endpoint, in process and chunked like a server delivers it.
+Nothing touches the database or the network.
+
+    python -m benchmarks.ingest_compression --rows 50000 --repeat 5
+
+Reports, per format and Content-Encoding, the bytes on the wire, the
+compression ratio, CPU milliseconds per decompressed MB spent decompressing
+and spent decompressing plus decoding into a batch, and the CPU cost per MB
+actually received. Each figure is the best of ``--repeat`` runs. ``--output``
+also writes the report as JSON so runs can be compared between releases.
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import random
+import time
+from datetime import timedelta
+from functools import partial
+
+import msgpack
+from starlette.requests import Request
+
+from app.services.ingest.decoders import decode_msgpack_stream, decode_protobuf_stream
+from app.services.ingest.request_metrics import (
+    parse_request_metrics,
+    read_request_body,
+    stream_request_body,
+)
+from app.utils.compression import zstd
+from app.utils.generators import get_current_datetime, get_uuid
+
+FORMATS = ("json", "ndjson", "msgpack", "protobuf")
+ENCODINGS = ("identity", "gzip", "zstd")
+
+CONTENT_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "msgpack": "application/msgpack",
+    "protobuf": "application/x-protobuf",
+}
+
+STREAM_DECODERS = {
+    "msgpack": decode_msgpack_stream,
+    "protobuf": decode_protobuf_stream,
+}
+
+METHODS = ("GET", "GET", "GET", "POST", "PUT", "DELETE")
+STATUSES = (200, 200, 200, 200, 201, 204, 304, 400, 404, 500)
+
+
+# ------------------------- #
+#         Payloads          #
+# ------------------------- #
+
+
+def build_records(args) -> list[dict]:
+    rng = random.Random(args.seed)
+    services = [get_uuid() for _ in range(args.services)]
+    paths = [f"/api/v1/resource{index}/{{id}}" for index in range(args.paths)]
+    now = get_current_datetime()
+    return [
+        {
+            "service_id": rng.choice(services),
+            "path": rng.choice(paths),
+            "method": rng.choice(METHODS),
+            "status_code": rng.choice(STATUSES),
+            "latency_ms": int(rng.lognormvariate(3.5, 0.8)),
+            "occurred_at": now - timedelta(microseconds=rng.randrange(60_000_000)),
+        }
+        for _ in range(args.rows)
+    ]
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _protobuf_message(record: dict) -> bytes:
+    path = record["path"].encode()
+    method = record["method"].encode()
+    occurred_at_us = int(record["occurred_at"].timestamp() * 1_000_000)
+    message = (
+        b"\x0a\x10"
+        + record["service_id"].bytes
+        + b"\x12"
+        + _varint(len(path))
+        + path
+        + b"\x1a"
+        + _varint(len(method))
+        + method
+        + b"\x20"
+        + _varint(record["status_code"])
+        + b"\x28"
+        + _varint(record["latency_ms"])
+        + b"\x30"
+        + _varint(occurred_at_us)
+    )
+    return _varint(len(message)) + message
+
+
+def encode_body(body_format: str, records: list[dict]) -> bytes:
+    if body_format in ("json", "ndjson"):
+        documents = [
+            json.dumps(
+                {
+                    **record,
+                    "service_id": str(record["service_id"]),
+                    "occurred_at": record["occurred_at"].isoformat(),
+                }
+            )
+            for record in records
+        ]
+        if body_format == "ndjson":
+            return "\n".join(documents).encode()
+        return f"[{','.join(documents)}]".encode()
+
+    if body_format == "msgpack":
+        return b"".join(
+            msgpack.packb(
+                {**record, "service_id": record["service_id"].bytes}, datetime=True
+            )
+            for record in records
+        )
+
+    return b"".join(_protobuf_message(record) for record in records)
+
+
+def compress(encoding: str, body: bytes, args) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=args.gzip_level)
+    if encoding == "zstd":
+        return zstd.compress(body, level=args.zstd_level)
+    return body
+
+
+# ------------------------- #
+#        Measurement        #
+# ------------------------- #
+
+
+def make_request(
+    body: bytes, content_type: str, encoding: str, chunk_bytes: int
+) -> Request:
+    """Build a request whose body arrives in chunks, like from the server"""
+    offset = 0
+
+    async def receive() -> dict:
+        nonlocal offset
+        chunk = body[offset : offset + chunk_bytes]
+        offset += chunk_bytes
+        return {"type": "http.request", "body": chunk, "more_body": offset < len(body)}
+
+    headers = [
+        (b"content-type", content_type.encode()),
+        (b"content-length", str(len(body)).encode()),
+    ]
+    if encoding != "identity":
+        headers.append((b"content-encoding", encoding.encode()))
+    return Request(
+        {"type": "http", "method": "POST", "path": "/", "headers": headers}, receive
+    )
+
+
+async def _decompress_only(request: Request) -> int:
+    size = 0
+    async for chunk in stream_request_body(request):
+        size += len(chunk)
+    return size
+
+
+async def _decode(body_format: str, request: Request) -> int:
+    decoder = STREAM_DECODERS.get(body_format)
+    if decoder is not None:
+        batch = await decoder(stream_request_body(request))
+    else:
+        body = await read_request_body(request)
+        batch = parse_request_metrics(body, request.headers["content-type"])
+    return len(batch)
+
+
+def _best_cpu_seconds(run, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.process_time()
+        run()
+        best = min(best, time.process_time() - started)
+    return best
+
+
+def run_benchmark(args) -> dict:
+    records = build_records(args)
+    results = []
+
+    for body_format in args.formats:
+        body = encode_body(body_format, records)
+        content_type = CONTENT_TYPES[body_format]
+        body_mb = len(body) / 2**20
+
+        for encoding in args.encodings:
+            payload = compress(encoding, body, args)
+            payload_mb = len(payload) / 2**20
+
+            # Bound now, so every run reads this iteration's body
+            request = partial(
+                make_request, payload, content_type, encoding, args.chunk_bytes
+            )
+
+            decompress_cpu = _best_cpu_seconds(
+                lambda request=request: asyncio.run(_decompress_only(request())),
+                args.repeat,
+            )
+            decode_cpu = _best_cpu_seconds(
+                lambda request=request, body_format=body_format: asyncio.run(
+                    _decode(body_format, request())
+                ),
+                args.repeat,
+            )
+
+            results.append(
+                {
+                    "format": body_format,
+                    "encoding": encoding,
+                    "body_bytes": len(body),
+                    "wire_bytes": len(payload),
+                    "ratio": len(body) / len(payload),
+                    "decompress_ms_per_mb": decompress_cpu * 1000 / body_mb,
+                    "decode_ms_per_mb": decode_cpu * 1000 / body_mb,
+                    "decode_ms_per_wire_mb": decode_cpu * 1000 / payload_mb,
+                    "rows_per_cpu_second": len(records) / decode_cpu,
+                }
+            )
+
+    return {
+        "rows": len(records),
+        "gzip_level": args.gzip_level,
+        "zstd_level": args.zstd_level,
+        "chunk_bytes": args.chunk_bytes,
+        "results": results,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"{report['rows']} rows, gzip level {report['gzip_level']},"
+        f" zstd level {report['zstd_level']}, {report['chunk_bytes']} byte chunks"
+    )
+    print(
+        f"{'format':<10}{'encoding':<10}{'wire MB':>9}{'ratio':>8}"
+        f"{'inflate ms/MB':>15}{'decode ms/MB':>14}{'ms/wire MB':>12}{'rows/cpu-s':>12}"
+    )
+    for result in report["results"]:
+        print(
+            f"{result['format']:<10}{result['encoding']:<10}"
+            f"{result['wire_bytes'] / 2**20:>9.2f}{result['ratio']:>8.1f}"
+            f"{result['decompress_ms_per_mb']:>15.2f}"
+            f"{result['decode_ms_per_mb']:>14.2f}"
+            f"{result['decode_ms_per_wire_mb']:>12.2f}"
+            f"{result['rows_per_cpu_second']:>12.0f}"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--services", type=int, default=20)
+    parser.add_argument("--paths", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--chunk-bytes", type=int, default=64 * 1024)
+    parser.add_argument("--gzip-level", type=int, default=6)
+    parser.add_argument("--zstd-level", type=int, default=3)
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=FORMATS)
+    parser.add_argument("--encodings", nargs="+", choices=ENCODINGS, default=ENCODINGS)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="also write the report to this JSON file")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    report = run_benchmark(args)
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
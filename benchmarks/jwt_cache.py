@@ -0,0 +1,152 @@
+"""
+Access token verification micro-benchmark.
+
+Authenticates requests through the real ``get_current_user`` and
+``get_current_admin`` dependencies, in process, once with every request
+verifying its token from scratch and once through the verified token cache,
+and reports the cost per request and the saving. Requests are built from a
+raw ASGI scope, so cookie parsing is included like on a real request.
+
+    python -m benchmarks.jwt_cache --requests 100000 --repeat 5
+
+``--tokens`` spreads the requests over that many distinct sessions, to see
+the cache with a realistic working set. Each figure is the best of
+``--repeat`` runs. ``--output`` also writes the report as JSON so runs can be
+compared between releases.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import jwt
+from starlette.requests import Request
+
+from app.configs.settings import settings
+from app.dependencies.auth import get_current_admin, get_current_user
+from app.utils.auth import create_access_token
+from app.utils.generators import get_uuid
+from app.utils.token_cache import verified_tokens
+
+DEPENDENCIES = {
+    "user": (get_current_user, "user_id"),
+    "admin": (get_current_admin, "admin_id"),
+}
+
+
+def make_tokens(claim: str, count: int) -> list[bytes]:
+    return [
+        create_access_token(
+            {claim: str(get_uuid()), "session_id": str(get_uuid())}
+        ).encode()
+        for _ in range(count)
+    ]
+
+
+def make_scope(token: bytes) -> dict:
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": "/v1/user/request-metrics/series",
+        "headers": [
+            (b"host", b"localhost"),
+            (b"cookie", b"access_token=" + token + b"; theme=dark"),
+        ],
+    }
+
+
+async def _drive(dependency, scopes: list[dict], requests: int, cached: bool) -> float:
+    started = time.perf_counter()
+    for index in range(requests):
+        if not cached:
+            verified_tokens.clear()
+        await dependency(Request(scopes[index % len(scopes)]))
+    return time.perf_counter() - started
+
+
+def _best_ns_per_request(dependency, scopes, args, cached: bool) -> float:
+    best = float("inf")
+    for _ in range(args.repeat):
+        verified_tokens.clear()
+        elapsed = asyncio.run(_drive(dependency, scopes, args.requests, cached))
+        best = min(best, elapsed)
+    return best * 1e9 / args.requests
+
+
+def _best_decode_ns(token: bytes, args) -> float:
+    token = token.decode()
+    best = float("inf")
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        for _ in range(args.requests):
+            jwt.decode(
+                token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
+            )
+        best = min(best, time.perf_counter() - started)
+    return best * 1e9 / args.requests
+
+
+def run_benchmark(args) -> dict:
+    results = []
+    for name, (dependency, claim) in DEPENDENCIES.items():
+        tokens = make_tokens(claim, args.tokens)
+        scopes = [make_scope(token) for token in tokens]
+        uncached = _best_ns_per_request(dependency, scopes, args, cached=False)
+        cached = _best_ns_per_request(dependency, scopes, args, cached=True)
+        results.append(
+            {
+                "dependency": name,
+                "uncached_ns": uncached,
+                "cached_ns": cached,
+                "saved_ns": uncached - cached,
+                "speedup": uncached / cached,
+            }
+        )
+
+    return {
+        "requests": args.requests,
+        "tokens": args.tokens,
+        "jwt_decode_ns": _best_decode_ns(make_tokens("user_id", 1)[0], args),
+        "results": results,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"{report['requests']} requests over {report['tokens']} tokens,"
+        f" jwt.decode alone {report['jwt_decode_ns']:.0f} ns"
+    )
+    print(
+        f"{'dependency':<12}{'uncached ns':>13}{'cached ns':>11}"
+        f"{'saved ns':>10}{'speedup':>9}"
+    )
+    for result in report["results"]:
+        print(
+            f"{result['dependency']:<12}{result['uncached_ns']:>13.0f}"
+            f"{result['cached_ns']:>11.0f}{result['saved_ns']:>10.0f}"
+            f"{result['speedup']:>8.1f}x"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--tokens", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="also write the report to this JSON file")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    report = run_benchmark(args)
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
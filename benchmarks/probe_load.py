@@ -0,0 +1,373 @@
+"""
+Probe load benchmark for a single health check worker.
+
+Starts a fleet of local HTTP servers in a child process, seeds ``Service`` and
+``ServiceHealthCheck`` rows pointing at them, and runs the real scheduler,
+prober, ping log writer and health summary writer against that fleet for a fixed duration. Nothing
+leaves the machine; the only dependency is the PostgreSQL database from the
+usual settings, and the seeded rows are removed afterwards.
+
+    python -m benchmarks.probe_load --checks 5000 --interval 5 --duration 60
+
+Reports probes/sec, schedule lag percentiles, CPU and RSS of the worker
+process (the fleet runs in its own process) and the ping log write
+throughput. ``--output`` also writes the report as JSON so runs can be
+compared between releases.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import resource
+import time
+
+from app.configs.session import engine
+from app.tasks.health_checks.scheduler import (
+    HealthCheckScheduler,
+    load_checks_from_database,
+)
+from app.tasks.health_checks.summary import HealthSummaryWriter
+from app.tasks.health_checks.writer import PingLogWriter
+from app.types.health_check import HealthCheckSpec, ProbeResult
+from app.utils.bulk import copy_records
+from app.utils.generators import get_current_datetime, get_uuid
+from app.utils.metrics import metrics
+
+SERVICE_COLUMNS = (
+    "service_id",
+    "company_id",
+    "name",
+    "base_url",
+    "environment",
+    "is_active",
+    "created_at",
+    "updated_at",
+)
+
+HEALTH_CHECK_COLUMNS = (
+    "health_check_id",
+    "service_id",
+    "path",
+    "method",
+    "expected_status",
+    "timeout_ms",
+    "interval_seconds",
+    "adaptive_interval",
+    "is_active",
+    "created_at",
+    "updated_at",
+)
+
+
+# ------------------------- #
+#      Fake target fleet     #
+# ------------------------- #
+
+
+async def _handle(reader, writer, args) -> None:
+    try:
+        while True:
+            await reader.readuntil(b"\r\n\r\n")
+            roll = random.random()
+
+            # Hang until the prober gives up and closes the connection
+            if roll < args.hang_rate:
+                await reader.read()
+                return
+
+            delay = args.latency_ms + random.uniform(-1, 1) * args.latency_jitter_ms
+            await asyncio.sleep(max(delay, 0) / 1000)
+
+            status = b"500 Internal Server Error"
+            if roll >= args.hang_rate + args.error_rate:
+                status = b"200 OK"
+            writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Length: 2\r\n\r\nok")
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _serve_fleet(args, ports) -> None:
+    servers = []
+    for _ in range(args.servers):
+        server = await asyncio.start_server(
+            lambda r, w: _handle(r, w, args), "127.0.0.1", 0, backlog=4096
+        )
+        servers.append(server)
+        ports.send(server.sockets[0].getsockname()[1])
+    ports.close()
+
+    await asyncio.Event().wait()
+
+
+def _run_fleet(args, ports) -> None:
+    asyncio.run(_serve_fleet(args, ports))
+
+
+def start_fleet(args) -> tuple[multiprocessing.Process, list[int]]:
+    """Start the fake targets in a child process and return their ports"""
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+
+    process = context.Process(target=_run_fleet, args=(args, sender), daemon=True)
+    process.start()
+    sender.close()
+
+    ports = [receiver.recv() for _ in range(args.servers)]
+    return process, ports
+
+
+# ------------------------- #
+#          Seeding           #
+# ------------------------- #
+
+
+async def seed_checks(args, ports: list[int]) -> set:
+    """Insert one service and health check per probe target"""
+    now = get_current_datetime()
+    run = get_uuid().hex[:8]
+    company_id = get_uuid()
+
+    services, checks = [], []
+    for index in range(args.checks):
+        service_id = get_uuid()
+        port = ports[index % len(ports)]
+        services.append(
+            (
+                service_id,
+                company_id,
+                f"bench-{run}-{index}",
+                f"http://127.0.0.1:{port}",
+                "development",
+                True,
+                now,
+                now,
+            )
+        )
+        checks.append(
+            (
+                get_uuid(),
+                service_id,
+                "/health",
+                "GET",
+                200,
+                args.timeout_ms,
+                args.interval,
+                False,
+                True,
+                now,
+                now,
+            )
+        )
+
+    await copy_records("services", SERVICE_COLUMNS, services)
+    await copy_records("service_health_checks", HEALTH_CHECK_COLUMNS, checks)
+    return {row[0] for row in services}
+
+
+async def remove_checks(service_ids: set) -> int:
+    """Delete the seeded services; checks and ping logs go with them"""
+    async with engine.begin() as conn:
+        raw_connection = await conn.get_raw_connection()
+        driver = raw_connection.driver_connection
+
+        rows = await driver.fetchval(
+            "SELECT count(*) FROM service_ping_logs WHERE service_id = ANY($1)",
+            list(service_ids),
+        )
+        await driver.execute(
+            "DELETE FROM services WHERE service_id = ANY($1)", list(service_ids)
+        )
+    return rows
+
+
+# ------------------------- #
+#         Measurement        #
+# ------------------------- #
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+async def run_benchmark(args) -> dict:
+    fleet, ports = start_fleet(args)
+    service_ids = await seed_checks(args, ports)
+
+    writer = PingLogWriter()
+    summary = HealthSummaryWriter()
+    lags: list[float] = []
+    outcomes = {"success": 0, "failure": 0, "timeout": 0}
+    measuring = False
+
+    async def on_result(result: ProbeResult) -> None:
+        if measuring:
+            lags.append(result.schedule_lag)
+            if result.timed_out:
+                outcomes["timeout"] += 1
+            elif result.is_success:
+                outcomes["success"] += 1
+            else:
+                outcomes["failure"] += 1
+        await summary.write(result)
+        await writer.write(result)
+
+    async def load_checks() -> list[HealthCheckSpec]:
+        checks = await load_checks_from_database()
+        return [check for check in checks if check.service_id in service_ids]
+
+    scheduler = HealthCheckScheduler(
+        on_result=on_result,
+        load_checks=load_checks,
+        max_concurrency=args.concurrency,
+        on_drop=summary.forget,
+    )
+
+    try:
+        await writer.start()
+        await summary.start()
+        await scheduler.start()
+        await asyncio.sleep(args.warmup)
+
+        measuring = True
+        counters = metrics.snapshot()["counters"]
+        rows_before = counters.get("ping_writer.rows_written", 0)
+        summary_before = counters.get("health_summary.counter_rows", 0) + counters.get(
+            "health_summary.transitions", 0
+        )
+        cpu_before = _cpu_seconds()
+        started = time.perf_counter()
+
+        await asyncio.sleep(args.duration)
+
+        measuring = False
+        elapsed = time.perf_counter() - started
+        cpu = _cpu_seconds() - cpu_before
+        rss = _rss_mb()
+        snapshot = metrics.snapshot()
+
+        await scheduler.stop()
+        await summary.stop()
+        await writer.stop()
+    finally:
+        fleet.terminate()
+        rows_stored = await remove_checks(service_ids)
+        await engine.dispose()
+
+    rows_written = snapshot["counters"].get("ping_writer.rows_written", 0) - rows_before
+    flush = snapshot["timings"].get("ping_writer.flush", {})
+    summary_flush = snapshot["timings"].get("health_summary.flush", {})
+    summary_rows = (
+        snapshot["counters"].get("health_summary.counter_rows", 0)
+        + snapshot["counters"].get("health_summary.transitions", 0)
+        - summary_before
+    )
+    probes = sum(outcomes.values())
+
+    return {
+        "config": vars(args),
+        "probes": probes,
+        "probes_per_second": probes / elapsed,
+        "expected_per_second": args.checks / args.interval,
+        "outcomes": outcomes,
+        "schedule_lag_ms": {
+            "p50": _percentile(lags, 0.50) * 1000,
+            "p95": _percentile(lags, 0.95) * 1000,
+            "p99": _percentile(lags, 0.99) * 1000,
+            "max": max(lags, default=0.0) * 1000,
+        },
+        "cpu_percent": cpu / elapsed * 100,
+        "rss_mb": rss,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "db": {
+            "rows_per_second": rows_written / elapsed,
+            "rows_stored": rows_stored,
+            "rows_dropped": snapshot["counters"].get("ping_writer.rows_dropped", 0),
+            "flushes": flush.get("count", 0),
+            "flush_p50_ms": flush.get("p50_ms", 0.0),
+            "flush_p95_ms": flush.get("p95_ms", 0.0),
+            "summary_rows_per_second": summary_rows / elapsed,
+            "summary_flush_p95_ms": summary_flush.get("p95_ms", 0.0),
+        },
+    }
+
+
+def print_report(report: dict) -> None:
+    lag = report["schedule_lag_ms"]
+    db = report["db"]
+    print(
+        f"probes/sec      {report['probes_per_second']:10.1f}"
+        f"   (expected {report['expected_per_second']:.1f})"
+    )
+    print(f"outcomes        {report['outcomes']}")
+    print(
+        f"schedule lag    p50 {lag['p50']:.1f} ms  p95 {lag['p95']:.1f} ms"
+        f"  p99 {lag['p99']:.1f} ms  max {lag['max']:.1f} ms"
+    )
+    print(f"cpu             {report['cpu_percent']:10.1f} %")
+    print(
+        f"rss             {report['rss_mb']:10.1f} MB"
+        f"   (peak {report['peak_rss_mb']:.1f} MB)"
+    )
+    print(
+        f"db writes       {db['rows_per_second']:10.1f} rows/s"
+        f"   ({db['flushes']} flushes, p50 {db['flush_p50_ms']:.1f} ms,"
+        f" p95 {db['flush_p95_ms']:.1f} ms, {db['rows_dropped']} dropped)"
+    )
+    print(
+        f"summary writes  {db['summary_rows_per_second']:10.1f} rows/s"
+        f"   (flush p95 {db['summary_flush_p95_ms']:.1f} ms)"
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--checks", type=int, default=1000)
+    parser.add_argument("--interval", type=int, default=5, help="seconds")
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="seconds")
+    parser.add_argument("--servers", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--latency-jitter-ms", type=float, default=10)
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    parser.add_argument("--hang-rate", type=float, default=0.001)
+    parser.add_argument("--timeout-ms", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--output", help="also write the report to this JSON file")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    report = asyncio.run(run_benchmark(args))
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
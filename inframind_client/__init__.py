@@ -0,0 +1,28 @@
+"""
+InfraMind client for FastAPI and Starlette services.
+
+Records every request of the service without adding latency to it and ships
+the records to the InfraMind ingestion endpoint in the background:
+
+    from contextlib import asynccontextmanager
+
+    from inframind_client import InfraMindMiddleware, MetricExporter
+
+    exporter = MetricExporter(
+        "https://inframind.example.com", service_id, api_key=ingest_key
+    )
+
+    @asynccontextmanager
+    async def lifespan(app):
+        async with exporter:
+            yield
+
+    app = FastAPI(lifespan=lifespan)
+    app.add_middleware(InfraMindMiddleware, exporter=exporter)
+"""
+
+from inframind_client.buffer import MetricBuffer
+from inframind_client.exporter import MetricExporter
+from inframind_client.middleware import InfraMindMiddleware
+
+__all__ = ["InfraMindMiddleware", "MetricBuffer", "MetricExporter"]
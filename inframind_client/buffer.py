@@ -0,0 +1,41 @@
+from collections import deque
+
+
+# Class to hold finished request records until the exporter ships them
+class MetricBuffer:
+    """
+    Bounded buffer of request records that drops the oldest first.
+
+    Backed by a ``deque`` with ``maxlen``: appending and popping are single
+    atomic operations, so requests record from any task or thread without a
+    lock, and a full buffer evicts its oldest record in O(1) instead of
+    blocking or growing.
+    """
+
+    __slots__ = ("_records", "capacity", "dropped")
+
+    def __init__(self, capacity: int = 100_000):
+        self._records: deque[tuple] = deque(maxlen=capacity)
+        self.capacity = capacity
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def append(self, record: tuple) -> None:
+        records = self._records
+        if len(records) == self.capacity:
+            self.dropped += 1
+        records.append(record)
+
+    def drain(self, limit: int) -> list[tuple]:
+        """Take up to ``limit`` of the oldest records"""
+        popleft = self._records.popleft
+        taken = []
+        try:
+            for _ in range(min(limit, len(self._records))):
+                taken.append(popleft())
+        except IndexError:
+            # Emptied by another thread meanwhile
+            pass
+        return taken
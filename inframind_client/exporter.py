@@ -0,0 +1,238 @@
+import asyncio
+import gzip
+import logging
+import time
+from collections.abc import Iterable, Mapping
+from typing import Self
+from uuid import UUID
+
+import httpcore
+import msgpack
+
+from inframind_client.buffer import MetricBuffer
+
+try:
+    from compression import zstd
+except ImportError:  # Python < 3.14
+    try:
+        from backports import zstd
+    except ImportError:
+        zstd = None
+
+logger = logging.getLogger(__name__)
+
+INGEST_PATH = "/v1/ingest/request-metrics"
+
+# Limits of the ingestion schema; one invalid record rejects the whole batch
+PATH_MAX_LENGTH = 2048
+METHOD_MAX_LENGTH = 16
+
+# Pause used after a 429 or 503 that carries no usable Retry-After
+DEFAULT_RETRY_AFTER_SECONDS = 30.0
+
+
+# Class to ship buffered request records to InfraMind in the background
+class MetricExporter:
+    """
+    Periodically sends the buffered request records to the ingestion endpoint.
+
+    Every ``interval_seconds`` the buffer is drained in batches of at most
+    ``max_batch_rows``, each packed as a MessagePack array, compressed and
+    POSTed over one keep-alive connection. Nothing is retried: a batch that
+    fails is counted in ``failed`` and dropped, and while the server asks to
+    back off with a 429 or 503 the buffer keeps filling and sheds its oldest
+    records instead, so a slow or unreachable backend never costs the service
+    memory or latency.
+
+    Authenticate with the service's ingestion key (``api_key``); a user
+    ``access_token`` is accepted too, for trying the client out.
+
+        exporter = MetricExporter(
+            "https://inframind.example.com", service_id, api_key=ingest_key
+        )
+
+        async with exporter:
+            ...
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        service_id: UUID | str,
+        *,
+        api_key: str | None = None,
+        access_token: str | None = None,
+        headers: Mapping[str, str] | None = None,
+        interval_seconds: float = 5.0,
+        max_batch_rows: int = 10_000,
+        buffer_size: int = 100_000,
+        compression: str | None = "zstd" if zstd is not None else "gzip",
+        timeout_seconds: float = 10.0,
+    ):
+        if compression not in ("gzip", "zstd", None):
+            raise ValueError(f"Unsupported compression {compression!r}")
+        if compression == "zstd" and zstd is None:
+            raise ValueError("zstd compression needs Python 3.14 or backports.zstd")
+
+        self.buffer = MetricBuffer(buffer_size)
+        self.sent = 0
+        self.failed = 0
+
+        self._url = httpcore.URL(endpoint.rstrip("/") + INGEST_PATH)
+        self._service_id = UUID(str(service_id)).bytes
+        self._interval = interval_seconds
+        self._max_batch_rows = max_batch_rows
+        self._compression = compression
+        self._extensions = {
+            "timeout": {
+                "connect": timeout_seconds,
+                "read": timeout_seconds,
+                "write": timeout_seconds,
+                "pool": timeout_seconds,
+            }
+        }
+
+        self._headers = [(b"content-type", b"application/msgpack")]
+        if compression is not None:
+            self._headers.append((b"content-encoding", compression.encode()))
+        if api_key is not None:
+            self._headers.append((b"authorization", f"Bearer {api_key}".encode()))
+        if access_token is not None:
+            self._headers.append((b"cookie", f"access_token={access_token}".encode()))
+        for name, value in (headers or {}).items():
+            self._headers.append((name.lower().encode(), value.encode()))
+
+        self._pool: httpcore.AsyncConnectionPool | None = None
+        self._task: asyncio.Task | None = None
+        self._paused_until = 0.0
+
+    async def __aenter__(self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._pool = httpcore.AsyncConnectionPool(
+            max_connections=1,
+            max_keepalive_connections=1,
+            # Outlive the interval so every export reuses the connection
+            keepalive_expiry=max(self._interval * 3, 30.0),
+            http1=True,
+        )
+        self._task = asyncio.create_task(self._export_loop(), name="inframind-export")
+
+    async def stop(self) -> None:
+        """Stop the timer, send what is still buffered and close the connection"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        self._paused_until = 0.0
+        await self.flush()
+        await self._pool.aclose()
+        self._pool = None
+
+    async def _export_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            if time.monotonic() < self._paused_until:
+                continue
+            try:
+                await self.flush()
+            except Exception:
+                # Whatever goes wrong, the timer must keep running
+                logger.exception("Exporting request metrics to InfraMind failed")
+
+    async def flush(self) -> int:
+        """Send the records buffered so far and return how many were accepted"""
+        accepted = 0
+        # Bounded by the backlog at the start, so busy traffic cannot hold it
+        pending = len(self.buffer)
+        while pending > 0 and time.monotonic() >= self._paused_until:
+            records = self.buffer.drain(min(pending, self._max_batch_rows))
+            if not records:
+                break
+            pending -= len(records)
+            accepted += await self._send(records)
+        return accepted
+
+    def encode(self, records: Iterable[tuple]) -> bytes:
+        """Pack records into a compressed MessagePack ingestion body"""
+        service_id = self._service_id
+        body = msgpack.packb(
+            [
+                {
+                    "service_id": service_id,
+                    "path": path[:PATH_MAX_LENGTH] or "/",
+                    "method": method[:METHOD_MAX_LENGTH],
+                    "status_code": status_code,
+                    "latency_ms": int(latency * 1000 + 0.5),
+                    "occurred_at": occurred_at,
+                }
+                for path, method, status_code, latency, occurred_at in records
+            ]
+        )
+        if self._compression == "zstd":
+            return zstd.compress(body)
+        if self._compression == "gzip":
+            return gzip.compress(body, compresslevel=6)
+        return body
+
+    async def _send(self, records: list[tuple]) -> int:
+        # Packing and compressing a full batch would stall the host's loop
+        body = await asyncio.to_thread(self.encode, records)
+        try:
+            response = await self._pool.request(
+                "POST",
+                self._url,
+                headers=self._headers,
+                content=body,
+                extensions=self._extensions,
+            )
+        except (
+            httpcore.TimeoutException,
+            httpcore.NetworkError,
+            httpcore.ProtocolError,
+            httpcore.UnsupportedProtocol,
+        ) as exc:
+            self.failed += len(records)
+            logger.warning(
+                "Dropped %d request metrics, InfraMind is unreachable: %r",
+                len(records),
+                exc,
+            )
+            return 0
+
+        if response.status < 300:
+            self.sent += len(records)
+            return len(records)
+
+        self.failed += len(records)
+        if response.status in (429, 503):
+            self._paused_until = time.monotonic() + _retry_after(response)
+        logger.warning(
+            "Dropped %d request metrics, InfraMind answered %d: %s",
+            len(records),
+            response.status,
+            response.content[:200].decode(errors="replace"),
+        )
+        return 0
+
+
+def _retry_after(response: httpcore.Response) -> float:
+    for name, value in response.headers:
+        if name.lower() == b"retry-after":
+            try:
+                return max(float(value), 0.0)
+            except ValueError:
+                break
+    return DEFAULT_RETRY_AFTER_SECONDS
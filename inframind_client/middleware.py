@@ -0,0 +1,51 @@
+from time import perf_counter, time
+
+from inframind_client.exporter import MetricExporter
+
+
+# Class to record every HTTP request of an ASGI app for InfraMind
+class InfraMindMiddleware:
+    """
+    ASGI middleware timing each HTTP request into the exporter's buffer.
+
+    The request path is recorded as its route template (``/users/{user_id}``)
+    when a Starlette or FastAPI router matched one, otherwise as the raw path,
+    which InfraMind templates on ingestion. Recording is one tuple appended to
+    the buffer once the response is sent; encoding, compression and network
+    I/O all happen later in the exporter, off the request path.
+
+        app.add_middleware(InfraMindMiddleware, exporter=exporter)
+    """
+
+    def __init__(self, app, exporter: MetricExporter):
+        self.app = app
+        self._record = exporter.buffer.append
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        occurred_at = time()
+        started = perf_counter()
+        status_code = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            self._record(
+                (
+                    getattr(route, "path_format", None) or scope["path"],
+                    scope["method"],
+                    status_code,
+                    perf_counter() - started,
+                    occurred_at,
+                )
+            )
@@ -0,0 +1,25 @@
+import numpy as np
+
+from app.utils.sketch import LatencySketch, group_quantiles
+
+QUANTILES = [0.5, 0.95, 0.99]
+
+
+def test_group_quantiles_all_zero_latencies():
+    payload = LatencySketch.from_values([0, 0, 0]).to_bytes()
+
+    result = group_quantiles([0], [payload], 1, QUANTILES)
+
+    assert result.tolist() == [[0.0, 0.0, 0.0]]
+
+
+def test_group_quantiles_zero_only_groups_next_to_filled_ones():
+    zeros = LatencySketch.from_values([0, 0]).to_bytes()
+    slow = LatencySketch.from_values([100, 100, 100]).to_bytes()
+
+    result = group_quantiles([0, 1, 3], [zeros, slow, zeros], 4, QUANTILES)
+
+    assert result[0].tolist() == [0.0, 0.0, 0.0]
+    assert np.allclose(result[1], 100, rtol=0.02)
+    assert np.isnan(result[2]).all()
+    assert result[3].tolist() == [0.0, 0.0, 0.0]